@@ -1,5 +1,25 @@
-import streamlit as st
+import itertools
+import os
+import shutil
+import uuid
+
+import altair as alt
 import numpy as np
+import streamlit as st
+import float_arrow
+import float_batch
+import float_density
+import float_bitplane
+import float_cache
+import float_compress
+import float_division
+import float_doubleround
+import float_interval
+import float_jobs
+import float_quant
+import float16_unary
+import fp8_tables
+from float_formats import BINARY_OPS, ROUNDING_MODES, bits_to_float, decimal_to_bits, decode, encode, get_params, breakdown, fpclass_of, make_format, get_format, scalar_op
 
 # --- Shared Functions ---
 def is_hex(s):
@@ -8,86 +28,93 @@ def is_hex(s):
         s = s[2:]
     return all(c in "0123456789abcdef" for c in s)
 
-def bits_to_float(bits, dtype):
-    byte_length = {np.float16: 2, np.float32: 4, np.float64: 8}[dtype]
-    return np.frombuffer(bits.to_bytes(byte_length, byteorder='little'), dtype=dtype)[0]
+# --- Cached Computation ---
+DTYPES = {"Float16": "float16", "Float32": "float32", "Float64": "float64",
+          "BFloat16": "bfloat16", "FP8 E4M3": "e4m3", "FP8 E5M2": "e5m2"}
+SPECIALS = {"Inf and NaN (IEEE)": (True, True), "NaN only (FN)": (False, True), "None (all finite)": (False, False)}
 
-def float_to_bits(fval, dtype):
-    return np.frombuffer(np.array(fval, dtype=dtype).tobytes(), dtype={np.float16: np.uint16, np.float32: np.uint32, np.float64: np.uint64}[dtype])[0]
+# Shared by every session; keyed on (format, op, operand bits) so reruns with
+# unchanged inputs skip both the arithmetic and the breakdown.
+@st.cache_data(max_entries=4096, show_spinner=False)
+def cached_convert(fmt, bits):
+    return bits_to_float(bits, fmt), breakdown(bits, fmt) + (fpclass_of(bits, fmt),)
 
-def get_params(dtype):
-    if dtype == np.float16:
-        return 16, 5, 10, 15
-    elif dtype == np.float32:
-        return 32, 8, 23, 127
-    else:
-        return 64, 11, 52, 1023
-
-def breakdown(bits, dtype):
-    total_bits, exp_bits, man_bits, bias = get_params(dtype)
-    s = (bits >> (exp_bits + man_bits)) & 0x1
-    e = (bits >> man_bits) & ((1 << exp_bits) - 1)
-    m = bits & ((1 << man_bits) - 1)
-    exp_val = e - bias
-    mantissa_val = m / (1 << man_bits)
-    mantissa = 1 + mantissa_val if 0 < e < (1 << exp_bits) - 1 else mantissa_val
-
-    if e == 0 and m == 0:
-        formula = "0"
-        status = "Zero"
-    elif e == 0:
-        formula = f"{'-1' if s else '1'} × 2^{1-bias} × {mantissa:.4g}"
-        status = "Subnormal"
-    elif e == (1 << exp_bits) - 1:
-        formula = "Inf or NaN"
-        status = "Overflow or NaN"
-    else:
-        formula = f"{'-1' if s else '1'} × 2^{exp_val} × {mantissa:.4g}"
-        status = "Normal"
+def compute_op(fmt, op, a_bits, b_bits):
+    # <= 16-bit unary functions and <= 8-bit arithmetic read precomputed tables
+    if op in float16_unary.FUNCTIONS and fmt.total_bits <= 16:
+        return int(float16_unary.evaluate(op, a_bits, fmt))
+    if op in BINARY_OPS and fmt.total_bits <= 8:
+        return int(fp8_tables.apply_op(op, a_bits, b_bits, fmt))
+    return scalar_op(op, a_bits, b_bits, fmt)
+
+# The on-disk cache behind it is shared with other replicas, the CLI and batch jobs
+@st.cache_data(max_entries=4096, show_spinner=False)
+def cached_op(fmt, op, a_bits, b_bits):
+    bits = float_cache.cached_result(fmt, op, "rne", a_bits, b_bits, lambda: compute_op(fmt, op, a_bits, b_bits))
+    return bits_to_float(bits, fmt), bits, breakdown(bits, fmt) + (fpclass_of(bits, fmt),)
 
-    return s, e, m, formula, f"{bits:0{total_bits}b}", status
+def parse_bits(x_str, hex_mode):
+    if hex_mode:
+        return int(x_str[2:], 16) if x_str.startswith("0x") else int(x_str, 16)
+    return decimal_to_bits(x_str, fmt)
+
+def show_breakdown(bd):
+    s, e, m, formula, binary, status, fpclass = bd
+    st.markdown(f"**Binary:** `{binary}`")
+    st.text(f"Sign     : {s}")
+    st.text(f"Exponent : {e:0{exp_bits}b}")
+    st.text(f"Mantissa : {m:0{man_bits}b}")
+    st.markdown(f"**Float formula:** {formula}")
+    st.markdown(f"**Status:** `{status}`  |  **Class:** `{fpclass}`")
 
 # --- Streamlit App ---
 st.set_page_config(page_title="Float Toolkit", layout="centered")
 st.title("🧮 Float16 / Float32 / Float64 Toolkit")
 
-precision = st.sidebar.selectbox("Precision", ["Float16", "Float32", "Float64"])
-page = st.sidebar.selectbox("Select Tool", ["Converter", "Addition", "Subtraction", "Multiplication", "Division", "Square Root"])
+precision = st.sidebar.selectbox("Precision", list(DTYPES) + ["Custom"])
+page = st.sidebar.selectbox("Select Tool", ["Converter", "Addition", "Subtraction", "Multiplication", "Division", "Square Root", "Unary Functions", "Intervals", "Number Line", "Double Rounding", "Quantization", "Batch", "Bit Planes", "Compression", "Jobs"])
 
-dtype = {"Float16": np.float16, "Float32": np.float32, "Float64": np.float64}[precision]
-bitwidth, exp_bits, man_bits, bias = get_params(dtype)
+if precision == "Custom":
+    exp_in = st.sidebar.number_input("Exponent bits", min_value=1, max_value=11, value=4)
+    man_in = st.sidebar.number_input("Mantissa bits", min_value=0, max_value=52, value=3)
+    bias_in = st.sidebar.number_input("Bias", value=(1 << (exp_in - 1)) - 1)
+    specials = st.sidebar.selectbox("Special values", list(SPECIALS))
+    subnormals = st.sidebar.checkbox("Subnormals", value=True)
+    try:
+        fmt = make_format(exp_in, man_in, bias_in, subnormals, *SPECIALS[specials])
+    except ValueError as err:
+        st.sidebar.error(str(err))
+        st.stop()
+    st.sidebar.caption(f"Format: `{fmt.name}`")
+else:
+    fmt = get_format(DTYPES[precision])
+bitwidth, exp_bits, man_bits, bias = get_params(fmt)
 
 # --- Converter ---
-if page == "Converter":
+@st.fragment
+def converter():
     user_input = st.text_input(f"Enter a decimal or {bitwidth}-bit hex (e.g. 1.345 or 0x3f800000):", "")
     if user_input.strip():
         try:
-            if user_input.startswith("0x") or is_hex(user_input):
-                hex_str = user_input[2:] if user_input.startswith("0x") else user_input
-                bits = int(hex_str, 16)
-                val = bits_to_float(bits, dtype)
-                st.markdown(f"**Decimal:** `{float(val):.6g}`")
-                result = val
-            else:
-                result = dtype(float(user_input))
-
-            bits = float_to_bits(result, dtype)
-            s, e, m, formula, binary, status = breakdown(bits, dtype)
+            hex_mode = user_input.startswith("0x") or is_hex(user_input)
+            bits = parse_bits(user_input, hex_mode)
+            val, bd = cached_convert(fmt, bits)
+            if hex_mode:
+                st.markdown(f"**Decimal:** `{val:.6g}`")
 
             st.markdown("---")
-            st.markdown(f"**Hex:** `0x{bits:0{bitwidth//4}x}`")
-            st.markdown(f"**Binary:** `{binary}`")
-            st.text(f"Sign     : {s}")
-            st.text(f"Exponent : {e:0{exp_bits}b}")
-            st.text(f"Mantissa : {m:0{man_bits}b}")
-            st.markdown(f"**Float formula:** {formula}")
-            st.markdown(f"**Status:** `{status}`")
+            st.markdown(f"**Hex:** `0x{bits:0{-(-bitwidth // 4)}x}`")
+            show_breakdown(bd)
 
         except Exception:
             st.error("Invalid input.")
 
+if page == "Converter":
+    converter()
+
 # --- Binary Operation Block ---
-def binary_op(label, op_func):
+@st.fragment
+def binary_op(label):
     col1, col2 = st.columns(2)
     with col1:
         a_str = st.text_input("Enter first number (decimal or hex):", key=label + "_a")
@@ -97,54 +124,590 @@ def binary_op(label, op_func):
     if a_str and b_str:
         is_hex_mode = (a_str.startswith("0x") or is_hex(a_str)) and (b_str.startswith("0x") or is_hex(b_str))
         try:
-            a = bits_to_float(int(a_str[2:], 16) if a_str.startswith("0x") else int(a_str, 16), dtype) if is_hex_mode else dtype(float(a_str))
-            b = bits_to_float(int(b_str[2:], 16) if b_str.startswith("0x") else int(b_str, 16), dtype) if is_hex_mode else dtype(float(b_str))
-            result = op_func(a, b)
-
-            bits = float_to_bits(result, dtype)
-            s, e, m, formula, binary, status = breakdown(bits, dtype)
+            result, bits, bd = cached_op(fmt, label, parse_bits(a_str, is_hex_mode), parse_bits(b_str, is_hex_mode))
 
             st.markdown("---")
-            st.markdown(f"### Result: `{float(result):.6g}`  |  Hex: `0x{bits:0{bitwidth//4}x}`")
-            st.markdown(f"**Binary:** `{binary}`")
-            st.text(f"Sign     : {s}")
-            st.text(f"Exponent : {e:0{exp_bits}b}")
-            st.text(f"Mantissa : {m:0{man_bits}b}")
-            st.markdown(f"**Float formula:** {formula}")
-            st.markdown(f"**Status:** `{status}`")
-
-        except ZeroDivisionError:
-            st.error("Division by zero.")
+            st.markdown(f"### Result: `{result:.6g}`  |  Hex: `0x{bits:0{-(-bitwidth // 4)}x}`")
+            show_breakdown(bd)
+
         except Exception:
             st.error("Invalid input or conversion failed.")
 
+@st.fragment
+def sqrt_op():
+    x_str = st.text_input("Enter number (decimal or hex):", key="sqrt")
+    if x_str:
+        try:
+            x_bits = parse_bits(x_str, is_hex(x_str))
+            if bits_to_float(x_bits, fmt) < 0:
+                st.error("Cannot take square root of negative number.")
+            else:
+                result, bits, bd = cached_op(fmt, "sqrt", x_bits, None)
+
+                st.markdown("---")
+                st.markdown(f"### √ Result: `{result:.6g}`  |  Hex: `0x{bits:0{-(-bitwidth // 4)}x}`")
+                show_breakdown(bd)
+        except Exception:
+            st.error("Invalid input.")
+
+@st.fragment
+def unary_op():
+    if bitwidth > 16:
+        st.info("Unary function tables cover formats of 16 bits or fewer.")
+        return
+    func = st.selectbox("Function", list(float16_unary.FUNCTIONS))
+    x_str = st.text_input("Enter number (decimal or hex):", key="unary")
+    if x_str:
+        try:
+            with st.spinner("Building lookup table..."):
+                result, bits, bd = cached_op(fmt, func, parse_bits(x_str, is_hex(x_str)), None)
+
+            st.markdown("---")
+            st.markdown(f"### {func}(x) = `{result:.6g}`  |  Hex: `0x{bits:0{-(-bitwidth // 4)}x}`")
+            show_breakdown(bd)
+        except Exception:
+            st.error("Invalid input.")
+
+@st.cache_data(max_entries=64, show_spinner="Emulating division...")
+def cached_division_sweep(fmt, design, samples):
+    return float_division.sweep(fmt, [design], samples)[0]
+
+@st.fragment
+def division_emulation():
+    with st.expander("Hardware division emulation (table seed + Newton-Raphson)"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            table_bits = st.number_input("Seed table index bits", 1, 16, 7)
+            table_out_bits = st.number_input("Seed entry bits", 1, 53, table_bits + 1)
+        with col2:
+            iterations = st.number_input("Iterations", 0, 6, 2)
+            precision = st.number_input("Intermediate precision (bits)", 2, 53, 28)
+        with col3:
+            variant = st.selectbox("Variant", list(float_division.VARIANTS), format_func=lambda v: f"{v}: {float_division.VARIANTS[v]}")
+            intermediate = st.selectbox("Intermediate rounding", float_division.INTERMEDIATE_ROUNDING)
+        samples = st.select_slider("Random operand pairs", [1 << 12, 1 << 14, 1 << 16, 1 << 18, 1 << 20], value=1 << 16)
+        try:
+            design = float_division.make_design(table_bits, table_out_bits, iterations, precision, variant, intermediate)
+            report = cached_division_sweep(fmt, design, samples)
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Correctly rounded", f"{100 * report['exact'] / report['samples']:.3f}%")
+            col2.metric("Max ULP error", report["max_ulp"])
+            col3.metric("Reciprocal accuracy", f"{report['reciprocal_bits']:.2f} bits")
+            st.bar_chart({str(k): v for k, v in report["histogram"].items()}, x_label="ULP error", y_label="Count")
+            st.text(float_division.format_report(report))
+        except Exception:
+            st.error("Emulation failed for this design point.")
+
 if page == "Addition":
-    binary_op("add", lambda a, b: dtype(a + b))
+    binary_op("add")
 elif page == "Subtraction":
-    binary_op("sub", lambda a, b: dtype(a - b))
+    binary_op("sub")
 elif page == "Multiplication":
-    binary_op("mul", lambda a, b: dtype(a * b))
+    binary_op("mul")
 elif page == "Division":
-    binary_op("div", lambda a, b: dtype(a / b))
+    binary_op("div")
+    division_emulation()
 elif page == "Square Root":
-    x_str = st.text_input("Enter number (decimal or hex):", key="sqrt")
-    if x_str:
+    sqrt_op()
+elif page == "Unary Functions":
+    unary_op()
+
+# --- Intervals ---
+@st.fragment
+def interval_op():
+    op = st.selectbox("Operation", float_interval.OPS)
+    names = ["A"] if op == "sqrt" else ["A", "B"]
+    ends = []
+    for name, col in zip(names, st.columns(len(names))):
+        lo = col.text_input(f"{name} lower bound", "0.1", key=f"interval_{name}_lo")
+        hi = col.text_input(f"{name} upper bound", "0.2" if name == "A" else "0.3", key=f"interval_{name}_hi")
+        ends.append((lo, hi))
+    try:
+        # Decimal bounds are rounded outward straight from the string
+        bits = [np.array([b], dtype=fmt.uint_name) for lo, hi in ends for b in float_interval.enclose_decimal(lo, hi, fmt)]
+        lo, hi = float_interval.interval_op(op, *bits, fmt=fmt)
+    except Exception as err:
+        st.error(f"Invalid interval: {err}")
+        return
+    for name, (a, b) in zip(names, zip(bits[::2], bits[1::2])):
+        st.text(f"{name}: {float_interval.format_interval(a[0], b[0], fmt)}")
+    st.markdown(f"### {op}: `{float_interval.format_interval(lo[0], hi[0], fmt)}`")
+    st.caption("Endpoints round down / up, so the result contains every exact outcome. "
+               "Dividing by an interval containing zero gives the hull, often [-inf, inf].")
+
+if page == "Intervals":
+    interval_op()
+
+# --- Number Line ---
+def number_line():
+    gaps = float_density.gap_table(fmt)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Smallest subnormal", f"{gaps['min_subnormal']:.4g}" if gaps["min_subnormal"] else "flushed")
+    col2.metric("Smallest normal", f"{gaps['min_normal']:.4g}")
+    col3.metric("Largest finite", f"{gaps['max']:.4g}")
+    col4.metric("Finite values", f"{gaps['total_finite']:,}")
+
+    table = float_density.binade_table(fmt)
+    binades = {"from": table["lo"], "ulp": table["ulp"], "values": table["count"], "subnormal": table["subnormal"]}
+    st.altair_chart(alt.Chart(alt.Data(values=[dict(zip(binades, row)) for row in zip(*(v.tolist() for v in binades.values()))]))
+                    .mark_line(interpolate="step-after", point=True)
+                    .encode(x=alt.X("from:Q", scale=alt.Scale(type="log"), title="Magnitude"),
+                            y=alt.Y("ulp:Q", scale=alt.Scale(type="log"), title="ULP"),
+                            color=alt.Color("subnormal:N"), tooltip=["from:Q", "ulp:Q", "values:Q"]), width="stretch")
+
+    presets = {"Full positive range": (0.0, gaps["max"]), "Subnormals": (0.0, gaps["min_normal"]),
+               "Around 1": (0.5, 2.0), "Custom": None}
+    preset = st.radio("Window", list(presets), horizontal=True)
+    lo, hi = presets[preset] or (0.0, 1.0)
+    col1, col2, col3 = st.columns(3)
+    if preset == "Custom":
+        lo = col1.number_input("From", value=lo, format="%g")
+        hi = col2.number_input("To", value=hi, format="%g")
+    bins = col3.select_slider("Bins", [20, 50, 100, 200, 500], value=100)
+    log = st.checkbox("Logarithmic bins", value=False, disabled=lo <= 0)
+    try:
+        edges, counts = float_density.density(lo, hi, fmt, bins, log and lo > 0)
+        centers = np.sqrt(edges[:-1] * edges[1:]) if log and lo > 0 else edges[:-1] + np.diff(edges) / 2
+        rows = [{"x": float(x), "values": int(c), "ulp": float(u)}
+                for x, c, u in zip(centers, counts, float_density.ulp_at(centers, fmt))]
+        x = alt.X("x:Q", scale=alt.Scale(type="log" if log and lo > 0 else "linear"), title="Value")
+        chart = alt.Chart(alt.Data(values=rows)).encode(x=x, tooltip=["x:Q", "values:Q", "ulp:Q"])
+        st.altair_chart(chart.mark_bar().encode(y=alt.Y("values:Q", title="Representable values per bin")), width="stretch")
+        st.caption(f"{float_density.count_between(lo, hi, fmt):,} representable values in [{lo:g}, {hi:g}]")
+    except Exception:
+        st.error("Invalid window.")
+    st.text(float_density.format_table(fmt))
+
+if page == "Number Line":
+    number_line()
+
+# --- Double Rounding ---
+@st.cache_data(max_entries=16, show_spinner="Running the chain...")
+def cached_double_rounding(chain, rounding, source, payload, n):
+    if source == "exhaustive":
+        return float_doubleround.scan_exhaustive(chain, rounding)
+    if source == "upload":
+        values = float_batch.read_csv(payload)[0]
+        if not chain.startswith(float_doubleround.DECIMAL):
+            values = np.array(values, dtype=np.float64)
+    elif source == "midpoints":
+        values = float_doubleround.midpoint_inputs(chain, n)
+    else:
+        values = np.random.default_rng(0).normal(0.0, 100.0, n)
+        if chain.startswith(float_doubleround.DECIMAL):
+            values = np.array([repr(v) for v in values.tolist()])
+    return float_doubleround.analyze(values, chain, rounding)
+
+def double_rounding():
+    chain = st.text_input("Conversion chain (source > intermediate(s) > target):", "float64>float32>float16",
+                          help="Formats by name or ExMy; the source may be `decimal`.")
+    col1, col2 = st.columns(2)
+    rounding = col1.selectbox("Rounding (every step)", list(ROUNDING_MODES))
+    sources = {"Near target midpoints": "midpoints", "Normal(0, 100)": "normal", "Uploaded values": "upload",
+               "Every source value (<= 32 bits)": "exhaustive"}
+    source = sources[col2.selectbox("Inputs", list(sources))]
+    payload, n = b"", 0
+    if source == "upload":
+        upload = st.file_uploader("One value per line (decimal strings for a decimal source):", type=["csv", "txt"])
+        if upload is None:
+            return
+        payload = upload.getvalue()
+    elif source != "exhaustive":
+        n = st.select_slider("Values", [1 << 12, 1 << 16, 1 << 20], value=1 << 16)
+    try:
+        report = cached_double_rounding(chain, rounding, source, payload, n)
+    except Exception as err:
+        st.error(f"Could not run the chain: {err}")
+        return
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Values", f"{report['count']:,}")
+    col2.metric("Double-rounded", f"{report['affected']:,}", f"{100 * report['affected'] / max(report['count'], 1):.4f}%",
+                delta_color="off")
+    col3.metric("Max ULP error", report["max_ulp"])
+    if report["affected"]:
+        st.bar_chart({str(e): c for e, c in report["binades"].items()}, x_label="Target exponent field", y_label="Values")
+        target = get_format(report["chain"].split(" > ")[-1])
+        got = np.array([g for _, g, _ in report["examples"]], dtype=np.uint64).astype(target.uint_name)
+        ref = np.array([r for _, _, r in report["examples"]], dtype=np.uint64).astype(target.uint_name)
+        st.dataframe({"input": [v for v, _, _ in report["examples"]],
+                      "chained": float_batch.hex_strings(got, target.total_bits),
+                      "direct": float_batch.hex_strings(ref, target.total_bits),
+                      "chained value": decode(got, target), "direct value": decode(ref, target)}, width="stretch")
+    st.text(float_doubleround.format_report(report))
+
+if page == "Double Rounding":
+    double_rounding()
+
+# --- Quantization ---
+@st.cache_data(max_entries=16, show_spinner="Calibrating...")
+def cached_quantization(fmt, dist, n, channels, qformats, methods, symmetric, percentile, floats):
+    # Samples rounded to the selected format first, so every target starts from the same values
+    rng = np.random.default_rng(0)
+    if dist == "laplace":
+        x = rng.laplace(0.0, 1.0, n)
+    else:
+        x = rng.normal(0.0, 1.0, n)
+        if dist == "outliers":
+            x[rng.integers(0, n, max(n >> 12, 1))] *= 50
+    x = decode(encode(x.reshape(-1, channels) * np.geomspace(0.01, 10, channels), fmt), fmt)
+    axis = -1 if channels > 1 else None
+    targets, params = list(floats), []
+    for q in qformats:
+        for m in methods:
+            scale, zero_point = float_quant.calibrate(x, q, m, axis, symmetric, percentile)
+            name = float_quant.scheme_name(q, m, axis, symmetric)
+            targets.append((name, scale, zero_point, q))
+            params.append({"scheme": name, "scale min": float(scale.min()), "scale max": float(scale.max()),
+                           "zero point min": int(zero_point.min()), "zero point max": int(zero_point.max())})
+    return float_quant.compare(x, targets, axis), params
+
+def quantization():
+    col1, col2, col3 = st.columns(3)
+    dists = {"Normal": "normal", "Normal with outliers": "outliers", "Laplace": "laplace"}
+    dist = dists[col1.selectbox("Data", list(dists))]
+    n = col2.select_slider("Values", [1 << 12, 1 << 16, 1 << 20, 1 << 22], value=1 << 20)
+    channels = col3.select_slider("Channels", [1, 4, 16, 64, 256], value=1,
+                                  help="Above 1, each channel gets its own scale (spread over 0.01-10) and its own calibration.")
+    col1, col2 = st.columns(2)
+    qformats = col1.multiselect("Integer formats", ["int8", "uint8", "int4", "uint4"], default=["int8", "int4"])
+    methods = col2.multiselect("Calibration", list(float_quant.METHODS), default=list(float_quant.METHODS))
+    col1, col2, col3 = st.columns(3)
+    symmetric = col1.checkbox("Symmetric (zero point fixed)", value=False)
+    percentile = col2.number_input("Percentile", min_value=50.0, max_value=100.0, value=99.99, format="%g",
+                                   disabled="percentile" not in methods)
+    floats = col3.multiselect("Float formats", ["float16", "bfloat16", "e4m3", "e5m2"], default=["float16", "bfloat16", "e4m3"])
+    try:
+        reports, params = cached_quantization(fmt, dist, n, channels, tuple(qformats), tuple(methods), symmetric,
+                                              percentile, tuple(floats))
+    except Exception as err:
+        st.error(f"Could not quantize: {err}")
+        return
+    st.caption(f"{n:,} values in {fmt.name}, {'per-channel over ' + str(channels) + ' channels' if channels > 1 else 'per-tensor'}")
+    st.bar_chart({"target": [r["target"] for r in reports], "SQNR (dB)": [r["sqnr_db"] if np.isfinite(r["sqnr_db"]) else None for r in reports]},
+                 x="target", y="SQNR (dB)", sort=False, horizontal=True)
+    st.dataframe(reports, width="stretch")
+    if params:
+        st.dataframe(params, width="stretch")
+
+if page == "Quantization":
+    quantization()
+
+# --- Batch ---
+@st.cache_data(max_entries=16, show_spinner="Converting...")
+def cached_batch(fmt, op, text):
+    a, b = float_batch.read_text(text)
+    return float_batch.convert_batch(a, b, op, fmt)
+
+def batch_view():
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        classes = st.multiselect("Class", float_batch.CLASSES, default=float_batch.CLASSES)
+    with col2:
+        valid_only = st.checkbox("Valid rows only", value=False)
+    with col3:
+        page_size = st.selectbox("Rows per page", [100, 1000, 10000], index=1)
+    return classes, valid_only, page_size
+
+def page_number(n_rows, page_size):
+    n_pages = max(1, -(-n_rows // page_size))
+    return (st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1) - 1) * page_size
+
+def file_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def drop_spool(name):
+    # Removes the spooled file of a previous upload as soon as it is replaced
+    result = st.session_state.pop(name, None)
+    if result is not None:
+        result["spool"].close()
+        if result.get("output") is not None:
+            result["output"].close()
+
+def stream_upload(upload, op):
+    # Converts the upload chunk by chunk into a spooled CSV, showing each chunk as it
+    # lands. The state is stored first, so a rerun mid-stream resumes after the last
+    # spooled chunk instead of starting over.
+    key = (upload.file_id, op, fmt)
+    result = st.session_state.get("batch_stream")
+    if result is None or result["key"] != key:
+        drop_spool("batch_stream")
+        result = st.session_state["batch_stream"] = {"key": key, "spool": float_batch.Spool(), "index": [], "done": False}
+    if not result["done"]:
+        progress = st.progress(0.0, text="Converting...")
+        preview = st.empty()
+        upload.seek(0)
+        chunks = itertools.islice(float_batch.iter_csv(upload), len(result["index"]), None)
+        frames = float_batch.stream_batch(chunks, op, fmt)
+        for df in float_batch.spool_csv(frames, result["spool"].path, result["index"]):
+            rows = sum(n for _, _, counts in result["index"] for n, _ in counts.values())
+            progress.progress(min(upload.tell() / max(upload.size, 1), 1.0), text=f"{rows} rows converted")
+            preview.dataframe(df.head(100), width="stretch")
+        result["done"] = True
+        progress.empty()
+        preview.empty()
+    return result
+
+def show_stream(result, op):
+    totals = {name: [0, 0] for name in float_batch.CLASSES}  # rows, valid rows
+    for _, _, counts in result["index"]:
+        for name, (n, valid) in counts.items():
+            totals[name][0] += n
+            totals[name][1] += valid
+    rows = sum(n for n, _ in totals.values())
+    st.bar_chart({k: v[0] for k, v in totals.items() if v[0]}, x_label="Class", y_label="Rows")
+    classes, valid_only, page_size = batch_view()
+    n_view = sum(totals[c][1 if valid_only else 0] for c in classes)
+    start = page_number(n_view, page_size)
+    st.dataframe(float_batch.read_page(result["spool"].path, result["index"], classes, valid_only, start, page_size),
+                 width="stretch")
+    st.caption(f"{n_view} of {rows} rows shown, {rows - sum(v for _, v in totals.values())} invalid")
+    st.download_button(
+        "Download full result (CSV)",
+        data=lambda: file_bytes(result["spool"].path),
+        file_name=f"{fmt.name}_{op.lower().replace(' ', '_')}.csv",
+        mime="text/csv",
+    )
+
+def arrow_upload(upload):
+    # Columnar files are converted row group by row group into a spooled file of the same kind
+    suffix = os.path.splitext(upload.name)[1].lower()
+    key = (upload.file_id, fmt)
+    result = st.session_state.get("batch_arrow")
+    if result is None or result["key"] != key:
+        drop_spool("batch_arrow")
+        result = st.session_state["batch_arrow"] = {"key": key, "spool": float_batch.Spool(suffix), "output": None}
+        with open(result["spool"].path, "wb") as f:
+            upload.seek(0)
+            shutil.copyfileobj(upload, f)
+        schema = float_arrow.read_schema(result["spool"].path)
+        result.update(columns=float_arrow.convertible_columns(schema), floats=float_arrow.float_columns(schema),
+                      raw=float_arrow.raw_columns(schema, fmt))
+    col1, col2 = st.columns([3, 1])
+    columns = col1.multiselect("Columns to convert", result["columns"], default=(result["floats"] or result["columns"])[:1])
+    rounding = col2.selectbox("Rounding", list(ROUNDING_MODES))
+    raw = st.multiselect("Columns holding raw bit patterns", [c for c in columns if c in result["raw"]],
+                         help=f"Unsigned columns of {fmt.total_bits} bits are converted by value unless picked here.")
+    col1, col2, col3 = st.columns(3)
+    qfmt = col1.selectbox("Quantize to", ["None", "int8", "uint8", "int4", "uint4"])
+    method = col2.selectbox("Calibration", list(float_quant.METHODS), disabled=qfmt == "None")
+    symmetric = col3.checkbox("Symmetric (zero point fixed)", value=False, disabled=qfmt == "None")
+    if columns and st.button("Convert columns"):
+        output = float_batch.Spool(suffix)
+        with st.spinner("Converting row groups..."):
+            rows = float_arrow.convert_file(result["spool"].path, output.path, columns, fmt, rounding, raw,
+                                            None if qfmt == "None" else qfmt, method, symmetric)
+            summary = float_arrow.class_summary(output.path, columns)
+        if result["output"] is not None:
+            result["output"].close()
+        result.update(output=output, rows=rows, summary=summary)
+    if result["output"] is not None:
+        st.caption(f"{result['rows']} rows converted")
+        st.dataframe({col: counts for col, counts in result["summary"].items()}, width="stretch")
+        first = next(float_arrow.iter_batches(result["output"].path), None)
+        if first is not None:
+            st.dataframe(first.slice(0, 100).to_pandas(), width="stretch")
+        st.download_button(
+            f"Download converted file ({suffix[1:]})",
+            data=lambda: file_bytes(result["output"].path),
+            file_name=f"{os.path.splitext(upload.name)[0]}_{fmt.name}{suffix}",
+            mime="application/octet-stream",
+        )
+
+if page == "Batch":
+    op = st.selectbox("Operation", list(float_batch.OPS))
+    upload = st.file_uploader("Upload a CSV of values or operand pairs (a, b), or a Parquet / Arrow file:",
+                              type=["csv", "txt", "parquet", "arrow", "feather"])
+    text = st.text_area("...or paste values, one per line (pairs as `a, b`, hex with a 0x prefix):")
+
+    columnar = upload is not None and upload.name.lower().endswith((".parquet", ".arrow", ".feather"))
+    # A spooled result goes as soon as its upload does
+    if upload is None or columnar:
+        drop_spool("batch_stream")
+    if not columnar:
+        drop_spool("batch_arrow")
+
+    if columnar:
         try:
-            x = bits_to_float(int(x_str[2:], 16) if x_str.startswith("0x") else int(x_str, 16), dtype) if is_hex(x_str) else dtype(float(x_str))
-            if x < 0:
-                st.error("Cannot take square root of negative number.")
+            arrow_upload(upload)
+        except Exception:
+            drop_spool("batch_arrow")
+            st.error("Could not convert the columnar file.")
+
+    elif upload is not None:
+        try:
+            result = stream_upload(upload, op)
+            if not result["index"]:
+                st.warning("The upload has no rows.")
             else:
-                result = dtype(np.sqrt(x))
-                bits = float_to_bits(result, dtype)
-                s, e, m, formula, binary, status = breakdown(bits, dtype)
+                show_stream(result, op)
+
+        except Exception:
+            drop_spool("batch_stream")
+            st.error("Could not read the batch input.")
+
+    elif text.strip():
+        try:
+            df = cached_batch(fmt, op, text)
+            classes, valid_only, page_size = batch_view()
+
+            mask = df["class"].isin(classes)
+            if valid_only:
+                mask &= df["valid"]
+            view = df[mask]
+            start = page_number(len(view), page_size)
+
+            st.dataframe(view.iloc[start:start + page_size], width="stretch")
+            st.caption(f"{len(view)} of {len(df)} rows shown, {int((~df['valid']).sum())} invalid")
+            # A pasted batch is in memory already; its download is the joined CSV
+            st.download_button(
+                "Download full result (CSV)",
+                data=lambda: b"".join(float_batch.csv_chunks(df)),
+                file_name=f"{fmt.name}_{op.lower().replace(' ', '_')}.csv",
+                mime="text/csv",
+            )
 
-                st.markdown("---")
-                st.markdown(f"### √ Result: `{float(result):.6g}`  |  Hex: `0x{bits:0{bitwidth//4}x}`")
-                st.markdown(f"**Binary:** `{binary}`")
-                st.text(f"Sign     : {s}")
-                st.text(f"Exponent : {e:0{exp_bits}b}")
-                st.text(f"Mantissa : {m:0{man_bits}b}")
-                st.markdown(f"**Float formula:** {formula}")
-                st.markdown(f"**Status:** `{status}`")
         except Exception:
-            st.error("Invalid input.")
\ No newline at end of file
+            st.error("Could not read the batch input.")
+
+# --- Bit Planes ---
+@st.cache_resource(max_entries=8, show_spinner="Counting bit planes...")
+def bit_planes(fmt, source, payload, n, sigma):
+    # One per dataset: an uploaded raw dump, or n normal samples rounded to the format
+    if source == "upload":
+        bits = np.frombuffer(payload, dtype="<" + np.dtype(fmt.uint_name).str[1:], count=len(payload) // np.dtype(fmt.uint_name).itemsize)
+    else:
+        bits = encode(np.random.default_rng(0).normal(0.0, sigma, n), fmt)
+    return float_bitplane.BitPlanes(bits, fmt)
+
+if page == "Bit Planes":
+    source = st.radio("Dataset", ["Normal samples", "Raw dump"], horizontal=True)
+    try:
+        if source == "Raw dump":
+            upload = st.file_uploader(f"Raw little-endian {fmt.name} dump:", type=None, key="bitplane_upload")
+            if upload is None:
+                st.stop()
+            planes = bit_planes(fmt, "upload", upload.getvalue(), 0, 0.0)
+        else:
+            col1, col2 = st.columns(2)
+            n = col1.select_slider("Values", [1 << 16, 1 << 20, 1 << 22, 1 << 24], value=1 << 20)
+            sigma = col2.number_input("Standard deviation", min_value=1e-30, value=1.0, format="%g")
+            planes = bit_planes(fmt, "normal", b"", n, sigma)
+
+        start, stop = st.slider("Window", 0, len(planes), (0, len(planes)))
+        rows = st.select_slider("Rows", [32, 64, 128, 256, 512], value=256)
+        matrix, edges = planes.heatmap(start, max(stop, start + 1), rows)
+        st.image(float_bitplane.heatmap_image(matrix, fmt), caption=f"Elements {edges[0]}-{edges[-1]}, "
+                 f"{(edges[-1] - edges[0]) // len(matrix)} per row; planes {' '.join(planes.labels())}")
+        activity = planes.activity(edges[0], edges[-1])
+        st.bar_chart({"plane": planes.labels(), "ones": activity}, x="plane", y="ones", sort=False)
+        window = planes.bits[edges[0]:min(edges[-1], edges[0] + 20)]
+        st.dataframe({"index": np.arange(edges[0], edges[0] + len(window)),
+                      "hex": float_batch.hex_strings(window, fmt.total_bits),
+                      "binary": float_bitplane.binary_strings(window, fmt)}, width="stretch")
+    except Exception:
+        st.error("Could not build the bit-plane view.")
+
+# --- Compression ---
+@st.cache_data(max_entries=8, show_spinner="Compressing...")
+def cached_compression(fmt, source, payload, n, keeps, codecs):
+    if source == "upload":
+        bits = np.frombuffer(payload, dtype="<" + np.dtype(fmt.uint_name).str[1:], count=len(payload) // np.dtype(fmt.uint_name).itemsize)
+    else:
+        rng = np.random.default_rng(0)
+        x = np.cumsum(rng.normal(0.0, 0.01, n)) + 1.0 if source == "walk" else rng.normal(0.0, 1.0, n)
+        bits = encode(x, fmt)
+    return float_compress.analyze_bits(bits, fmt, (None,) + keeps, codecs)
+
+def compression():
+    sources = {"Random walk (smooth)": "walk", "Normal samples (noisy)": "normal", "Raw dump": "upload"}
+    col1, col2 = st.columns(2)
+    source = sources[col1.selectbox("Dataset", list(sources))]
+    payload, n = b"", 0
+    if source == "upload":
+        upload = st.file_uploader(f"Raw little-endian {fmt.name} dump:", type=None, key="compress_upload")
+        if upload is None:
+            return
+        payload = upload.getvalue()
+    else:
+        n = col2.select_slider("Values", [1 << 16, 1 << 18, 1 << 20], value=1 << 18)
+    col1, col2 = st.columns(2)
+    codecs = col1.multiselect("Codecs", list(float_compress.CODECS), default=["zlib", "bz2"])
+    keeps = col2.multiselect("Also try mantissa truncated to", list(range(fmt.man_bits - 1, 0, -1)), default=[])
+    try:
+        report = cached_compression(fmt, source, payload, n, tuple(sorted(keeps, reverse=True)), tuple(codecs))
+    except Exception as err:
+        st.error(f"Could not analyze: {err}")
+        return
+    col1, col2, col3, col4 = st.columns(4)
+    for col, name in zip((col1, col2, col3), report["entropy"]):
+        col.metric(f"{name.title()} entropy", f"{report['entropy'][name]:.2f} bits")
+    col4.metric("Total", f"{report['entropy_total']:.2f} / {fmt.total_bits} bits")
+    if report["best"]:
+        st.success(f"Smallest lossless: {float_compress.describe(report['best'])}")
+        st.info(f"Balanced lossless: {float_compress.describe(report['balanced'])}")
+    if report["best_lossy"]:
+        st.caption(f"Smallest lossy: {float_compress.describe(report['best_lossy'])}, "
+                   f"{report['best_lossy']['mantissa_bits']} mantissa bits, max relative error {report['best_lossy']['max_rel_error']:.3g}")
+    st.dataframe(report["results"], width="stretch")
+
+if page == "Compression":
+    compression()
+
+# --- Background Jobs ---
+@st.cache_resource
+def job_runner():
+    # Started right away, so chunks left behind by a dead replica are picked up once their leases expire
+    runner = float_jobs.JobRunner()
+    runner.start()
+    return runner
+
+@st.fragment(run_every=1)
+def job_list(runner, owner):
+    jobs = runner.jobs(owner)
+    if not jobs:
+        st.caption("No jobs yet.")
+    for job in reversed(jobs):
+        with st.container(border=True):
+            st.markdown(f"**#{job['id']} {float_jobs.KINDS[job['kind']].label}** · `{job['params'].get('format')}` · {job['status']}")
+            st.progress(job["done"] / job["total"], text=f"{job['done']} / {job['total']} chunks")
+            if job["error"]:
+                st.error(job["error"])
+            col1, col2, col3 = st.columns(3)
+            if job["status"] in ("queued", "running") and col1.button("Cancel", key=f"cancel{job['id']}"):
+                runner.cancel(job["id"])
+            if job["status"] in ("cancelled", "failed") and col1.button("Resume", key=f"resume{job['id']}"):
+                runner.resume(job["id"])
+            if job["status"] not in ("queued", "running") and col2.button("Delete", key=f"delete{job['id']}"):
+                runner.delete(job["id"])
+            if job["done"] and col3.toggle("Result", key=f"result{job['id']}"):
+                st.text(float_jobs.format_result(job, runner.result(job["id"])))
+
+if page == "Jobs":
+    owner = st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+    runner = job_runner()
+    kind = st.selectbox("Analysis", list(float_jobs.KINDS), format_func=lambda k: float_jobs.KINDS[k].label)
+    with st.form("submit_job"):
+        if kind == "division_sweep":
+            st.caption("Every operand pair of the selected format (16 bits or fewer) through the division emulator.")
+            col1, col2, col3 = st.columns(3)
+            table_bits = col1.number_input("Seed table index bits", 1, 16, 7)
+            iterations = col2.number_input("Iterations", 0, 6, 2)
+            intermediate_bits = col3.number_input("Intermediate precision (bits)", 2, 53, 28)
+            variant = col1.selectbox("Variant", list(float_division.VARIANTS))
+            intermediate = col2.selectbox("Intermediate rounding", float_division.INTERMEDIATE_ROUNDING)
+        else:
+            upload = st.file_uploader("Raw little-endian dump in the selected format:", type=None)
+        submitted = st.form_submit_button("Submit")
+    if submitted:
+        try:
+            if kind == "division_sweep":
+                design = float_division.make_design(table_bits, None, iterations, intermediate_bits, variant, intermediate)
+                params = {"format": fmt.name, "design": design._asdict(), "rounding": "rne"}
+            else:
+                params = {"format": fmt.name, "path": float_jobs.store_upload(upload.getvalue())}
+            job_id = runner.submit(owner, kind, params)
+            st.success(f"Submitted job #{job_id}.")
+        except Exception as err:
+            st.error(f"Could not submit the job: {err}")
+    job_list(runner, owner)
@@ -1,5 +1,6 @@
 import streamlit as st
 import numpy as np
+from float16_unary import evaluate
 
 st.set_page_config(page_title="Float16 Square Root", layout="centered")
 st.markdown("<h2 style='text-align:center;'>Float16 Square Root</h2><hr>", unsafe_allow_html=True)
@@ -56,8 +57,8 @@ if x_str:
         if x < 0:
             st.error("Square root of a negative number is not a real value.")
         else:
-            result = np.float16(np.sqrt(x))
-            result_bits = float16_to_bits(result)
+            result_bits = int(evaluate("sqrt", float16_to_bits(x)))
+            result = np.frombuffer(result_bits.to_bytes(2, byteorder="little"), dtype=np.float16)[0]
             binary = f"{result_bits:016b}"
             s, e, m, formula = breakdown(result_bits)
 
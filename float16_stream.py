@@ -41,6 +41,42 @@ def breakdown(bits):
 
     return s, e, m, formula, f"{float16_to_bits(np.float16(bits)):016b}", status
 
+# --- Cached Computation ---
+FLOAT16_OPS = {
+    "add": lambda a, b: np.float16(a + b),
+    "sub": lambda a, b: np.float16(a - b),
+    "mul": lambda a, b: np.float16(a * b),
+    "div": lambda a, b: np.float16(a / b),
+    "sqrt": lambda a, b: np.float16(np.sqrt(a)),
+}
+
+def bits_to_float16(bits):
+    return np.frombuffer(int(bits).to_bytes(2, byteorder="little"), dtype=np.float16)[0]
+
+# Shared across sessions and keyed on (op, operand bits), so a rerun with
+# unchanged inputs only re-renders the cached result.
+@st.cache_data(max_entries=4096, show_spinner=False)
+def cached_breakdown(bits):
+    s, e, m, formula, binary, status = breakdown(bits)
+    return int(s), int(e), int(m), formula, binary, status
+
+@st.cache_data(max_entries=4096, show_spinner=False)
+def cached_float16_op(label, a_bits, b_bits):
+    a = bits_to_float16(a_bits)
+    b = bits_to_float16(b_bits) if b_bits is not None else None
+    result = FLOAT16_OPS[label](a, b)
+    result_bits = int(float16_to_bits(result))
+    return float(result), result_bits, cached_breakdown(result_bits)
+
+def show_breakdown(bd, formula_label="Float formula"):
+    s, e, m, formula, binary, status = bd
+    st.markdown(f"**Binary:** `{binary}`")
+    st.text(f"Sign     : {s}")
+    st.text(f"Exponent : {e:05b}")
+    st.text(f"Mantissa : {m:010b}")
+    st.markdown(f"**{formula_label}:** {formula}")
+    st.markdown(f"**Status:** `{status}`")
+
 # --- Streamlit App ---
 st.set_page_config(page_title="Float16 Toolkit", layout="centered")
 st.title("🧮 Float16 Toolkit")
@@ -55,7 +91,8 @@ page = st.sidebar.selectbox("Select Tool", [
 ])
 
 # --- Converter ---
-if page == "Float16 Converter":
+@st.fragment
+def float16_converter():
     user_input = st.text_input("Enter a decimal or 16-bit hex (e.g. 1.345 or 0xbd6c):", "")
 
     if user_input.strip():
@@ -80,21 +117,19 @@ if page == "Float16 Converter":
                     st.warning("Hex input must be 4 digits.")
 
             if bits is not None:
-                s, e, m, formula, binary, status = breakdown(bits)
                 st.markdown("---")
                 st.markdown(f"**{result}**")
-                st.markdown(f"**Binary:** `{binary}`")
-                st.text(f"Sign     : {s}")
-                st.text(f"Exponent : {e:05b}")
-                st.text(f"Mantissa : {m:010b}")
-                st.markdown(f"**Float breakdown:** {formula}")
-                st.markdown(f"**Status:** `{status}`")
+                show_breakdown(cached_breakdown(int(bits)), "Float breakdown")
 
         except Exception:
             st.error("Invalid input.")
 
+if page == "Float16 Converter":
+    float16_converter()
+
 # --- Binary Operation Template ---
-def float16_binary_op(label, op_func):
+@st.fragment
+def float16_binary_op(label):
     col1, col2 = st.columns(2)
     with col1:
         a_str = st.text_input("Enter first number (decimal or 0xABCD):", key=label+"a")
@@ -111,36 +146,19 @@ def float16_binary_op(label, op_func):
             try:
                 a = parse_hex16(a_str) if a_is_hex else np.float16(float(a_str))
                 b = parse_hex16(b_str) if b_is_hex else np.float16(float(b_str))
-                result = op_func(a, b)
-                result_bits = float16_to_bits(result)
-                s, e, m, formula, binary, status = breakdown(result_bits)
+                result, result_bits, bd = cached_float16_op(label, int(float16_to_bits(a)), int(float16_to_bits(b)))
 
                 st.markdown("---")
-                st.markdown(f"### Result: `{float(result):.6g}`  |  Hex: `0x{result_bits:04x}`")
-                st.markdown(f"**Binary:** `{binary}`")
-                st.text(f"Sign     : {s}")
-                st.text(f"Exponent : {e:05b}")
-                st.text(f"Mantissa : {m:010b}")
-                st.markdown(f"**Float formula:** {formula}")
-                st.markdown(f"**Status:** `{status}`")
+                st.markdown(f"### Result: `{result:.6g}`  |  Hex: `0x{result_bits:04x}`")
+                show_breakdown(bd)
 
             except ZeroDivisionError:
                 st.error("Division by zero.")
             except Exception:
                 st.error("Invalid input or conversion failed.")
 
-# --- Operations ---
-if page == "Addition":
-    float16_binary_op("add", lambda a, b: np.float16(a + b))
-elif page == "Subtraction":
-    float16_binary_op("sub", lambda a, b: np.float16(a - b))
-elif page == "Multiplication":
-    float16_binary_op("mul", lambda a, b: np.float16(a * b))
-elif page == "Division":
-    float16_binary_op("div", lambda a, b: np.float16(a / b))
-
-# --- Square Root ---
-elif page == "Square Root":
+@st.fragment
+def float16_sqrt():
     x_str = st.text_input("Enter number (decimal or 0xABCD):", "")
     if x_str:
         try:
@@ -148,17 +166,24 @@ elif page == "Square Root":
             if x < 0:
                 st.error("Square root of a negative number is not a real value.")
             else:
-                result = np.float16(np.sqrt(x))
-                result_bits = float16_to_bits(result)
-                s, e, m, formula, binary, status = breakdown(result_bits)
+                result, result_bits, bd = cached_float16_op("sqrt", int(float16_to_bits(x)), None)
 
                 st.markdown("---")
-                st.markdown(f"### √ Result: `{float(result):.6g}`  |  Hex: `0x{result_bits:04x}`")
-                st.markdown(f"**Binary:** `{binary}`")
-                st.text(f"Sign     : {s}")
-                st.text(f"Exponent : {e:05b}")
-                st.text(f"Mantissa : {m:010b}")
-                st.markdown(f"**Float formula:** {formula}")
-                st.markdown(f"**Status:** `{status}`")
+                st.markdown(f"### √ Result: `{result:.6g}`  |  Hex: `0x{result_bits:04x}`")
+                show_breakdown(bd)
         except Exception:
-            st.error("Invalid input or conversion failed.")
\ No newline at end of file
+            st.error("Invalid input or conversion failed.")
+
+# --- Operations ---
+if page == "Addition":
+    float16_binary_op("add")
+elif page == "Subtraction":
+    float16_binary_op("sub")
+elif page == "Multiplication":
+    float16_binary_op("mul")
+elif page == "Division":
+    float16_binary_op("div")
+
+# --- Square Root ---
+elif page == "Square Root":
+    float16_sqrt()
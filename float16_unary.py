@@ -0,0 +1,194 @@
+# Correctly rounded unary functions for float16 (and other <= 16-bit formats) via lookup tables
+import functools
+import math
+import os
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from multiprocessing import Pool
+
+import numpy as np
+import float_formats as ff
+from float_cache import CACHE_DIR
+
+TABLE_VERSION = 1
+
+# Float64 results closer than this (relative) to a rounding boundary are
+# recomputed exactly; libm and math.erfc are far more accurate than this.
+AMBIGUITY = 2.0 ** -36
+PREC = 60
+
+# --- Float64 Reference ---
+erfc = np.vectorize(math.erfc, otypes=[np.float64])
+
+FUNCTIONS = {
+    "sqrt": np.sqrt,
+    "rsqrt": lambda x: 1.0 / np.sqrt(x),
+    "reciprocal": lambda x: 1.0 / x,
+    "exp": np.exp,
+    "log": np.log,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tanh": np.tanh,
+    "gelu": lambda x: 0.5 * x * erfc(-x / math.sqrt(2.0)),
+}
+
+# --- High-Precision Reference ---
+@functools.lru_cache(maxsize=None)
+def dec_pi(prec):
+    # Recipe from the decimal module documentation
+    with localcontext() as ctx:
+        ctx.prec = prec + 2
+        three = Decimal(3)
+        lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+        return +s
+
+def dec_sin_cos(x):
+    with localcontext() as ctx:
+        ctx.prec += 10
+        two_pi = 2 * dec_pi(ctx.prec + 10)
+        r = x - two_pi * (x / two_pi).to_integral_value()
+        r2 = r * r
+        sin, cos, term_s, term_c, n = r, Decimal(1), r, Decimal(1), 1
+        eps = Decimal(10) ** -(ctx.prec + 2)
+        while abs(term_s) > eps or abs(term_c) > eps:
+            term_c = -term_c * r2 / ((2 * n - 1) * (2 * n))
+            term_s = -term_s * r2 / ((2 * n) * (2 * n + 1))
+            cos += term_c
+            sin += term_s
+            n += 1
+    return +sin, +cos
+
+def dec_erfc(z):
+    if z < 0:
+        return 2 - dec_erfc(-z)
+    with localcontext() as ctx:
+        if z <= 8:
+            # Alternating Taylor series; extra digits cover the cancellation
+            ctx.prec += int(z * z / Decimal(2.3)) + 10
+            term, total, n = z, z, 0
+            eps = Decimal(10) ** -(ctx.prec + 2)
+            while abs(term) > eps:
+                n += 1
+                term = -term * z * z / n
+                total += term / (2 * n + 1)
+            return +(1 - 2 / dec_pi(ctx.prec).sqrt() * total)
+        # Asymptotic series, summed until the terms stop shrinking
+        ctx.prec += 10
+        x2 = 2 * z * z
+        term, total, k = Decimal(1), Decimal(1), 1
+        while True:
+            nxt = -term * (2 * k - 1) / x2
+            if abs(nxt) >= abs(term) or abs(nxt) < Decimal(10) ** -(ctx.prec + 2):
+                break
+            term, total, k = nxt, total + nxt, k + 1
+        return +((-z * z).exp() / (z * dec_pi(ctx.prec).sqrt()) * total)
+
+# Results within EPSILON (relative) of a representable value keep that
+# distance so directed rounding still sees which side they fall on.
+EPSILON = Decimal("1e-45")
+# Below every subnormal / above every finite value of a format that fits inside float64
+TINY = Decimal("1e-340")
+HUGE = Decimal("1e310")
+
+def dec_eval(func, x):
+    if func == "sqrt":
+        return x.sqrt()
+    if func == "rsqrt":
+        return 1 / x.sqrt()
+    if func == "reciprocal":
+        return 1 / x
+    if func == "exp":
+        return x.exp()
+    if func == "log":
+        return x.ln()
+    if func == "sin":
+        return dec_sin_cos(x)[0]
+    if func == "cos":
+        return dec_sin_cos(x)[1]
+    if func == "tanh":
+        e = (-2 * abs(x)).exp()
+        return (1 - max(2 * e / (1 + e), EPSILON)).copy_sign(x)
+    if func == "gelu":
+        tail = abs(x) * dec_erfc(abs(x) / Decimal(2).sqrt()) / 2
+        return x - max(tail, x * EPSILON) if x > 0 else -tail
+    raise ValueError(f"Unknown function: {func!r}")
+
+def refine(job):
+    func, fmt, rounding, values = job
+    out = []
+    with localcontext() as ctx:
+        ctx.prec = PREC
+        ctx.Emin, ctx.Emax = -10 ** 15, 10 ** 15
+        for v in values:
+            y = dec_eval(func, Decimal(v))
+            if y != 0 and abs(y) < TINY:
+                y = TINY.copy_sign(y)
+            elif abs(y) > HUGE:
+                y = HUGE.copy_sign(y)
+            out.append(ff.encode_fraction(Fraction(y), fmt, rounding))
+    return out
+
+# --- Table Generation ---
+def build_table(func, fmt="float16", rounding="rne", workers=None):
+    fmt = ff.get_format(fmt)
+    if fmt.total_bits > 16:
+        raise ValueError("Lookup tables cover formats of 16 bits or fewer.")
+    k = ff.compile_format(fmt)
+    x = k.decode_table
+    with np.errstate(all="ignore"):
+        y = FUNCTIONS[func](x)
+        table = k.encode(y, rounding)
+        lo = k.encode(y * (1 - AMBIGUITY), rounding)
+        hi = k.encode(y * (1 + AMBIGUITY), rounding)
+
+    finite_x = np.isfinite(x) & (x != 0)
+    ambiguous = (lo != table) | (hi != table)
+    # float64 under/overflow hides the true result's direction
+    ambiguous |= finite_x & ((y == 0) | np.isinf(y))
+    ambiguous &= finite_x & ~np.isnan(y)
+
+    idx = np.flatnonzero(ambiguous)
+    if len(idx):
+        chunks = [idx[i:i + 256] for i in range(0, len(idx), 256)]
+        jobs = [(func, fmt, rounding, [float(v) for v in x[c]]) for c in chunks]
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(jobs) > 1:
+            with Pool(workers) as pool:
+                results = pool.map(refine, jobs)
+        else:
+            results = list(map(refine, jobs))
+        for c, bits in zip(chunks, results):
+            table[c] = bits
+    return table
+
+def table_path(func, fmt, rounding):
+    return os.path.join(CACHE_DIR, f"{func}_{fmt.name}_{rounding}_v{TABLE_VERSION}_k{ff.KERNEL_REVISION}.npy")
+
+@functools.lru_cache(maxsize=None)
+def get_table(func, fmt="float16", rounding="rne"):
+    fmt = ff.get_format(fmt)
+    if func not in FUNCTIONS:
+        raise ValueError(f"Unknown function: {func!r}")
+    path = table_path(func, fmt, rounding)
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+    table = build_table(func, fmt, rounding)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp, path)
+    return table
+
+# --- Evaluation ---
+def evaluate(func, bits, fmt="float16", rounding="rne"):
+    return get_table(func, fmt, rounding)[np.asarray(bits).astype(np.intp)]
+
+def evaluate_values(func, x, fmt="float16", rounding="rne"):
+    return ff.decode(evaluate(func, ff.encode(x, fmt), fmt, rounding), fmt)
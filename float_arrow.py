@@ -0,0 +1,208 @@
+# Arrow / Parquet columnar batch conversion and quantization: zero-copy bit views, row group at a time
+import os
+
+import numpy as np
+import float_formats as ff
+import float_class
+import float_quant
+from float_batch import parse_column
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+IPC_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+def require_arrow():
+    if pa is None:
+        raise ValueError("Arrow / Parquet support needs the pyarrow package.")
+
+# --- Arrow Types ---
+def native_type(fmt):
+    # Arrow float type whose buffers are exactly the format's bit patterns, if any
+    require_arrow()
+    types = {"float16": pa.float16(), "float32": pa.float32(), "float64": pa.float64()}
+    fmt = ff.get_format(fmt)
+    return types.get(fmt.name) if fmt == ff.FORMATS.get(fmt.name) else None
+
+def buffer_view(array, dtype):
+    # Zero-copy view of a fixed-width array's data buffer, honouring slice offsets
+    data = array.buffers()[1]
+    return np.frombuffer(data, dtype=dtype, count=array.offset + len(array))[array.offset:]
+
+# --- Column -> Bits ---
+def integer_values(values):
+    # float64 values of an integer array with their residual in float64 steps,
+    # so integers past 2^53 still round only once
+    x = values.astype(np.float64)
+    residual = np.zeros(len(x))
+    big = np.flatnonzero(np.abs(x) >= 2.0 ** 53)
+    if len(big):
+        diff = np.array([int(v) - int(f) for v, f in zip(values[big], x[big])], dtype=np.float64)
+        residual[big] = diff / np.abs(np.nextafter(x[big], np.where(diff < 0, -np.inf, np.inf)) - x[big])
+    return x, residual
+
+def array_bits(array, fmt, rounding="rne", raw=False):
+    # Returns (bits, valid) for one Arrow array in the target format. Native
+    # float columns of the same format are handed to the kernels without a
+    # copy, and so are raw-bit columns (raw=True: unsigned, of the format's
+    # width); every other number, integers included, rounds once by value.
+    fmt = ff.get_format(fmt)
+    uint = np.dtype(fmt.uint_name)
+    valid = np.ones(len(array), dtype=bool) if array.null_count == 0 else array.is_valid().to_numpy(zero_copy_only=False)
+    t = array.type
+    if raw:
+        if not (pa.types.is_unsigned_integer(t) and t.bit_width == uint.itemsize * 8):
+            raise ValueError(f"Raw {fmt.name} bits need a uint{uint.itemsize * 8} column, not {t}.")
+        return buffer_view(array, uint), valid
+    if t == native_type(fmt):
+        return buffer_view(array, uint), valid
+    if pa.types.is_integer(t):
+        values, residual = integer_values(array.fill_null(0).to_numpy(zero_copy_only=False))
+        return ff.compile_format(fmt).encode(values, rounding, residual=residual), valid
+    if pa.types.is_floating(t):
+        values = np.asarray(array.to_numpy(zero_copy_only=False), dtype=np.float64)
+        return ff.encode(np.where(valid, values, 0.0), fmt, rounding), valid
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        bits, ok = parse_column(array.to_numpy(zero_copy_only=False), fmt, rounding)
+        return bits, valid & ok
+    raise ValueError(f"Column type {t} cannot be converted.")
+
+# --- Bits -> Columns ---
+def bits_array(bits, valid):
+    return pa.array(bits, mask=None if valid.all() else ~valid)
+
+def value_array(bits, valid, fmt):
+    native = native_type(fmt)
+    if native is not None:
+        # Same bytes, reinterpreted: float16 stays a real half-float column
+        validity = None if valid.all() else pa.array(valid).buffers()[1]
+        return pa.Array.from_buffers(native, len(bits), [validity, pa.py_buffer(np.ascontiguousarray(bits))])
+    return pa.array(ff.decode(bits, fmt), mask=None if valid.all() else ~valid)
+
+def class_array(bits, valid, fmt):
+    codes = float_class.fpclass(bits, fmt).astype(np.int8)
+    return pa.DictionaryArray.from_arrays(pa.array(codes, mask=None if valid.all() else ~valid),
+                                          pa.array(float_class.FPCLASSES))
+
+def convert_batch(batch, columns, fmt, rounding="rne", raw=(), quant=None):
+    # Appends <col>_bits, <col>_class and <col>_<format> for every requested column,
+    # and <col>_<int format> when quant maps columns to (qfmt, scale, zero_point)
+    fmt = ff.get_format(fmt)
+    fields, arrays = list(batch.schema), list(batch.columns)
+    for col in columns:
+        bits, valid = array_bits(batch.column(col), fmt, rounding, col in raw)
+        fields += [pa.field(f"{col}_bits", pa.from_numpy_dtype(bits.dtype)),
+                   pa.field(f"{col}_class", pa.dictionary(pa.int8(), pa.string())),
+                   pa.field(f"{col}_{fmt.name}", native_type(fmt) or pa.float64())]
+        arrays += [bits_array(bits, valid), class_array(bits, valid, fmt), value_array(bits, valid, fmt)]
+        if quant and col in quant:
+            qfmt, scale, zero_point = quant[col]
+            q = float_quant.quantize(source_values(batch.column(col), fmt, col in raw), scale, zero_point, qfmt)
+            meta = {"scale": repr(float(scale)), "zero_point": str(int(zero_point))}
+            fields.append(pa.field(f"{col}_{qfmt.name}", pa.from_numpy_dtype(q.dtype), metadata=meta))
+            arrays.append(pa.array(q, mask=None if valid.all() else ~valid))
+    return pa.RecordBatch.from_arrays(arrays, schema=pa.schema(fields))
+
+# --- Quantization ---
+def source_values(array, fmt, raw=False):
+    # float64 values a column holds (NaN for nulls); strings and raw bits as the format decodes them
+    t = array.type
+    if raw or pa.types.is_string(t) or pa.types.is_large_string(t):
+        bits, valid = array_bits(array, fmt, raw=raw)
+        return np.where(valid, ff.decode(bits, fmt), np.nan)
+    return np.asarray(array.to_numpy(zero_copy_only=False), dtype=np.float64)
+
+def calibrate_file(source, columns, fmt, qfmt, method="minmax", symmetric=False, raw=()):
+    # Per-column (qfmt, scale, zero_point), calibrated over every row group
+    qfmt = float_quant.get_int_format(qfmt)
+    cals = {col: float_quant.Calibrator(qfmt, method, symmetric) for col in columns}
+    steps = ["observe_range", "observe_histogram"] if float_quant.Calibrator(qfmt, method).needs_histogram else ["observe_range"]
+    for step in steps:
+        for batch in iter_batches(source):
+            for col, cal in cals.items():
+                getattr(cal, step)(source_values(batch.column(col), fmt, col in raw)[:, None])
+    out = {}
+    for col, cal in cals.items():
+        scale, zero_point = cal.params()
+        out[col] = (qfmt, scale[0], zero_point[0])
+    return out
+
+# --- Files ---
+def convertible_columns(schema):
+    return [f.name for f in schema if pa.types.is_floating(f.type) or pa.types.is_integer(f.type)
+            or pa.types.is_string(f.type) or pa.types.is_large_string(f.type)]
+
+def float_columns(schema):
+    # Converted when no columns are named; integer and string columns are often
+    # ids or labels, so they only go in by name
+    return [f.name for f in schema if pa.types.is_floating(f.type)]
+
+def raw_columns(schema, fmt):
+    # Columns that can hold raw bit patterns of the format
+    width = np.dtype(ff.get_format(fmt).uint_name).itemsize * 8
+    return [f.name for f in schema if pa.types.is_unsigned_integer(f.type) and f.type.bit_width == width]
+
+def is_ipc(path):
+    return str(path).lower().endswith(IPC_SUFFIXES)
+
+def read_schema(source):
+    require_arrow()
+    if is_ipc(getattr(source, "name", source)):
+        return pa.ipc.open_file(source).schema
+    return pq.ParquetFile(source).schema_arrow
+
+def iter_batches(source):
+    # One record batch per Parquet row group / IPC batch, never the whole file
+    require_arrow()
+    if is_ipc(getattr(source, "name", source)):
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+        return
+    f = pq.ParquetFile(source)
+    for i in range(f.num_row_groups):
+        yield from f.read_row_group(i).to_batches()
+
+def convert_file(source, dest, columns, fmt, rounding="rne", raw=(), qfmt=None, method="minmax", symmetric=False):
+    # Streams source (Parquet or Arrow IPC) into dest in the same container; returns
+    # rows written. With qfmt, a calibration pass over the file comes first.
+    require_arrow()
+    columns = list(columns or float_columns(read_schema(source)))
+    for col in raw:
+        if col not in columns:
+            columns.append(col)
+    quant = calibrate_file(source, columns, fmt, qfmt, method, symmetric, raw) if qfmt else None
+    rows, writer = 0, None
+    try:
+        for batch in iter_batches(source):
+            out = convert_batch(batch, columns, fmt, rounding, raw, quant)
+            if writer is None:
+                writer = pa.ipc.new_file(dest, out.schema) if is_ipc(dest) else pq.ParquetWriter(dest, out.schema)
+            if is_ipc(dest):
+                writer.write_batch(out)
+            else:
+                writer.write_table(pa.Table.from_batches([out]))
+            rows += out.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def class_summary(path, columns):
+    # Per-column fpclass counts of a converted file, read column by column
+    counts = {col: np.zeros(len(float_class.FPCLASSES), dtype=np.int64) for col in columns}
+    for batch in iter_batches(path):
+        for col in columns:
+            arr = batch.column(f"{col}_class")
+            codes = arr.indices.to_numpy(zero_copy_only=False)
+            codes = codes[arr.is_valid().to_numpy(zero_copy_only=False)] if arr.null_count else codes
+            counts[col] += np.bincount(codes.astype(np.intp), minlength=len(float_class.FPCLASSES))
+    return {col: dict(zip(float_class.FPCLASSES, c.tolist())) for col, c in counts.items()}
+
+def output_path(path, fmt):
+    root, ext = os.path.splitext(path)
+    return f"{root}_{ff.get_format(fmt).name}{ext or '.parquet'}"
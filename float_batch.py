@@ -0,0 +1,218 @@
+# Vectorized batch conversion for the Float Toolkit
+import functools
+import io
+import os
+import tempfile
+import weakref
+import numpy as np
+import pandas as pd
+import float_formats as ff
+import float_cache
+import float_class
+import fp8_tables
+from float_decimal import parse_decimal
+
+# --- Formats ---
+# Rows whose input does not parse get a class of their own rather than that of their zero bits
+CLASSES = ff.CLASSES + ["Invalid"]
+INVALID = CLASSES.index("Invalid")
+
+OPS = {
+    "Convert": None,
+    "Addition": "add",
+    "Subtraction": "sub",
+    "Multiplication": "mul",
+    "Division": "div",
+    "Square Root": "sqrt",
+}
+BINARY_OPS = ["Addition", "Subtraction", "Multiplication", "Division"]
+
+# 65,536 four-digit hex strings; wider words are assembled from 16-bit groups
+HEX16 = np.array([f"{i:04x}" for i in range(1 << 16)])
+
+@functools.lru_cache(maxsize=None)
+def hex_table(total_bits):
+    return np.array([f"{i:0{-(-total_bits // 4)}x}" for i in range(1 << total_bits)])
+
+# --- Parsing ---
+def parse_column(tokens, fmt, rounding="rne"):
+    fmt = ff.get_format(fmt)
+    # Nulls (None / NaN, e.g. from Arrow string columns) become empty, hence invalid, tokens
+    tokens = pd.Series(tokens, dtype=object).fillna("").astype(str).str.strip().str.lower()
+    is_hex = tokens.str.startswith("0x")
+    bits = np.zeros(len(tokens), dtype=fmt.uint_name)
+    valid = np.zeros(len(tokens), dtype=bool)
+
+    # Straight from the string: pd.to_numeric is not correctly rounded, and float64 first would round twice
+    dec_idx = np.flatnonzero(~is_hex.to_numpy())
+    bits[dec_idx], valid[dec_idx] = parse_decimal(tokens.iloc[dec_idx].tolist(), fmt, rounding)
+
+    hex_idx = np.flatnonzero(is_hex.to_numpy())
+    if len(hex_idx):
+        digits = tokens.iloc[hex_idx].str[2:]
+        ok = digits.str.fullmatch(f"[0-9a-f]{{1,{-(-fmt.total_bits // 4)}}}").to_numpy()
+        hex_idx, digits = hex_idx[ok], digits[ok]
+        values = np.array([int(d, 16) for d in digits], dtype=np.uint64)
+        in_range = values >> np.uint64(fmt.total_bits - 1) <= 1
+        bits[hex_idx[in_range]] = values[in_range]
+        valid[hex_idx[in_range]] = True
+    return bits, valid
+
+def read_text(text):
+    rows = [line.replace(";", ",").split(",") for line in text.splitlines() if line.strip()]
+    a = [r[0] for r in rows]
+    b = [r[1] if len(r) > 1 else "" for r in rows]
+    return a, b
+
+def read_csv(data):
+    df = pd.read_csv(io.BytesIO(data), header=None, dtype=str, keep_default_na=False, comment="#")
+    a = df.iloc[:, 0].tolist()
+    b = df.iloc[:, 1].tolist() if df.shape[1] > 1 else [""] * len(a)
+    return a, b
+
+# --- Streaming ---
+CHUNK_ROWS = 1 << 16
+
+class Spool:
+    # A temporary file removed by close(), when the object is garbage collected
+    # (e.g. along with the session state holding it) or at interpreter exit
+    def __init__(self, suffix=".csv"):
+        fd, self.path = tempfile.mkstemp(prefix="float_batch_", suffix=suffix)
+        os.close(fd)
+        self.close = weakref.finalize(self, remove_file, self.path)
+
+def remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+def iter_csv(source, chunk_rows=CHUNK_ROWS):
+    # source: path or binary file object; yields (a, b) token lists per chunk
+    reader = pd.read_csv(source, header=None, dtype=str, keep_default_na=False, comment="#", chunksize=chunk_rows)
+    for df in reader:
+        a = df.iloc[:, 0].tolist()
+        yield a, df.iloc[:, 1].tolist() if df.shape[1] > 1 else [""] * len(a)
+
+def stream_batch(chunks, op, fmt):
+    # read -> parse -> convert / op -> format, one chunk at a time
+    for a, b in chunks:
+        yield convert_batch(a, b, op, fmt)
+
+def class_counts(df):
+    # {class: [rows, valid rows]} of one converted chunk
+    valid = df.loc[df["valid"], "class"].value_counts()
+    return {name: [int(n), int(valid.get(name, 0))] for name, n in df["class"].value_counts().items() if n}
+
+def spool_csv(frames, path, index):
+    # Appends every frame to the CSV at path and passes it through, so the caller
+    # can show partial results while the full output never sits in memory. Each
+    # frame adds (start, end, class counts) to index; writing resumes after the
+    # last indexed frame, so a spool cut short mid-frame is trimmed first.
+    with open(path, "r+b") as f:
+        f.truncate(index[-1][1] if index else 0)
+        f.seek(0, os.SEEK_END)
+        for df in frames:
+            if f.tell() == 0:
+                f.write(df.head(0).to_csv(index=False).encode())
+            start = f.tell()
+            f.write(df.to_csv(index=False, header=False).encode())
+            index.append((start, f.tell(), class_counts(df)))
+            yield df
+
+def read_page(path, index, classes, valid_only, start, size):
+    # Rows start..start+size of a spooled result after filtering; the index
+    # counts say which chunks hold them, so only those are read
+    columns = pd.read_csv(path, nrows=0).columns
+    parts, seen = [], 0
+    with open(path, "rb") as f:
+        for lo_byte, hi_byte, counts in index:
+            n = sum(counts.get(c, [0, 0])[1 if valid_only else 0] for c in classes)
+            if seen + n > start:
+                f.seek(lo_byte)
+                df = pd.read_csv(io.BytesIO(f.read(hi_byte - lo_byte)), header=None, names=columns,
+                                 dtype={"input": str, "input_b": str, "hex": str, "sign": "Int64", "exponent": "Int64",
+                                        "mantissa": "Int64"},
+                                 keep_default_na=False, na_values={"value": ["NaN", "nan", ""], "sign": [""],
+                                                                   "exponent": [""], "mantissa": [""]})
+                mask = df["class"].isin(classes)
+                if valid_only:
+                    mask &= df["valid"]
+                view = df[mask]
+                parts.append(view.iloc[max(start - seen, 0):start + size - seen])
+            seen += n
+            if seen >= start + size:
+                break
+    return pd.concat(parts) if parts else pd.DataFrame()
+
+# --- Formatting ---
+def hex_strings(bits, total_bits, prefix="0x"):
+    if total_bits <= 16:
+        return np.char.add(prefix, hex_table(total_bits)[bits.astype(np.intp)])
+    out = HEX16[(bits & 0xFFFF).astype(np.intp)]
+    for shift in range(16, total_bits, 16):
+        out = np.char.add(HEX16[((bits >> shift) & 0xFFFF).astype(np.intp)], out)
+    return np.char.add(prefix, out)
+
+# --- Batch Conversion ---
+def compute_op(op, a_bits, b_bits, fmt):
+    if b_bits is not None and fmt.total_bits <= 8:
+        return fp8_tables.apply_op(op, a_bits, b_bits, fmt)
+    return ff.apply_op(op, a_bits, b_bits, fmt)
+
+def cached_op(op, a_bits, b_bits, fmt):
+    # Small batches go through the shared on-disk cache, distinct pairs only
+    cache = float_cache.get_cache()
+    if cache is None or len(a_bits) > 16 * float_cache.BATCH_LIMIT:
+        return compute_op(op, a_bits, b_bits, fmt)
+    b_key = b_bits if b_bits is not None else np.zeros_like(a_bits)
+    pairs, inverse = np.unique(np.stack([a_bits.astype(np.uint64), b_key.astype(np.uint64)]), axis=1, return_inverse=True)
+    if pairs.shape[1] > float_cache.BATCH_LIMIT:
+        return compute_op(op, a_bits, b_bits, fmt)
+    keys = list(zip(pairs[0].tolist(), pairs[1].tolist()))
+    found = cache.get_many(fmt, op, "rne", keys)
+    miss = [i for i, key in enumerate(keys) if key not in found]
+    out = np.array([found.get(key, 0) for key in keys], dtype=np.uint64)
+    if miss:
+        a_miss = pairs[0][miss].astype(a_bits.dtype)
+        b_miss = pairs[1][miss].astype(a_bits.dtype) if b_bits is not None else None
+        out[miss] = compute_op(op, a_miss, b_miss, fmt)
+        cache.put_many(fmt, op, "rne", [(keys[i][0], keys[i][1], int(out[i])) for i in miss])
+    return out[inverse.reshape(-1)].astype(a_bits.dtype)
+
+def convert_batch(a_tokens, b_tokens, op, fmt):
+    fmt = ff.get_format(fmt)
+    a_bits, valid = parse_column(a_tokens, fmt)
+    if OPS[op] is None:
+        bits = a_bits
+    elif op in BINARY_OPS:
+        b_bits, b_valid = parse_column(b_tokens, fmt)
+        valid &= b_valid
+        bits = cached_op(OPS[op], a_bits, b_bits, fmt)
+    else:
+        bits = cached_op(OPS[op], a_bits, None, fmt)
+
+    s, e, m, status = ff.breakdown_array(bits, fmt)
+
+    df = pd.DataFrame({"input": a_tokens})
+    if op in BINARY_OPS:
+        df["input_b"] = b_tokens
+    df["value"] = ff.decode(bits, fmt)
+    df["hex"] = hex_strings(bits, fmt.total_bits)
+    df["sign"] = s
+    df["exponent"] = e
+    df["mantissa"] = m
+    df["class"] = pd.Categorical.from_codes(np.where(valid, status, INVALID), CLASSES)
+    df["fpclass"] = pd.Categorical.from_codes(np.where(valid, float_class.fpclass(bits, fmt).astype(np.int8), -1), float_class.FPCLASSES)
+    df["valid"] = valid
+    # Invalid rows hold placeholder zero bits; show none of their fields
+    df.loc[~valid, "value"] = np.nan
+    df.loc[~valid, "hex"] = ""
+    for col in ("sign", "exponent", "mantissa"):
+        df[col] = df[col].astype("Int64").mask(~valid)
+    return df
+
+# --- Export ---
+def csv_chunks(df, chunk_rows=CHUNK_ROWS):
+    # Encoded CSV of a converted frame, one chunk at a time; a caller that needs a
+    # single payload (st.download_button) joins them and holds the whole file
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0).encode()
@@ -0,0 +1,101 @@
+# Vectorized bit matrices and bit-plane activity heatmaps over large arrays
+import numpy as np
+import float_formats as ff
+
+CHUNK = 1 << 20
+BLOCKS = 1 << 16
+SHADES = " .:-=+*#%@"
+
+# --- Bit Matrix ---
+def plane_labels(fmt):
+    # Most significant first: sign, exponent bits, mantissa bits
+    fmt = ff.get_format(fmt)
+    return (["S"] + [f"E{i}" for i in range(fmt.exp_bits - 1, -1, -1)]
+            + [f"M{i}" for i in range(fmt.man_bits - 1, -1, -1)])
+
+def bit_matrix(bits, fmt):
+    # (n, total_bits) uint8 matrix, most significant bit first, in one unpackbits pass
+    fmt = ff.get_format(fmt)
+    uint = np.dtype(fmt.uint_name).newbyteorder(">")
+    words = np.ascontiguousarray(np.asarray(bits).reshape(-1), dtype=uint)
+    matrix = np.unpackbits(words.view(np.uint8).reshape(len(words), uint.itemsize), axis=1)
+    return matrix[:, uint.itemsize * 8 - fmt.total_bits:]
+
+def binary_strings(bits, fmt):
+    matrix = bit_matrix(bits, fmt)
+    return (matrix + ord("0")).view(f"S{matrix.shape[1]}").reshape(-1).astype(str)
+
+def plane_sums(bits, fmt, edges):
+    # Ones per bit plane between consecutive edges, decoded chunk by chunk
+    fmt = ff.get_format(fmt)
+    edges = np.asarray(edges, dtype=np.int64)
+    out = np.zeros((len(edges) - 1, fmt.total_bits), dtype=np.int64)
+    for pos in range(int(edges[0]), int(edges[-1]), CHUNK):
+        stop = min(pos + CHUNK, int(edges[-1]))
+        matrix = bit_matrix(bits[pos:stop], fmt)
+        # Segments lo..hi-1 overlap this chunk; empty ones are skipped so that
+        # each reduceat run ends where the next non-empty segment starts
+        lo = np.searchsorted(edges, pos, side="right") - 1
+        hi = np.searchsorted(edges, stop, side="left")
+        starts = np.clip(edges[lo:hi], pos, stop) - pos
+        nonempty = starts < np.clip(edges[lo + 1:hi + 1], pos, stop) - pos
+        out[lo:hi][nonempty] += np.add.reduceat(matrix, starts[nonempty], axis=0, dtype=np.int64)
+    return out
+
+# --- Heatmaps ---
+class BitPlanes:
+    # Per-plane prefix counts at block resolution, built in one pass; heatmaps of
+    # any window come from the prefix counts, and only windows narrower than a
+    # few blocks go back to the raw bits.
+    def __init__(self, bits, fmt, blocks=BLOCKS):
+        self.fmt = ff.get_format(fmt)
+        self.bits = np.asarray(bits).reshape(-1)
+        n = len(self.bits)
+        self.block = max(1, -(-n // blocks))
+        self.edges = np.append(np.arange(0, n, self.block), n)
+        self.prefix = np.zeros((len(self.edges), self.fmt.total_bits), dtype=np.int64)
+        np.cumsum(plane_sums(self.bits, self.fmt, self.edges), axis=0, out=self.prefix[1:])
+
+    def __len__(self):
+        return len(self.bits)
+
+    def labels(self):
+        return plane_labels(self.fmt)
+
+    def heatmap(self, start=0, stop=None, rows=256):
+        # (rows, total_bits) fraction of ones per plane, plus the row edges
+        stop = len(self) if stop is None else min(stop, len(self))
+        if not 0 <= start < stop:
+            raise ValueError("Empty window.")
+        rows = min(rows, stop - start)
+        edges = np.linspace(start, stop, rows + 1).round().astype(np.int64)
+        if stop - start >= 4 * rows * self.block:
+            # Snap to block boundaries; each row then spans at least four blocks
+            idx = np.searchsorted(self.edges, edges)
+            idx[-1] = min(idx[-1], len(self.edges) - 1)
+            edges = self.edges[idx]
+            counts = np.diff(self.prefix[idx], axis=0)
+            sizes = np.diff(edges)
+        else:
+            counts = plane_sums(self.bits, self.fmt, edges)
+            sizes = np.diff(edges)
+        return counts / np.maximum(sizes, 1)[:, None], edges
+
+    def activity(self, start=0, stop=None):
+        # Fraction of ones per plane over a window
+        return self.heatmap(start, stop, rows=1)[0][0]
+
+# --- Rendering ---
+def heatmap_image(matrix, fmt, cell=(2, 8)):
+    # RGB image: sign / exponent / mantissa planes tinted red / green / blue, brighter = more ones
+    fmt = ff.get_format(fmt)
+    tint = np.array([[255, 80, 80]] + [[80, 220, 80]] * fmt.exp_bits + [[80, 140, 255]] * fmt.man_bits, dtype=np.float64)
+    rgb = (matrix[:, :, None] * tint[None, :, :] + 16).clip(0, 255).astype(np.uint8)
+    return np.repeat(np.repeat(rgb, cell[0], axis=0), cell[1], axis=1)
+
+def format_heatmap(matrix, edges, fmt):
+    labels = plane_labels(fmt)
+    lines = [" " * 12 + " ".join(f"{l:>3}" for l in labels)]
+    for row, lo in zip(matrix, edges[:-1]):
+        lines.append(f"{lo:>12}" + " ".join(f"  {SHADES[min(int(v * len(SHADES)), len(SHADES) - 1)]}" for v in row))
+    return "\n".join(lines)
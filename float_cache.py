@@ -0,0 +1,199 @@
+# Persistent on-disk result cache shared by app replicas, CLI runs and batch jobs (SQLite, WAL)
+import atexit
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+import float_formats as ff
+
+CACHE_DIR = os.environ.get("FLOATCONVERSION_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "floatconversion"))
+CACHE_VERSION = 1
+MAX_ENTRIES = int(os.environ.get("FLOATCONVERSION_CACHE_ENTRIES", 1_000_000))
+# Vectorized kernels beat a database round trip on large arrays; batches only
+# consult the cache up to this many distinct operand pairs.
+BATCH_LIMIT = 4096
+FLUSH_EVERY = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    fmt TEXT NOT NULL, op TEXT NOT NULL, rounding TEXT NOT NULL,
+    a INTEGER NOT NULL, b INTEGER NOT NULL, result INTEGER NOT NULL, used REAL NOT NULL,
+    UNIQUE (fmt, op, rounding, a, b)
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+# --- Keys ---
+def format_key(fmt):
+    # Every field of the spec, so two custom formats never share a name
+    return ":".join(str(v) for v in fmt)
+
+def to_sql(bits):
+    # SQLite integers are signed 64-bit
+    bits = int(bits)
+    return bits - (1 << 64) if bits >= 1 << 63 else bits
+
+def from_sql(value):
+    return value + (1 << 64) if value < 0 else value
+
+# --- Cache ---
+class ResultCache:
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        self.path = path or os.path.join(CACHE_DIR, f"results_v{CACHE_VERSION}_k{ff.KERNEL_REVISION}.sqlite")
+        self.max_entries = max_entries
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.pending = {"hits": 0, "misses": 0}
+        # Last use of each hit row, written back with the counters instead of on every hit
+        self.touched = {}
+        self.writes = 0
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+
+    def connect(self):
+        # One connection per thread; Streamlit runs sessions on separate threads
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self.local.db = db
+        return db
+
+    def count(self, hits=0, misses=0):
+        with self.lock:
+            self.pending["hits"] += hits
+            self.pending["misses"] += misses
+            if self.pending["hits"] + self.pending["misses"] < FLUSH_EVERY:
+                return
+        self.flush()
+
+    def touch(self, keys):
+        now = time.time()
+        with self.lock:
+            self.touched.update((key, now) for key in keys)
+
+    def flush(self):
+        # Counters and recency are batched in memory and written here in one transaction
+        with self.lock:
+            pending, self.pending = self.pending, {"hits": 0, "misses": 0}
+            touched, self.touched = self.touched, {}
+        if not any(pending.values()) and not touched:
+            return
+        db = self.connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany("UPDATE stats SET value = value + ? WHERE name = ?", [(v, k) for k, v in pending.items()])
+            db.executemany("UPDATE results SET used = ? WHERE fmt = ? AND op = ? AND rounding = ? AND a = ? AND b = ?",
+                           [(used,) + key for key, used in touched.items()])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def get(self, fmt, op, rounding, a, b=0):
+        db = self.connect()
+        key = (format_key(fmt), op, rounding, to_sql(a), to_sql(b))
+        row = db.execute("SELECT result FROM results WHERE fmt = ? AND op = ? AND rounding = ? AND a = ? AND b = ?",
+                         key).fetchone()
+        if row is None:
+            self.count(misses=1)
+            return None
+        self.touch([key])
+        self.count(hits=1)
+        return from_sql(row[0])
+
+    def put(self, fmt, op, rounding, a, b, result):
+        self.put_many(fmt, op, rounding, [(a, b, result)])
+
+    def put_many(self, fmt, op, rounding, rows):
+        fkey, now = format_key(fmt), time.time()
+        db = self.connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           [(fkey, op, rounding, to_sql(a), to_sql(b or 0), to_sql(r), now) for a, b, r in rows])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self.writes += len(rows)
+        if self.writes >= 256:
+            self.writes = 0
+            self.evict()
+
+    def get_many(self, fmt, op, rounding, pairs):
+        # pairs: iterable of (a, b); returns {(a, b): result} for the hits
+        pairs, fkey = list(pairs), format_key(fmt)
+        db = self.connect()
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS lookup (a INTEGER, b INTEGER)")
+        db.execute("BEGIN")
+        try:
+            db.execute("DELETE FROM lookup")
+            db.executemany("INSERT INTO lookup VALUES (?, ?)", [(to_sql(a), to_sql(b or 0)) for a, b in pairs])
+            rows = db.execute("SELECT r.a, r.b, r.result FROM lookup l JOIN results r ON r.fmt = ? AND r.op = ? "
+                              "AND r.rounding = ? AND r.a = l.a AND r.b = l.b", (fkey, op, rounding)).fetchall()
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self.touch((fkey, op, rounding, a, b) for a, b, _ in rows)
+        found = {(from_sql(a), from_sql(b)): from_sql(r) for a, b, r in rows}
+        self.count(hits=len(found), misses=len(pairs) - len(found))
+        return found
+
+    def cached(self, fmt, op, rounding, a, b, compute):
+        result = self.get(fmt, op, rounding, a, b or 0)
+        if result is None:
+            result = int(compute())
+            self.put(fmt, op, rounding, a, b, result)
+        return result
+
+    def evict(self):
+        # Pending recency first, so rows hit since the last flush are not the ones dropped
+        self.flush()
+        db = self.connect()
+        n = db.execute("SELECT count(*) FROM results").fetchone()[0]
+        # Trim 10% below the bound so eviction does not run on every write
+        excess = n - int(self.max_entries * 0.9) if n > self.max_entries else 0
+        if excess > 0:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY used LIMIT ?)", (excess,))
+            db.execute("UPDATE stats SET value = value + ? WHERE name = 'evictions'", (excess,))
+            db.execute("COMMIT")
+        return max(excess, 0)
+
+    def stats(self):
+        db = self.connect()
+        out = dict(db.execute("SELECT name, value FROM stats").fetchall())
+        with self.lock:
+            for k, v in self.pending.items():
+                out[k] += v
+        out["entries"] = db.execute("SELECT count(*) FROM results").fetchone()[0]
+        out["max_entries"] = self.max_entries
+        out["path"] = self.path
+        return out
+
+    def clear(self):
+        db = self.connect()
+        db.execute("DELETE FROM results")
+        db.execute("UPDATE stats SET value = 0")
+
+@functools.lru_cache(maxsize=None)
+def get_cache():
+    # None when the cache directory is unusable; callers then just compute
+    try:
+        cache = ResultCache()
+    except (OSError, sqlite3.Error):
+        return None
+    atexit.register(cache.flush)
+    return cache
+
+def cached_result(fmt, op, rounding, a, b, compute):
+    cache = get_cache()
+    return cache.cached(fmt, op, rounding, a, b, compute) if cache else int(compute())
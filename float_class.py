@@ -0,0 +1,105 @@
+# Fine-grained fpclass (signed zeros, subnormals, normals, infinities, quiet / signaling NaN) with NaN payloads
+import functools
+from collections import namedtuple
+
+import numpy as np
+import float_formats as ff
+
+FPCLASSES = ff.FPCLASSES
+SNAN, QNAN, NEG_INF, NEG_NORMAL, NEG_SUBNORMAL, NEG_ZERO, POS_ZERO, POS_SUBNORMAL, POS_NORMAL, POS_INF = range(len(FPCLASSES))
+
+# Magnitude categories, in increasing order of the magnitude bits
+ZERO, SUBNORMAL, NORMAL, INF, SIGNALING, QUIET = range(6)
+CODES = np.array([
+    [POS_ZERO, POS_SUBNORMAL, POS_NORMAL, POS_INF, SNAN, QNAN],
+    [NEG_ZERO, NEG_SUBNORMAL, NEG_NORMAL, NEG_INF, SNAN, QNAN],
+], dtype=np.uint8)
+
+CHUNK = 1 << 16
+
+# --- Per-Format Layout ---
+Layout = namedtuple("Layout", "starts categories mag_mask payload_mask")
+
+@functools.lru_cache(maxsize=None)
+def layout(fmt):
+    # Every policy splits the magnitude range into contiguous runs, so one
+    # sorted list of run starts classifies a magnitude.
+    fmt = ff.get_format(fmt)
+    M = fmt.man_bits
+    all_ones = (1 << (fmt.exp_bits + M)) - 1
+    runs = [(0, ZERO)]
+    if M:
+        runs.append((1, SUBNORMAL if fmt.subnormals else ZERO))
+    runs.append((1 << M, NORMAL))
+    payload_mask = 0
+    if fmt.inf:
+        quiet = 1 << (M - 1)
+        runs.append((fmt.inf_mag, INF))
+        if fmt.inf_mag + 1 < fmt.inf_mag | quiet:
+            runs.append((fmt.inf_mag + 1, SIGNALING))
+        runs.append((fmt.inf_mag | quiet, QUIET))
+        payload_mask = quiet - 1
+    elif fmt.nan:
+        runs.append((all_ones, QUIET))
+    starts, categories = zip(*runs)
+    uint = np.dtype(fmt.uint_name)
+    return Layout(np.array(starts, dtype=uint), np.array(categories, dtype=np.uint8), uint.type(all_ones),
+                  uint.type(payload_mask))
+
+def _classify(bits, fmt, lay):
+    mag = bits & lay.mag_mask
+    run = np.zeros(mag.shape, dtype=np.uint8)
+    for start in lay.starts[1:]:
+        run += mag >= start
+    sign = (bits >> (fmt.total_bits - 1)).astype(np.intp)
+    return CODES[sign, lay.categories[run]]
+
+def high_word(bits, fmt):
+    # Top 16 bits plus whether anything below them is set
+    shift = fmt.total_bits - 16
+    low = bits & bits.dtype.type((1 << shift) - 1)
+    return ((bits >> shift).astype(np.intp) << 1) | (low != 0)
+
+@functools.lru_cache(maxsize=None)
+def class_table(fmt):
+    # <= 16 bits: indexed by the bits themselves. Wider IEEE / all-finite
+    # formats: indexed by high_word, since sign, exponent and quiet bit sit in
+    # the top 16 bits and only the zero-ness of the rest matters. A lone
+    # all-ones NaN (FN) needs every bit, so those keep the comparison path.
+    fmt = ff.get_format(fmt)
+    if fmt.total_bits <= 16:
+        bits = np.arange(1 << fmt.total_bits, dtype=fmt.uint_name)
+    elif fmt.inf or not fmt.nan:
+        hi = np.arange(1 << 16, dtype=np.uint64) << np.uint64(fmt.total_bits - 16)
+        bits = np.stack([hi, hi | np.uint64(1)], axis=1).reshape(-1).astype(fmt.uint_name)
+    else:
+        return None
+    codes = _classify(bits, fmt, layout(fmt))
+    codes.flags.writeable = False
+    return codes
+
+# --- Array API ---
+def fpclass(bits, fmt, payload=False):
+    fmt = ff.get_format(fmt)
+    lay = layout(fmt)
+    table = class_table(fmt)
+    bits = np.asarray(bits).astype(fmt.uint_name, copy=False)
+    if fmt.total_bits <= 16:
+        codes = table[bits]
+    else:
+        # Chunks keep the temporaries cache-resident on very large arrays
+        codes = np.empty(bits.shape, dtype=np.uint8)
+        flat, out = bits.reshape(-1), codes.reshape(-1)
+        for start in range(0, len(flat), CHUNK):
+            part = flat[start:start + CHUNK]
+            out[start:start + CHUNK] = table[high_word(part, fmt)] if table is not None else _classify(part, fmt, lay)
+    if not payload:
+        return codes
+    is_nan = codes <= QNAN
+    return codes, np.where(is_nan, bits & lay.payload_mask, 0).astype(fmt.uint_name)
+
+def nan_payload(bits, fmt):
+    return fpclass(bits, fmt, payload=True)[1]
+
+def class_counts(bits, fmt):
+    return np.bincount(fpclass(bits, fmt).reshape(-1), minlength=len(FPCLASSES))
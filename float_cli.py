@@ -0,0 +1,435 @@
+# Command-line Float Toolkit
+import argparse
+import os
+import sys
+
+from float_formats import (FORMATS, ROUNDING_MODES, BINARY_OPS, UNARY_OPS, bits_to_float, decimal_to_bits,
+                           get_format, get_params, breakdown, fpclass_of, scalar_op)
+
+# --- Shared Functions ---
+def parse_bits(s, fmt, rounding="rne"):
+    s = s.strip().lower()
+    if s.startswith("0x"):
+        return int(s[2:], 16)
+    return decimal_to_bits(s, fmt, rounding)
+
+def parse_format(name):
+    try:
+        return get_format(name)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err))
+
+def add_format_args(p):
+    p.add_argument("--format", "-f", type=parse_format, default="float16",
+                   help=f"{', '.join(FORMATS)} or ExMy[FN|FNN][B<bias>][FTZ]")
+    p.add_argument("--rounding", "-r", choices=list(ROUNDING_MODES), default="rne")
+
+def print_result(bits, fmt):
+    total_bits, exp_bits, man_bits, bias = get_params(fmt)
+    s, e, m, formula, binary, status = breakdown(bits, fmt)
+    print(f"Decimal  : {bits_to_float(bits, fmt):.17g}")
+    print(f"Hex      : 0x{bits:0{-(-total_bits // 4)}x}")
+    print(f"Binary   : {binary}")
+    print(f"Sign     : {s}")
+    print(f"Exponent : {e:0{exp_bits}b}")
+    print(f"Mantissa : {m:0{man_bits}b}")
+    print(f"Formula  : {formula}")
+    print(f"Status   : {status}")
+    print(f"Class    : {fpclass_of(bits, fmt)}")
+
+# --- Commands ---
+def cmd_convert(args):
+    print_result(parse_bits(args.value, args.format, args.rounding), args.format)
+
+def cmd_op(args):
+    import float_cache
+    a_bits = parse_bits(args.a, args.format, args.rounding)
+    b_bits = parse_bits(args.b, args.format, args.rounding) if args.b is not None else None
+    if args.op == "sqrt" and bits_to_float(a_bits, args.format) < 0:
+        sys.exit("Cannot take square root of negative number.")
+    if args.op != "sqrt" and b_bits is None:
+        sys.exit(f"{args.op} needs two operands.")
+    def compute():
+        if args.op in BINARY_OPS and args.format.total_bits <= 8:
+            import fp8_tables
+            return fp8_tables.apply_op(args.op, a_bits, b_bits, args.format, args.rounding)
+        return scalar_op(args.op, a_bits, b_bits, args.format, args.rounding)
+    print_result(float_cache.cached_result(args.format, args.op, args.rounding, a_bits, b_bits, compute), args.format)
+
+def cmd_unary(args):
+    import float_cache
+    import float16_unary
+    a_bits = parse_bits(args.value, args.format)
+    bits = float_cache.cached_result(args.format, args.function, args.rounding, a_bits, 0,
+                                     lambda: float16_unary.evaluate(args.function, a_bits, args.format, args.rounding))
+    print_result(bits, args.format)
+
+def cmd_diff(args):
+    import float_diff
+    report = float_diff.diff_files(args.a, args.b, args.format, args.top, args.chunk, args.workers)
+    print(float_diff.format_report(report))
+
+def cmd_divsim(args):
+    import float_division
+    designs = [float_division.make_design(args.table_bits, args.table_out_bits, n, args.precision, args.variant,
+                                          args.intermediate_rounding) for n in args.iterations]
+    reports = float_division.sweep(args.format, designs, args.samples, args.rounding, args.seed)
+    print("\n\n".join(float_division.format_report(r) for r in reports))
+
+def cmd_testvec(args):
+    import float_testvec
+    float_testvec.write_vectors(args.output, args.format, args.count, args.ops, args.roundings, args.seed, args.shard,
+                                args.chunk, args.workers, args.binary, args.directed)
+
+def cmd_cache(args):
+    import float_cache
+    cache = float_cache.get_cache()
+    if cache is None:
+        sys.exit(f"Cache directory {float_cache.CACHE_DIR} is not usable.")
+    if args.action == "clear":
+        cache.clear()
+    elif args.action == "evict":
+        print(f"Evicted  : {cache.evict()}")
+    for name, value in cache.stats().items():
+        print(f"{name.replace('_', ' ').capitalize():<12}: {value}")
+
+def cmd_loadtest(args):
+    import float_loadtest
+    reports = float_loadtest.sweep(args.app, args.sessions, args.steps, args.seed, args.timeout)
+    print(float_loadtest.format_report(reports))
+    if args.output:
+        float_loadtest.write_report(reports, args.output)
+
+def cmd_jobs(args):
+    import float_jobs
+    runner = float_jobs.JobRunner(workers=args.workers)
+    if args.action != "list" and args.id is None:
+        sys.exit(f"jobs {args.action} needs a job id.")
+    if args.action == "cancel":
+        runner.cancel(args.id)
+    elif args.action == "resume":
+        runner.resume(args.id)
+        try:
+            job = runner.wait(args.id, on_progress=lambda j: print(f"\r{j['done']}/{j['total']} chunks", end="", flush=True))
+        except RuntimeError as err:
+            sys.exit(f"\n{err}")
+        print(f"\n{job['status']}" + (f": {job['error']}" if job["error"] else ""))
+    if args.action in ("resume", "result"):
+        print(float_jobs.format_result(runner.job(args.id), runner.result(args.id)))
+        return
+    for job in runner.jobs():
+        print(f"{job['id']:>5}  {job['status']:<9}  {job['done']:>6}/{job['total']:<6}  {job['kind']:<15}  "
+              f"{job['owner'][:8]}  {job['error'] or ''}")
+
+def cmd_arrow(args):
+    import float_arrow
+    try:
+        output = args.output or float_arrow.output_path(args.input, args.format)
+        rows = float_arrow.convert_file(args.input, output, args.columns, args.format, args.rounding,
+                                        args.raw, args.quant, args.method, args.symmetric)
+    except (OSError, ValueError) as err:
+        sys.exit(str(err))
+    print(f"{rows} rows -> {output}")
+
+def cmd_bitplanes(args):
+    import numpy as np
+    import float_bitplane
+    from float_diff import open_dump
+    fmt = args.format
+    n = os.path.getsize(args.dump) // np.dtype(fmt.uint_name).itemsize
+    planes = float_bitplane.BitPlanes(open_dump(args.dump, fmt, 0, n), fmt)
+    matrix, edges = planes.heatmap(args.start, args.stop, args.rows)
+    print(float_bitplane.format_heatmap(matrix, edges, fmt))
+
+def cmd_density(args):
+    import float_density
+    print(float_density.format_table(args.format))
+    if args.window:
+        lo, hi = args.window
+        edges, counts = float_density.density(lo, hi, args.format, args.bins, args.log)
+        print(f"\n{float_density.count_between(lo, hi, args.format)} values in [{lo:g}, {hi:g}]")
+        for a, b, c in zip(edges[:-1], edges[1:], counts):
+            print(f"  [{a:>12.6g}, {b:>12.6g})  {c}")
+
+def cmd_doubleround(args):
+    import numpy as np
+    import float_doubleround
+    try:
+        if args.exhaustive:
+            report = float_doubleround.scan_exhaustive(args.chain, args.rounding, examples=args.examples)
+        else:
+            if args.input:
+                with open(args.input) as f:
+                    values = [line.split(",")[0].strip() for line in f if line.strip()]
+                if not args.chain.startswith(float_doubleround.DECIMAL):
+                    values = np.array(values, dtype=np.float64)
+            else:
+                values = float_doubleround.midpoint_inputs(args.chain, args.samples, args.seed)
+            report = float_doubleround.analyze(values, args.chain, args.rounding, args.examples)
+    except (OSError, ValueError) as err:
+        sys.exit(str(err))
+    print(float_doubleround.format_report(report))
+
+def cmd_parse(args):
+    import numpy as np
+    import float_decimal
+    try:
+        with (sys.stdin if args.input == "-" else open(args.input)) as f:
+            tokens, bits, valid = float_decimal.parse_text(f.read(), args.format, args.rounding)
+        if args.output:
+            bits[valid].astype(np.dtype(args.format.uint_name).newbyteorder("<")).tofile(args.output)
+    except (OSError, ValueError) as err:
+        sys.exit(str(err))
+    if not args.output:
+        width = -(-args.format.total_bits // 4)
+        for token, b, ok in zip(tokens, bits, valid):
+            print(f"{token}  0x{int(b):0{width}x}" if ok else f"{token}  invalid")
+    print(f"{int(valid.sum())} parsed, {int((~valid).sum())} invalid", file=sys.stderr)
+
+def cmd_quant(args):
+    import numpy as np
+    import float_quant
+    axis = -1 if args.channels else None
+    try:
+        x = float_quant.dump_values(args.dump, args.format, args.channels)
+        schemes = [(q, m) for q in args.qformat for m in args.method]
+        if args.output and len(schemes) > 1:
+            raise ValueError("--output needs a single integer format and method.")
+        targets = list(args.compare)
+        for q, m in schemes:
+            scale, zero_point = float_quant.calibrate(x, q, m, axis, args.symmetric, args.percentile)
+            name = float_quant.scheme_name(q, m, axis, args.symmetric)
+            targets.append((name, scale, zero_point, q))
+            print(f"{name}: scale {scale.min():.6g}..{scale.max():.6g}, zero point {zero_point.min()}..{zero_point.max()}")
+        if args.output:
+            _, scale, zero_point, q = targets[-1]
+            packed = float_quant.get_int_format(q).bits == 4
+            carry = np.zeros(0, dtype=np.int8)
+            with open(args.output, "wb") as f:
+                for block in float_quant.quantize_stream(x, scale, zero_point, q, axis):
+                    if packed:
+                        # An odd value left over pairs up with the next block
+                        block = np.concatenate([carry, block])
+                        carry, block = block[len(block) - len(block) % 2:], float_quant.pack_int4(block[:len(block) - len(block) % 2])
+                    f.write(block.astype(block.dtype.newbyteorder("<")).tobytes())
+                if len(carry):
+                    f.write(float_quant.pack_int4(carry).tobytes())
+        reports = float_quant.compare(x, targets, axis, args.rounding)
+    except (OSError, ValueError) as err:
+        sys.exit(str(err))
+    print()
+    print(float_quant.format_reports(reports))
+
+def cmd_interval(args):
+    import numpy as np
+    import float_interval
+    fmt = args.format
+    if (len(args.bounds) != 2) != (args.op != "sqrt") or len(args.bounds) not in (2, 4):
+        sys.exit("sqrt takes one interval (LO HI); the other operations take two (A_LO A_HI B_LO B_HI).")
+    try:
+        # Decimal endpoints are rounded outward straight from the string
+        ends = [float_interval.enclose_decimal(lo, hi, fmt) for lo, hi in zip(args.bounds[::2], args.bounds[1::2])]
+        ends = [np.array([b], dtype=fmt.uint_name) for pair in ends for b in pair]
+        lo, hi = float_interval.interval_op(args.op, *ends, fmt=fmt)
+    except ValueError as err:
+        sys.exit(str(err))
+    for name, (a, b) in zip("AB", zip(ends[::2], ends[1::2])):
+        print(f"{name}      : {float_interval.format_interval(a[0], b[0], fmt)}")
+    print(f"{args.op:<7}: {float_interval.format_interval(lo[0], hi[0], fmt)}")
+
+def cmd_sort(args):
+    import numpy as np
+    import float_sort
+    from float_diff import open_dump
+    fmt = args.format
+    try:
+        if args.output:
+            n = float_sort.sort_dump(args.dump, args.output, fmt, args.unique)
+            print(f"Wrote {n} {'distinct ' if args.unique else ''}values in totalOrder to {args.output}")
+            return
+        if fmt.total_bits <= float_sort.COUNTING_BITS:
+            counts = float_sort.dump_histogram(args.dump, fmt)
+            present = np.flatnonzero(counts)
+            values, counts = float_sort.from_key(present, fmt), counts[present]
+        else:
+            n = os.path.getsize(args.dump) // np.dtype(fmt.uint_name).itemsize
+            values, counts = float_sort.unique_counts(np.asarray(open_dump(args.dump, fmt, 0, n)), fmt)
+    except (OSError, ValueError) as err:
+        sys.exit(str(err))
+    print(float_sort.format_counts(values, counts, fmt, args.top))
+
+def cmd_compress(args):
+    import float_compress
+    try:
+        report = float_compress.analyze_file(args.dump, args.format, [None] + args.keep, args.codecs, args.chunk,
+                                             args.workers, args.max_chunks)
+    except (OSError, ValueError) as err:
+        sys.exit(str(err))
+    print(float_compress.format_report(report, args.top))
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="float_cli", description="Float16 / Float32 / Float64 toolkit")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("convert", help="Convert a decimal or 0x-prefixed hex value")
+    p.add_argument("value")
+    add_format_args(p)
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("op", help="Apply an arithmetic operation")
+    p.add_argument("op", choices=BINARY_OPS + UNARY_OPS)
+    p.add_argument("a")
+    p.add_argument("b", nargs="?")
+    add_format_args(p)
+    p.set_defaults(func=cmd_op)
+
+    p = sub.add_parser("unary", help="Correctly rounded unary function from a lookup table (<= 16-bit formats)")
+    p.add_argument("function", choices=["sqrt", "rsqrt", "reciprocal", "exp", "log", "sin", "cos", "tanh", "gelu"])
+    p.add_argument("value")
+    add_format_args(p)
+    p.set_defaults(func=cmd_unary)
+
+    p = sub.add_parser("diff", help="Bitwise / ULP diff of two raw little-endian float dumps")
+    p.add_argument("a")
+    p.add_argument("b")
+    p.add_argument("--format", "-f", type=parse_format, default="float16")
+    p.add_argument("--top", type=int, default=20, help="Number of worst offsets to list")
+    p.add_argument("--chunk", type=int, default=1 << 22, help="Elements per chunk")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser("divsim", help="Table-seeded Newton-Raphson division emulation vs correctly rounded division")
+    p.add_argument("--table-bits", type=int, default=7, help="Seed table index bits")
+    p.add_argument("--table-out-bits", type=int, default=None, help="Seed table entry precision (default: index bits + 1)")
+    p.add_argument("--iterations", "-n", type=int, nargs="+", default=[2], help="One or more iteration counts to sweep")
+    p.add_argument("--precision", "-p", type=int, default=28, help="Intermediate significand precision in bits")
+    p.add_argument("--variant", choices=["reciprocal", "corrected"], default="reciprocal")
+    p.add_argument("--intermediate-rounding", choices=["rne", "rtz"], default="rne")
+    p.add_argument("--samples", type=int, default=1 << 18, help="Random finite, nonzero operand pairs")
+    p.add_argument("--seed", type=int, default=0)
+    add_format_args(p)
+    p.set_defaults(func=cmd_divsim)
+
+    p = sub.add_parser("testvec", help="Write deterministic test vectors (op, operands, rounding, result, flags)")
+    p.add_argument("output")
+    p.add_argument("--format", "-f", type=parse_format, default="float16")
+    p.add_argument("--count", "-n", type=int, default=1 << 20, help="Number of records")
+    p.add_argument("--ops", nargs="+", choices=BINARY_OPS + UNARY_OPS, default=None, help="Operations (default: all)")
+    p.add_argument("--roundings", nargs="+", choices=list(ROUNDING_MODES), default=None, help="Rounding modes (default: all)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--shard", type=int, default=0, help="Shard index; (seed, shard) reproduce the same file")
+    p.add_argument("--chunk", type=int, default=1 << 16, help="Records per chunk")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    p.add_argument("--binary", action="store_true", help="Compact binary records instead of hex text")
+    p.add_argument("--directed", action="store_true",
+                   help="Draw operands per (class pair, exponent difference) bin instead of uniform bit patterns")
+    p.set_defaults(func=cmd_testvec)
+
+    p = sub.add_parser("cache", help="Show, trim or clear the persistent result cache")
+    p.add_argument("action", choices=["stats", "evict", "clear"], nargs="?", default="stats")
+    p.set_defaults(func=cmd_cache)
+
+    p = sub.add_parser("loadtest", help="Drive a Streamlit toolkit with N simulated sessions and report rerun latency")
+    p.add_argument("app", help="Streamlit script, e.g. float16-32-64.py or float16_stream.py")
+    p.add_argument("--sessions", "-n", type=int, nargs="+", default=[1, 4, 16], help="Session counts to sweep (at most one process per CPU; the rest queue)")
+    p.add_argument("--steps", type=int, default=20, help="Interactions per session")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--timeout", type=float, default=60, help="Seconds allowed per rerun")
+    p.add_argument("--output", "-o", help="Write the full report as JSON")
+    p.set_defaults(func=cmd_loadtest)
+
+    p = sub.add_parser("jobs", help="List, cancel, resume or show background analysis jobs")
+    p.add_argument("action", choices=["list", "cancel", "resume", "result"], nargs="?", default="list")
+    p.add_argument("id", type=int, nargs="?")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes for resume (default: all cores)")
+    p.set_defaults(func=cmd_jobs)
+
+    p = sub.add_parser("arrow", help="Add bits / class / converted-value (and quantized) columns to a Parquet or Arrow IPC file")
+    p.add_argument("input")
+    p.add_argument("--output", "-o", help="Output file (default: <input>_<format>.<ext>; .arrow/.feather write Arrow IPC)")
+    p.add_argument("--columns", "-c", nargs="+", default=None, help="Columns to convert by value (default: float columns)")
+    p.add_argument("--raw", nargs="+", default=[], help="Unsigned columns holding raw bit patterns of the format")
+    add_format_args(p)
+    p.add_argument("--quant", "-q", default=None, help="Also add <col>_<qformat> columns: int8, uint8, int4, ...")
+    p.add_argument("--method", "-m", choices=["minmax", "percentile", "mse"], default="minmax")
+    p.add_argument("--symmetric", action="store_true", help="Zero point fixed at zero (mid-range for unsigned)")
+    p.set_defaults(func=cmd_arrow)
+
+    p = sub.add_parser("bitplanes", help="Bit-plane activity heatmap of a raw little-endian float dump")
+    p.add_argument("dump")
+    p.add_argument("--format", "-f", type=parse_format, default="float16")
+    p.add_argument("--rows", type=int, default=32, help="Heatmap rows")
+    p.add_argument("--start", type=int, default=0, help="First element of the window")
+    p.add_argument("--stop", type=int, default=None, help="End of the window (default: end of file)")
+    p.set_defaults(func=cmd_bitplanes)
+
+    p = sub.add_parser("density", help="ULP spacing per binade and representable values per window")
+    p.add_argument("--format", "-f", type=parse_format, default="float16")
+    p.add_argument("--window", type=float, nargs=2, metavar=("LO", "HI"), help="Count values per bin over [LO, HI]")
+    p.add_argument("--bins", type=int, default=20)
+    p.add_argument("--log", action="store_true", help="Logarithmic bins (LO > 0)")
+    p.set_defaults(func=cmd_density)
+
+    p = sub.add_parser("doubleround", help="Flag values where a conversion chain differs from one correct rounding")
+    p.add_argument("chain", help="e.g. float64>float32>float16 or decimal>float64>float16")
+    p.add_argument("--input", "-i", help="Values, one per line (default: samples near target midpoints)")
+    p.add_argument("--exhaustive", action="store_true", help="Every finite value of a <= 32-bit source format")
+    p.add_argument("--samples", "-n", type=int, default=1 << 20)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--examples", type=int, default=20)
+    p.add_argument("--rounding", "-r", choices=list(ROUNDING_MODES), default="rne")
+    p.set_defaults(func=cmd_doubleround)
+
+    p = sub.add_parser("parse", help="Correctly rounded batch parse of decimal tokens in a text file")
+    p.add_argument("input", help="Whitespace, comma or semicolon separated decimals ('-' for stdin)")
+    p.add_argument("--output", "-o", help="Write the valid values as a raw little-endian dump instead of printing")
+    add_format_args(p)
+    p.set_defaults(func=cmd_parse)
+
+    p = sub.add_parser("quant", help="Calibrate int8 / int4 affine quantization of a raw dump and compare with float formats")
+    p.add_argument("dump")
+    p.add_argument("--format", "-f", type=parse_format, default="float32", help="Format of the dump")
+    p.add_argument("--qformat", "-q", nargs="+", default=["int8"], help="int8, uint8, int4, ... (intN / uintN)")
+    p.add_argument("--method", "-m", nargs="+", choices=["minmax", "percentile", "mse"], default=["minmax"])
+    p.add_argument("--channels", type=int, default=None, help="Per-channel: the dump holds rows of this many channels")
+    p.add_argument("--symmetric", action="store_true", help="Zero point fixed at zero (mid-range for unsigned)")
+    p.add_argument("--percentile", type=float, default=99.99)
+    p.add_argument("--compare", "-c", nargs="*", type=parse_format, default=["float16", "bfloat16"],
+                   help="Float formats to report alongside")
+    p.add_argument("--output", "-o", help="Write the quantized values (int4 packed two per byte)")
+    p.add_argument("--rounding", "-r", choices=list(ROUNDING_MODES), default="rne", help="Rounding of the float formats")
+    p.set_defaults(func=cmd_quant)
+
+    p = sub.add_parser("interval", help="Interval arithmetic with endpoints rounded outward")
+    p.add_argument("op", choices=["add", "sub", "mul", "div", "sqrt"])
+    p.add_argument("bounds", nargs="+", help="A_LO A_HI [B_LO B_HI] as decimals")
+    p.add_argument("--format", "-f", type=parse_format, default="float16")
+    p.set_defaults(func=cmd_interval)
+
+    p = sub.add_parser("sort", help="Sort / deduplicate a raw little-endian float dump in IEEE totalOrder")
+    p.add_argument("dump")
+    p.add_argument("--format", "-f", type=parse_format, default="float16")
+    p.add_argument("--output", "-o", help="Write the sorted values (default: print distinct values by count)")
+    p.add_argument("--unique", action="store_true", help="Write each distinct bit pattern once")
+    p.add_argument("--top", type=int, default=20, help="Most frequent values to list")
+    p.set_defaults(func=cmd_sort)
+
+    p = sub.add_parser("compress", help="Per-field entropy and codec / shuffle / XOR-delta trials on a raw float dump")
+    p.add_argument("dump")
+    p.add_argument("--format", "-f", type=parse_format, default="float16")
+    p.add_argument("--codecs", nargs="+", default=["zlib", "bz2", "lzma"], help="zlib, bz2, lzma, optionally name:level")
+    p.add_argument("--keep", type=int, nargs="*", default=[], help="Also try truncating the mantissa to these many bits")
+    p.add_argument("--chunk", type=int, default=1 << 18, help="Elements per chunk (each chunk is compressed on its own)")
+    p.add_argument("--max-chunks", type=int, default=16, help="Chunks to sample, spread over the file (0: all)")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    p.add_argument("--top", type=int, default=20, help="Configurations to list")
+    p.set_defaults(func=cmd_compress)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Float16 / Float32 / Float64 bit codecs with pluggable backends
+import struct
+
+# --- Formats ---
+FORMATS = {
+    "float16": (16, 5, 10, 15),
+    "float32": (32, 8, 23, 127),
+    "float64": (64, 11, 52, 1023),
+}
+STRUCT_CODES = {"float16": ("<e", "<H"), "float32": ("<f", "<I"), "float64": ("<d", "<Q")}
+UINT_NAMES = {"float16": "uint16", "float32": "uint32", "float64": "uint64"}
+
+# Inputs up to this many values go through struct instead of NumPy
+SCALAR_LIMIT = 16
+
+def format_name(fmt):
+    name = getattr(fmt, "__name__", None) or str(fmt)
+    name = name.lower()
+    if name not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt!r}")
+    return name
+
+def get_params(fmt):
+    return FORMATS[format_name(fmt)]
+
+# --- Scalar Backend ---
+class ScalarBackend:
+    name = "scalar"
+
+    def decode(self, bits, fmt):
+        if isinstance(bits, (list, tuple)):
+            return [self.decode(b, fmt) for b in bits]
+        float_code, int_code = STRUCT_CODES[format_name(fmt)]
+        return struct.unpack(float_code, struct.pack(int_code, int(bits)))[0]
+
+    def encode(self, value, fmt):
+        if isinstance(value, (list, tuple)):
+            return [self.encode(v, fmt) for v in value]
+        name = format_name(fmt)
+        float_code, int_code = STRUCT_CODES[name]
+        try:
+            return struct.unpack(int_code, struct.pack(float_code, value))[0]
+        except OverflowError:
+            # struct refuses values that round past the largest finite; IEEE gives ±Inf
+            total_bits, exp_bits, man_bits, _ = FORMATS[name]
+            return (int(value < 0) << (total_bits - 1)) | (((1 << exp_bits) - 1) << man_bits)
+
+# --- NumPy Backend ---
+class NumpyBackend:
+    name = "numpy"
+
+    def decode(self, bits, fmt):
+        import numpy as np
+        name = format_name(fmt)
+        return np.asarray(bits, dtype=UINT_NAMES[name]).view(name)
+
+    def encode(self, values, fmt):
+        import numpy as np
+        name = format_name(fmt)
+        values = np.asarray(values)
+        if values.dtype.kind != "f":
+            values = values.astype(np.float64)
+        with np.errstate(over="ignore"):
+            return values.astype(name).view(UINT_NAMES[name])
+
+BACKENDS = {"scalar": ScalarBackend(), "numpy": NumpyBackend()}
+
+def register_backend(backend):
+    BACKENDS[backend.name] = backend
+
+def get_backend(data, backend=None):
+    if backend is not None:
+        return BACKENDS[backend]
+    if hasattr(data, "ndim"):
+        return BACKENDS["numpy" if data.ndim else "scalar"]
+    if not isinstance(data, (list, tuple)) or len(data) <= SCALAR_LIMIT:
+        return BACKENDS["scalar"]
+    return BACKENDS["numpy"]
+
+# --- Shared Functions ---
+def bits_to_float(bits, fmt, backend=None):
+    return get_backend(bits, backend).decode(bits, fmt)
+
+def float_to_bits(value, fmt, backend=None):
+    return get_backend(value, backend).encode(value, fmt)
+
+def breakdown(bits, fmt):
+    total_bits, exp_bits, man_bits, bias = get_params(fmt)
+    bits = int(bits)
+    s = (bits >> (exp_bits + man_bits)) & 0x1
+    e = (bits >> man_bits) & ((1 << exp_bits) - 1)
+    m = bits & ((1 << man_bits) - 1)
+    exp_val = e - bias
+    mantissa_val = m / (1 << man_bits)
+    mantissa = 1 + mantissa_val if 0 < e < (1 << exp_bits) - 1 else mantissa_val
+
+    if e == 0 and m == 0:
+        formula = "0"
+        status = "Zero"
+    elif e == 0:
+        formula = f"{'-1' if s else '1'} × 2^{1-bias} × {mantissa:.4g}"
+        status = "Subnormal"
+    elif e == (1 << exp_bits) - 1:
+        formula = "Inf or NaN"
+        status = "Overflow or NaN"
+    else:
+        formula = f"{'-1' if s else '1'} × 2^{exp_val} × {mantissa:.4g}"
+        status = "Normal"
+
+    return s, e, m, formula, f"{bits:0{total_bits}b}", status
@@ -0,0 +1,196 @@
+# Field-aware compressibility analysis: per-field entropy, shuffles / XOR-delta / truncation, stdlib codecs
+import bz2
+import lzma
+import os
+import time
+import zlib
+from multiprocessing import Pool
+
+import numpy as np
+import float_formats as ff
+from float_bitplane import bit_matrix
+from float_diff import open_dump
+
+CHUNK = 1 << 18
+TRANSFORMS = ["raw", "byte-shuffle", "bit-shuffle", "xor", "xor+byte-shuffle", "xor+bit-shuffle"]
+CODECS = {
+    "zlib": (lambda data, level: zlib.compress(data, level), zlib.decompress, 6),
+    "bz2": (lambda data, level: bz2.compress(data, level), bz2.decompress, 9),
+    "lzma": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress, 1),
+}
+# Fields wider than this are measured as 8-bit slices, whose entropies add up to an upper bound
+EXACT_FIELD_BITS = 16
+# A configuration this much larger than the smallest still counts as close
+CLOSE_RATIO = 0.9
+
+# --- Codecs ---
+def parse_codec(spec):
+    # "zlib" or "zlib:9"
+    name, _, level = spec.partition(":")
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec: {spec!r} (choose from {', '.join(CODECS)})")
+    return name, int(level) if level else CODECS[name][2]
+
+def codec_name(codec):
+    return f"{codec[0]}:{codec[1]}"
+
+# --- Transforms ---
+def truncate_mantissa(bits, fmt, keep):
+    # Zero all but the top `keep` mantissa bits; Inf / NaN patterns are left alone
+    if keep is None or keep >= fmt.man_bits:
+        return bits
+    s, e, m = ff.compile_format(fmt).fields(bits)
+    special = (e == (1 << fmt.exp_bits) - 1) & bool(fmt.inf or fmt.nan)
+    drop = np.dtype(fmt.uint_name).type((1 << (fmt.man_bits - keep)) - 1)
+    return np.where(special, bits, bits & ~drop)
+
+def transform(bits, fmt, name):
+    # Little-endian byte stream of one chunk after the named transform
+    words = np.ascontiguousarray(bits, dtype=np.dtype(fmt.uint_name).newbyteorder("<"))
+    if name.startswith("xor"):
+        # Gorilla-style: each value XOR its predecessor, so slowly varying data
+        # turns into long runs of zero bits
+        words = words ^ np.concatenate([words[:1] * 0, words[:-1]])
+    if name.endswith("byte-shuffle"):
+        return words.view(np.uint8).reshape(len(words), -1).T.tobytes()
+    if name.endswith("bit-shuffle"):
+        return np.packbits(bit_matrix(words, fmt).T, axis=1).tobytes()
+    return words.tobytes()
+
+# --- Field Statistics ---
+def field_slices(fmt):
+    # (name, shift, width) of each histogrammed slice, most significant first
+    out = [("sign", fmt.total_bits - 1, 1)]
+    for name, shift, width in (("exponent", fmt.man_bits, fmt.exp_bits), ("mantissa", 0, fmt.man_bits)):
+        if width <= EXACT_FIELD_BITS:
+            out.append((name, shift, width))
+        else:
+            top = width % 8 or 8
+            out.append((name, shift + width - top, top))
+            out += [(name, shift + lo, 8) for lo in range(width - top - 8, -1, -8)]
+    return [s for s in out if s[2] > 0]
+
+def entropy(counts):
+    p = counts[counts > 0] / max(counts.sum(), 1)
+    return max(0.0, float(-(p * np.log2(p)).sum()))
+
+# --- Chunk Worker ---
+def analyze_chunk(job):
+    bits, fmt, keeps, codecs = job
+    if isinstance(bits, tuple):
+        bits = np.asarray(open_dump(bits[0], fmt, bits[1], bits[2]))
+    wide = bits.astype(np.uint64)
+    out = {
+        "values": len(bits),
+        "fields": [np.bincount(((wide >> np.uint64(shift)) & np.uint64((1 << width) - 1)).astype(np.intp),
+                               minlength=1 << width) for _, shift, width in field_slices(fmt)],
+        "bytes": np.stack([np.bincount(lane, minlength=256) for lane in
+                           np.ascontiguousarray(bits, dtype=np.dtype(fmt.uint_name).newbyteorder("<"))
+                           .view(np.uint8).reshape(len(bits), -1).T]),
+        "results": {},
+    }
+    values = ff.decode(bits, fmt)
+    for keep in keeps:
+        cut = truncate_mantissa(bits, fmt, keep)
+        with np.errstate(all="ignore"):
+            rel = np.abs(ff.decode(cut, fmt) - values) / np.abs(values)
+        max_rel = float(np.nanmax(rel[np.isfinite(values) & (values != 0)], initial=0.0))
+        for name in TRANSFORMS:
+            data = transform(cut, fmt, name)
+            for codec in codecs:
+                compress, decompress, _ = CODECS[codec[0]]
+                t0 = time.perf_counter()
+                packed = compress(data, codec[1])
+                t1 = time.perf_counter()
+                decompress(packed)
+                t2 = time.perf_counter()
+                out["results"][(name, keep, codec)] = np.array([len(data), len(packed), t1 - t0, t2 - t1, max_rel])
+    return out
+
+# --- Analysis ---
+def analyze(jobs, fmt, keeps, codecs, workers=1):
+    report = {"format": fmt.name, "values": 0, "fields": None, "bytes": None, "results": {}}
+    pool = Pool(workers) if workers > 1 and len(jobs) > 1 else None
+    try:
+        parts = pool.imap_unordered(analyze_chunk, jobs) if pool else map(analyze_chunk, jobs)
+        for part in parts:
+            report["values"] += part["values"]
+            report["fields"] = part["fields"] if report["fields"] is None else [a + b for a, b in zip(report["fields"], part["fields"])]
+            report["bytes"] = part["bytes"] if report["bytes"] is None else report["bytes"] + part["bytes"]
+            for key, row in part["results"].items():
+                prev = report["results"].get(key)
+                # Sizes and times add up; the error column keeps its maximum
+                report["results"][key] = row if prev is None else np.append(prev[:4] + row[:4], max(prev[4], row[4]))
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return summarize(report, fmt)
+
+def analyze_bits(bits, fmt, keeps=(None,), codecs=("zlib",), chunk=CHUNK, workers=1):
+    fmt = ff.get_format(fmt)
+    bits = np.asarray(bits).reshape(-1)
+    codecs = [parse_codec(c) if isinstance(c, str) else c for c in codecs]
+    jobs = [(bits[start:start + chunk], fmt, tuple(keeps), codecs) for start in range(0, len(bits), chunk)]
+    return analyze(jobs, fmt, keeps, codecs, workers)
+
+def analyze_file(path, fmt, keeps=(None,), codecs=("zlib",), chunk=CHUNK, workers=None, max_chunks=None):
+    # Chunks are spread evenly over the file when max_chunks caps how many are read
+    fmt = ff.get_format(fmt)
+    n = os.path.getsize(path) // np.dtype(fmt.uint_name).itemsize
+    starts = list(range(0, n, chunk))
+    if max_chunks and len(starts) > max_chunks:
+        starts = [starts[i] for i in np.linspace(0, len(starts) - 1, max_chunks).round().astype(int)]
+    codecs = [parse_codec(c) if isinstance(c, str) else c for c in codecs]
+    jobs = [((path, start, min(start + chunk, n)), fmt, tuple(keeps), codecs) for start in starts]
+    return analyze(jobs, fmt, keeps, codecs, workers or os.cpu_count() or 1)
+
+def summarize(report, fmt):
+    fields = {}
+    for (name, _, _), counts in zip(field_slices(fmt), report["fields"] or []):
+        fields[name] = fields.get(name, 0.0) + entropy(counts)
+    rows = []
+    for (name, keep, codec), (raw, packed, t_comp, t_dec, max_rel) in report["results"].items():
+        rows.append({"transform": name, "mantissa_bits": fmt.man_bits if keep is None else min(keep, fmt.man_bits),
+                     "codec": codec_name(codec), "ratio": raw / max(packed, 1),
+                     "compress_mbps": raw / 1e6 / max(t_comp, 1e-9), "decompress_mbps": raw / 1e6 / max(t_dec, 1e-9),
+                     "max_rel_error": max_rel})
+    rows.sort(key=lambda r: -r["ratio"])
+    lossless = [r for r in rows if r["mantissa_bits"] == fmt.man_bits]
+    best = lossless[0] if lossless else None
+    # Fastest lossless setting that gives up little against the best ratio
+    close = [r for r in lossless if r["ratio"] >= CLOSE_RATIO * best["ratio"]] if best else []
+    return {
+        "format": fmt.name, "values": report["values"], "bytes": report["values"] * np.dtype(fmt.uint_name).itemsize,
+        "entropy": fields, "entropy_total": sum(fields.values()),
+        "byte_entropy": [entropy(c) for c in report["bytes"]] if report["bytes"] is not None else [],
+        "exact_fields": all(w <= EXACT_FIELD_BITS for w in (fmt.exp_bits, fmt.man_bits)),
+        "results": rows, "best": best,
+        "balanced": max(close, key=lambda r: min(r["compress_mbps"], r["decompress_mbps"])) if close else None,
+        "best_lossy": next((r for r in rows if r["mantissa_bits"] < fmt.man_bits), None),
+    }
+
+# --- Reports ---
+def describe(row):
+    return "none" if row is None else (f"{row['transform']} + {row['codec']}: ratio {row['ratio']:.3f}, "
+                                       f"{row['compress_mbps']:.1f} / {row['decompress_mbps']:.1f} MB/s")
+
+def format_report(report, top=20):
+    fmt = ff.get_format(report["format"])
+    bound = fmt.total_bits / report["entropy_total"] if report["entropy_total"] else float("inf")
+    lines = [f"Format       : {report['format']}", f"Values       : {report['values']} ({report['bytes']} bytes)", "",
+             "Entropy (bits / value)" + ("" if report["exact_fields"] else ", wide fields as 8-bit slices (upper bound)")]
+    lines += [f"  {name:<9}: {h:7.3f} of {w}" for (name, h), w in
+              zip(report["entropy"].items(), [1, fmt.exp_bits, fmt.man_bits])]
+    lines += [f"  {'total':<9}: {report['entropy_total']:7.3f} of {fmt.total_bits} (order-0 bound: ratio {bound:.3f})",
+              "  bytes    : " + " ".join(f"{h:.2f}" for h in report["byte_entropy"]) + " (least significant first)", ""]
+    lines.append(f"{'Transform':<18} {'Mant':>4} {'Codec':<7} {'Ratio':>7} {'Comp MB/s':>10} {'Dec MB/s':>9} {'Max rel err':>11}")
+    for r in report["results"][:top]:
+        lines.append(f"{r['transform']:<18} {r['mantissa_bits']:>4} {r['codec']:<7} {r['ratio']:>7.3f} "
+                     f"{r['compress_mbps']:>10.1f} {r['decompress_mbps']:>9.1f} {r['max_rel_error']:>11.3g}")
+    lines += ["", f"Smallest lossless : {describe(report['best'])}",
+              f"Balanced lossless : {describe(report['balanced'])}"]
+    if report["best_lossy"]:
+        r = report["best_lossy"]
+        lines.append(f"Smallest lossy    : {describe(r)}, {r['mantissa_bits']} mantissa bits, max rel error {r['max_rel_error']:.3g}")
+    return "\n".join(lines)
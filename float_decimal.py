@@ -0,0 +1,85 @@
+# Correctly rounded batch parsing of decimal strings straight to any format and rounding mode
+import re
+
+import numpy as np
+import pandas as pd
+import float_formats as ff
+
+NUMBER_RE = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+SPECIAL_RE = r"[+-]?(?:nan|inf|infinity)"
+TOKEN_RE = re.compile(rf"\s*(?:({NUMBER_RE})|({SPECIAL_RE}))\s*", re.IGNORECASE)
+# Significands up to 15 digits and powers of ten up to 10^22 are exact in float64
+SHORT_DIGITS = 15
+SHORT_EXP = 22
+POW10 = 10.0 ** np.arange(SHORT_EXP + 1)
+
+# --- Tokens ---
+def tokenize(text):
+    # Whitespace, comma or semicolon separated tokens of a text buffer
+    text = text.strip()
+    return np.array(re.split(r"[\s,;]+", text)) if text else np.array([], dtype=str)
+
+def short_parts(tokens):
+    # (significand as float, power of ten, short?) with trailing zeros moved into the exponent
+    parts = pd.Series(tokens, dtype=object).str.strip().str.lower().str.extract(r"^[+-]?(\d*)\.?(\d*)(?:e([+-]?\d+))?$")
+    whole, frac, exp = parts[0].fillna(""), parts[1].fillna(""), pd.to_numeric(parts[2]).fillna(0)
+    text = (whole + frac).str.lstrip("0")
+    stripped = text.str.rstrip("0")
+    power = exp.to_numpy(dtype=np.float64) - frac.str.len().to_numpy() + (text.str.len() - stripped.str.len()).to_numpy()
+    short = (stripped.str.len().to_numpy() <= SHORT_DIGITS) & (np.abs(power) <= SHORT_EXP)
+    sig = np.where(short, stripped.where(stripped != "", "0").str[:SHORT_DIGITS + 1].astype(np.float64), 0.0)
+    return sig, np.where(short, power, 0).astype(np.intp), short
+
+def error_sign(sig, power, x):
+    # sign(|decimal| - |x|) for short decimals sig * 10^power, exact through two_prod
+    ax = np.abs(x)
+    up = power >= 0
+    p, e = ff.two_prod(np.where(up, sig, ax), POW10[np.abs(power)])
+    # Sterbenz: p and the value it is compared with are within a factor of two, so the difference is exact
+    return np.sign(np.where(up, (p - ax) + e, (sig - p) - e))
+
+# --- Parsing ---
+def parse_decimal(tokens, fmt, rounding="rne"):
+    # Returns (bits, valid). Each token is parsed to float64 (correctly rounded),
+    # then rounded into the format with the sign of its float64 error as a
+    # sticky bit. That sign only matters where the float64 value sits on a
+    # rounding boundary of the format, and only those tokens are inspected:
+    # short ones through an exact two_prod comparison, the rest through exact
+    # rational arithmetic.
+    fmt = ff.get_format(fmt)
+    k = ff.compile_format(fmt)
+    tokens = np.asarray(tokens, dtype=str)
+    # 0 invalid, 1 number, 2 nan / inf; float() alone would also take "1_000"
+    kind = np.fromiter((m.lastindex if (m := TOKEN_RE.fullmatch(s)) else 0 for s in tokens.tolist()),
+                       dtype=np.int8, count=len(tokens))
+    number, valid = kind == 1, kind > 0
+    x = np.zeros(len(tokens))
+    x[valid] = [float(s) for s in tokens[valid].tolist()]
+    bits = k.encode(x, rounding)
+
+    idx = np.flatnonzero(number)
+    xs = x[idx]
+    ones = np.ones(len(idx))
+    flagged = k.encode(xs, rounding, residual=ones) != k.encode(xs, rounding, residual=-ones)
+    # float64 over- / underflow, and ties of formats as wide as float64 under rna
+    flagged |= ~np.isfinite(xs) | ((xs == 0) & (fmt.emin - fmt.man_bits < -1074))
+    # A tie of a float64-wide format is a float64 error, not a sign: exact path only
+    exact_only = fmt.man_bits >= 52 and rounding == "rna"
+    if exact_only:
+        flagged[:] = True
+    idx = idx[flagged]
+    if not len(idx):
+        return bits, valid
+
+    sig, power, short = short_parts(tokens[idx])
+    short &= not exact_only
+    fast = idx[short]
+    sign = error_sign(sig[short], power[short], x[fast]) * np.where(np.signbit(x[fast]), -1.0, 1.0)
+    bits[fast] = k.encode(x[fast], rounding, residual=sign)
+    for i in idx[~short]:
+        bits[i] = ff.decimal_to_bits(tokens[i], fmt, rounding)
+    return bits, valid
+
+def parse_text(text, fmt, rounding="rne"):
+    tokens = tokenize(text)
+    return (tokens,) + parse_decimal(tokens, fmt, rounding)
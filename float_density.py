@@ -0,0 +1,113 @@
+# Number-line density: ULP spacing per binade, representable counts per window, subnormal gaps
+import functools
+import math
+
+import numpy as np
+import float_formats as ff
+from float_diff import ordered_key
+
+# --- Per-Format Aggregates ---
+@functools.lru_cache(maxsize=None)
+def binade_table(fmt):
+    # One row per exponent field value with positive magnitudes: range, ULP and
+    # how many values it holds. Built from the layout, never by enumeration.
+    fmt = ff.get_format(fmt)
+    M = fmt.man_bits
+    rows = []
+    if fmt.subnormals and M:
+        ulp = math.ldexp(1.0, fmt.emin - M)
+        rows.append((0, ulp, math.ldexp(1.0, fmt.emin) - ulp, ulp, (1 << M) - 1, True))
+    for e in range(1, (fmt.max_mag >> M) + 1):
+        count = min((e + 1) << M, fmt.max_mag + 1) - (e << M)
+        lo, ulp = math.ldexp(1.0, e - fmt.bias), math.ldexp(1.0, e - fmt.bias - M)
+        rows.append((e, lo, lo + (count - 1) * ulp, ulp, count, False))
+    table = np.array(rows, dtype=[("exponent", np.int64), ("lo", np.float64), ("hi", np.float64),
+                                  ("ulp", np.float64), ("count", np.int64), ("subnormal", bool)])
+    table.flags.writeable = False
+    return table
+
+def max_value(fmt):
+    fmt = ff.get_format(fmt)
+    return float(ff.decode(np.array([fmt.max_mag], dtype=fmt.uint_name), fmt)[0])
+
+def gap_table(fmt):
+    # Structure around zero: what the smallest steps are with and without subnormals
+    fmt = ff.get_format(fmt)
+    min_normal = math.ldexp(1.0, fmt.emin)
+    min_sub = math.ldexp(1.0, fmt.emin - fmt.man_bits) if fmt.subnormals and fmt.man_bits else None
+    return {"min_normal": min_normal, "min_subnormal": min_sub, "max": max_value(fmt),
+            "subnormal_count": (1 << fmt.man_bits) - 1 if min_sub else 0,
+            "gap_above_zero": min_sub or min_normal,
+            # Without subnormals the step from 0 to the first normal is 2^M ULPs of the first binade
+            "gap_ratio": (min_sub or min_normal) / math.ldexp(1.0, fmt.emin - fmt.man_bits),
+            "total_finite": 2 * int(sum(binade_table(fmt)["count"])) + 1}
+
+# --- Window Queries ---
+def ulp_at(x, fmt):
+    # Spacing of the format at magnitude |x|, vectorized over x
+    fmt = ff.get_format(fmt)
+    mag = np.abs(np.asarray(x, dtype=np.float64))
+    _, e = np.frexp(mag)
+    ulp = np.ldexp(1.0, np.maximum(e - 1, fmt.emin) - fmt.man_bits)
+    # Below the first normal, zero included: the subnormal step, or without
+    # subnormals the gap from zero to the first normal
+    tiny = gap_table(fmt)["gap_above_zero"]
+    ulp = np.where(mag < math.ldexp(1.0, fmt.emin), tiny, ulp)
+    return np.where(mag > max_value(fmt), np.nan, ulp)
+
+def rank(x, fmt):
+    # Finite values of the format strictly below x (signed zeros count once)
+    fmt = ff.get_format(fmt)
+    top = max_value(fmt)
+    x = np.asarray(x, dtype=np.float64)
+    clipped = np.clip(x, -top, top)
+    bits = ff.encode(clipped, fmt, "rup")
+    k = ordered_key(bits, fmt)
+    # ordered_key puts -0 and +0 on one key; without subnormals the patterns
+    # below the first normal all decode to zero and are dropped too
+    flushed = 0 if fmt.subnormals else (1 << fmt.man_bits) - 1
+    k = np.sign(k) * np.maximum(np.abs(k) - flushed, 0)
+    # Flush-to-zero rounds tiny positives down to zero; the next value up is the answer
+    k = k + (ff.decode(bits, fmt) < clipped)
+    # Ranks of float64 need all 64 bits; the wrapping uint64 sum is exact since ranks are >= 0
+    positive = np.uint64(fmt.max_mag - flushed)
+    with np.errstate(over="ignore"):
+        return np.where(x > top, 2 * positive + np.uint64(1), k.astype(np.uint64) + positive)
+
+def rank_after(hi, fmt):
+    # Finite values <= hi
+    return rank(np.inf if hi >= max_value(fmt) else np.nextafter(hi, np.inf), fmt)
+
+def count_between(lo, hi, fmt):
+    # Representable finite values in [lo, hi]
+    fmt = ff.get_format(fmt)
+    if hi < lo:
+        return 0
+    return int(rank_after(hi, fmt) - rank(lo, fmt))
+
+def density(lo, hi, fmt, bins=200, log=False):
+    # Representable values per bin over [lo, hi]; bins are half open, the last one closed
+    fmt = ff.get_format(fmt)
+    if not hi > lo:
+        raise ValueError("The window must have hi > lo.")
+    if log:
+        if lo <= 0:
+            raise ValueError("Log bins need lo > 0.")
+        edges = np.geomspace(lo, hi, bins + 1)
+    else:
+        edges = np.linspace(lo, hi, bins + 1)
+    ranks = rank(edges, fmt)
+    ranks[-1] = rank_after(hi, fmt)
+    return edges, np.diff(ranks)
+
+def format_table(fmt):
+    fmt = ff.get_format(fmt)
+    lines = [f"{'Exp':>5}  {'From':>12}  {'To':>12}  {'ULP':>12}  {'Values':>10}  {'ULP / From':>10}"]
+    for row in binade_table(fmt):
+        lines.append(f"{row['exponent']:>5}  {row['lo']:>12.5g}  {row['hi']:>12.5g}  {row['ulp']:>12.5g}  "
+                     f"{row['count']:>10}  {row['ulp'] / row['lo']:>10.3g}" + ("  (subnormal)" if row["subnormal"] else ""))
+    gaps = gap_table(fmt)
+    lines += ["", f"Smallest normal   : {gaps['min_normal']:.6g}",
+              f"Smallest subnormal: {gaps['min_subnormal']:.6g}" if gaps["min_subnormal"] else "Subnormals        : flushed to zero",
+              f"Largest finite    : {gaps['max']:.6g}", f"Finite values     : {gaps['total_finite']}"]
+    return "\n".join(lines)
@@ -0,0 +1,173 @@
+# Streaming bitwise / ULP diff of two raw little-endian float dumps
+import heapq
+import os
+from multiprocessing import Pool
+
+import numpy as np
+import float_formats as ff
+
+FIELDS = ["sign", "exponent", "mantissa"]
+
+# Bucket 0 is "bits differ but 0 ULP apart" (signed zeros, NaN payloads),
+# bucket k >= 1 holds distances in [2^(k-1), 2^k); the last one is NaN vs non-NaN.
+def bucket_labels(total_bits):
+    labels = ["0 (bits only)"] + [f"{1 << (k - 1)}-{(1 << k) - 1}" if k > 1 else "1" for k in range(1, total_bits + 1)]
+    return labels + ["NaN mismatch"]
+
+# --- Per-Element Kernels ---
+def nan_mask(bits, fmt):
+    s, e, m = ff.compile_format(fmt).fields(bits)
+    if fmt.inf:
+        return (e == (1 << fmt.exp_bits) - 1) & (m != 0)
+    if fmt.nan:
+        return (e == (1 << fmt.exp_bits) - 1) & (m == (1 << fmt.man_bits) - 1)
+    return np.zeros(len(bits), dtype=bool)
+
+def ordered_key(bits, fmt):
+    b = bits.astype(np.uint64)
+    mag = (b & np.uint64((1 << (fmt.exp_bits + fmt.man_bits)) - 1)).astype(np.int64)
+    sign = (b >> np.uint64(fmt.exp_bits + fmt.man_bits)) & np.uint64(1)
+    return np.where(sign == 1, -mag, mag)
+
+def ulp_distance(a, b, fmt):
+    ka, kb = ordered_key(a, fmt), ordered_key(b, fmt)
+    dist = np.where(ka > kb, ka - kb, kb - ka).astype(np.uint64)
+    nan_a, nan_b = nan_mask(a, fmt), nan_mask(b, fmt)
+    dist = np.where(nan_a & nan_b, np.uint64(0), dist)
+    return dist, nan_a != nan_b
+
+# --- Chunk Worker ---
+def open_dump(path, fmt, start, stop):
+    itemsize = np.dtype(fmt.uint_name).itemsize
+    return np.memmap(path, dtype="<" + np.dtype(fmt.uint_name).str[1:], mode="r",
+                     offset=start * itemsize, shape=(stop - start,))
+
+def diff_chunk(job):
+    path_a, path_b, fmt, start, stop, top_k = job
+    a = np.asarray(open_dump(path_a, fmt, start, stop))
+    b = np.asarray(open_dump(path_b, fmt, start, stop))
+    n_buckets = fmt.total_bits + 2
+    out = {
+        "compared": stop - start,
+        "differing": 0,
+        "first": None,
+        "by_class": np.zeros((len(ff.CLASSES), n_buckets), dtype=np.int64),
+        "fields": np.zeros(len(FIELDS), dtype=np.int64),
+        "bit_flips": np.zeros(fmt.total_bits, dtype=np.int64),
+        "max_ulp": 0,
+        "top": [],
+    }
+    x = (a ^ b).astype(np.uint64)
+    idx = np.flatnonzero(x)
+    if not len(idx):
+        return out
+
+    a, b, x = a[idx], b[idx], x[idx]
+    dist, nan_mismatch = ulp_distance(a, b, fmt)
+    _, exp_bucket = np.frexp(dist.astype(np.float64))
+    bucket = np.where(nan_mismatch, n_buckets - 1, np.minimum(exp_bucket, fmt.total_bits))
+    cls = ff.classify(a, fmt)
+    np.add.at(out["by_class"], (cls, bucket), 1)
+
+    s, e, m = ff.compile_format(fmt).fields(x)
+    out["fields"] += [np.count_nonzero(s), np.count_nonzero(e), np.count_nonzero(m)]
+    for i in range(fmt.total_bits):
+        out["bit_flips"][i] = np.count_nonzero((x >> np.uint64(i)) & np.uint64(1))
+
+    rank = np.where(nan_mismatch, np.iinfo(np.uint64).max, dist)
+    out["differing"] = len(idx)
+    out["first"] = start + int(idx[0])
+    out["max_ulp"] = int(dist[~nan_mismatch].max()) if (~nan_mismatch).any() else 0
+    k = min(top_k, len(idx))
+    worst = []
+    if k:
+        # Everything above the k-th largest distance, then the earliest ties
+        threshold = np.partition(rank, len(rank) - k)[len(rank) - k]
+        above = np.flatnonzero(rank > threshold)
+        worst = np.concatenate([above, np.flatnonzero(rank == threshold)[:k - len(above)]])
+    out["top"] = [(int(rank[i]), start + int(idx[i]), int(a[i]), int(b[i])) for i in worst]
+    return out
+
+# --- Diff ---
+def diff_files(path_a, path_b, fmt="float16", top_k=20, chunk_elems=1 << 22, workers=None):
+    fmt = ff.get_format(fmt)
+    itemsize = np.dtype(fmt.uint_name).itemsize
+    n_a, n_b = os.path.getsize(path_a) // itemsize, os.path.getsize(path_b) // itemsize
+    n = min(n_a, n_b)
+    jobs = [(path_a, path_b, fmt, start, min(start + chunk_elems, n), top_k) for start in range(0, n, chunk_elems)]
+
+    n_buckets = fmt.total_bits + 2
+    report = {
+        "format": fmt.name,
+        "elements": (n_a, n_b),
+        "compared": 0,
+        "differing": 0,
+        "first_divergence": None,
+        "max_ulp": 0,
+        "by_class": np.zeros((len(ff.CLASSES), n_buckets), dtype=np.int64),
+        "fields": np.zeros(len(FIELDS), dtype=np.int64),
+        "bit_flips": np.zeros(fmt.total_bits, dtype=np.int64),
+    }
+    top = []
+    workers = workers or os.cpu_count() or 1
+    pool = Pool(workers) if workers > 1 and len(jobs) > 1 else None
+    try:
+        results = pool.imap_unordered(diff_chunk, jobs) if pool else map(diff_chunk, jobs)
+        for part in results:
+            report["compared"] += part["compared"]
+            report["differing"] += part["differing"]
+            report["by_class"] += part["by_class"]
+            report["fields"] += part["fields"]
+            report["bit_flips"] += part["bit_flips"]
+            report["max_ulp"] = max(report["max_ulp"], part["max_ulp"])
+            if part["first"] is not None and (report["first_divergence"] is None or part["first"] < report["first_divergence"]):
+                report["first_divergence"] = part["first"]
+            for item in part["top"]:
+                # Larger distance wins; among equals the earlier offset is kept
+                entry = (item[0], -item[1], item[2], item[3])
+                if len(top) < top_k:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    top.sort(reverse=True)
+    a_bits = np.array([t[2] for t in top], dtype=np.uint64)
+    b_bits = np.array([t[3] for t in top], dtype=np.uint64)
+    a_vals, b_vals = ff.decode(a_bits, fmt), ff.decode(b_bits, fmt)
+    report["top"] = [
+        {"offset": -t[1], "ulp": None if t[0] == np.iinfo(np.uint64).max else t[0],
+         "a_bits": t[2], "b_bits": t[3], "a": float(a_vals[i]), "b": float(b_vals[i])}
+        for i, t in enumerate(top)
+    ]
+    return report
+
+def format_report(report):
+    fmt = ff.get_format(report["format"])
+    digits = -(-fmt.total_bits // 4)
+    labels = bucket_labels(fmt.total_bits)
+    lines = [
+        f"Format            : {report['format']}",
+        f"Elements (a, b)   : {report['elements'][0]}, {report['elements'][1]}",
+        f"Compared          : {report['compared']}",
+        f"Differing         : {report['differing']}",
+        f"First divergence  : {report['first_divergence']}",
+        f"Max ULP distance  : {report['max_ulp']}",
+        "",
+        "Differing fields  : " + ", ".join(f"{name} {count}" for name, count in zip(FIELDS, report["fields"])),
+        "Bit flips (LSB→)  : " + " ".join(str(c) for c in report["bit_flips"]),
+        "",
+        f"{'ULP distance':<16}" + "".join(f"{c:>18}" for c in ff.CLASSES),
+    ]
+    for j, label in enumerate(labels):
+        col = report["by_class"][:, j]
+        if col.any():
+            lines.append(f"{label:<16}" + "".join(f"{c:>18}" for c in col))
+    lines += ["", f"{'Offset':>12}  {'ULP':>12}  {'A':>{digits + 2}}  {'B':>{digits + 2}}  {'A value':>14}  {'B value':>14}"]
+    for t in report["top"]:
+        ulp = "NaN" if t["ulp"] is None else t["ulp"]
+        lines.append(f"{t['offset']:>12}  {ulp:>12}  0x{t['a_bits']:0{digits}x}  0x{t['b_bits']:0{digits}x}  {t['a']:>14.6g}  {t['b']:>14.6g}")
+    return "\n".join(lines)
@@ -0,0 +1,149 @@
+# Hardware division emulation: table-seeded reciprocal refined by Newton-Raphson
+import functools
+from collections import namedtuple
+
+import numpy as np
+import float_formats as ff
+from float_diff import ulp_distance
+
+VARIANTS = {
+    "reciprocal": "q = a · x_n",
+    "corrected": "q = a · x_n + x_n · (a − b · q)",
+}
+INTERMEDIATE_ROUNDING = ["rne", "rtz"]
+
+DivisionDesign = namedtuple("DivisionDesign", "table_bits table_out_bits iterations precision variant intermediate_rounding")
+
+def make_design(table_bits=7, table_out_bits=None, iterations=2, precision=28, variant="reciprocal", intermediate_rounding="rne"):
+    table_out_bits = table_out_bits or table_bits + 1
+    if not 1 <= table_bits <= 16:
+        raise ValueError("Seed table index must be 1 to 16 bits.")
+    if not 1 <= table_out_bits <= 53 or not 2 <= precision <= 53:
+        raise ValueError("Precisions must be between 1 and 53 bits.")
+    if iterations < 0:
+        raise ValueError("Iteration count cannot be negative.")
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant: {variant!r}")
+    if intermediate_rounding not in INTERMEDIATE_ROUNDING:
+        raise ValueError(f"Unknown intermediate rounding: {intermediate_rounding!r}")
+    return DivisionDesign(table_bits, table_out_bits, iterations, precision, variant, intermediate_rounding)
+
+# --- Datapath ---
+def round_to(x, precision, rounding="rne"):
+    # Rounds to `precision` significant bits with an unbounded exponent range
+    m, e = np.frexp(x)
+    m = np.ldexp(m, precision)
+    m = np.rint(m) if rounding == "rne" else np.trunc(m)
+    return np.ldexp(m, e - precision)
+
+@functools.lru_cache(maxsize=None)
+def seed_table(table_bits, table_out_bits):
+    # Reciprocal of each interval midpoint of [1, 2); entries lie in (0.5, 1]
+    mid = 1.0 + (np.arange(1 << table_bits) + 0.5) / (1 << table_bits)
+    table = round_to(1.0 / mid, table_out_bits)
+    table.flags.writeable = False
+    return table
+
+def reciprocal(mb, design):
+    p, mode = design.precision, design.intermediate_rounding
+    idx = np.minimum(((mb - 1.0) * (1 << design.table_bits)).astype(np.intp), (1 << design.table_bits) - 1)
+    x = seed_table(design.table_bits, design.table_out_bits)[idx]
+    for _ in range(design.iterations):
+        e = round_to(2.0 - round_to(mb * x, p, mode), p, mode)
+        x = round_to(x * e, p, mode)
+    return x
+
+def emulate(a_bits, b_bits, fmt, design, rounding="rne"):
+    fmt = ff.get_format(fmt)
+    k = ff.compile_format(fmt)
+    a_bits, b_bits = np.asarray(a_bits), np.asarray(b_bits)
+    a, b = k.decode(a_bits), k.decode(b_bits)
+    # Zeros, infinities and NaNs take the special-case path of the divider
+    special = ~np.isfinite(a) | ~np.isfinite(b) | (a == 0) | (b == 0)
+    out = ff.apply_op("div", a_bits, b_bits, fmt, rounding)
+    live = np.flatnonzero(~special)
+    if not len(live):
+        return out
+
+    a, b = a[live], b[live]
+    mb, eb = np.frexp(np.abs(b))
+    mb, eb = mb * 2.0, eb - 1
+    x = reciprocal(mb, design)
+    p, mode = design.precision, design.intermediate_rounding
+    q = round_to(np.abs(a) * x, p, mode)
+    if design.variant == "corrected":
+        prod, err = ff.two_prod(q, mb)
+        rem = round_to((np.abs(a) - prod) - err, p, mode)
+        q = round_to(q + round_to(rem * x, p, mode), p, mode)
+    q = np.ldexp(q, -eb)
+    q = np.where(np.signbit(a) != np.signbit(b), -q, q)
+    out[live] = k.encode(q, rounding)
+    return out
+
+# --- Error Analysis ---
+def random_operands(fmt, n, seed=0):
+    fmt = ff.get_format(fmt)
+    rng = np.random.default_rng(seed)
+    uint = np.dtype(fmt.uint_name)
+    out = np.empty(0, dtype=uint)
+    while len(out) < n:
+        bits = rng.integers(0, 1 << fmt.total_bits, size=2 * n, dtype=np.uint64, endpoint=False).astype(uint)
+        cls = ff.classify(bits, fmt)
+        out = np.concatenate([out, bits[(cls == 1) | (cls == 2)]])
+    return out[:n]
+
+def error_report(a_bits, b_bits, fmt, design, rounding="rne", top_k=10):
+    fmt = ff.get_format(fmt)
+    got = emulate(a_bits, b_bits, fmt, design, rounding)
+    ref = ff.apply_op("div", a_bits, b_bits, fmt, rounding)
+    dist, nan_mismatch = ulp_distance(got, ref, fmt)
+    dist = np.where(nan_mismatch, np.uint64(np.iinfo(np.uint64).max), dist)
+    values, counts = np.unique(dist[~nan_mismatch], return_counts=True)
+    worst = np.argsort(dist, kind="stable")[::-1][:top_k]
+    worst = worst[dist[worst] > 0]
+
+    # Relative error of the refined reciprocal, as bits of accuracy
+    grid = 1 << min(design.table_bits + 4, 16)
+    mb = 1.0 + (np.arange(grid) + 0.5) / grid
+    rel = np.max(np.abs(reciprocal(mb, design) * mb - 1.0))
+    accuracy = float(-np.log2(rel)) if rel > 0 else float("inf")
+    return {
+        "format": fmt.name,
+        "design": design._asdict(),
+        "rounding": rounding,
+        "samples": len(dist),
+        "exact": int(np.count_nonzero(dist == 0)),
+        "nan_mismatch": int(np.count_nonzero(nan_mismatch)),
+        "max_ulp": int(values.max()) if len(values) else 0,
+        "histogram": {int(v): int(c) for v, c in zip(values, counts)},
+        "reciprocal_bits": accuracy,
+        "worst": [(int(a_bits[i]), int(b_bits[i]), int(got[i]), int(ref[i])) for i in worst],
+    }
+
+def sweep(fmt, designs, samples=1 << 18, rounding="rne", seed=0):
+    fmt = ff.get_format(fmt)
+    a_bits, b_bits = random_operands(fmt, samples, seed), random_operands(fmt, samples, seed + 1)
+    return [error_report(a_bits, b_bits, fmt, d, rounding) for d in designs]
+
+def format_report(report):
+    fmt = ff.get_format(report["format"])
+    digits = -(-fmt.total_bits // 4)
+    d = report["design"]
+    lines = [
+        f"Format            : {report['format']} ({report['rounding']})",
+        f"Seed table        : {d['table_bits']} bits in, {d['table_out_bits']} bits out",
+        f"Iterations        : {d['iterations']} at {d['precision']}-bit precision ({d['intermediate_rounding']})",
+        f"Variant           : {d['variant']}",
+        f"Reciprocal        : {report['reciprocal_bits']:.2f} bits",
+        f"Samples           : {report['samples']}",
+        f"Correctly rounded : {report['exact']} ({100 * report['exact'] / max(report['samples'], 1):.3f}%)",
+        f"Max ULP error     : {report['max_ulp']}",
+        f"NaN mismatches    : {report['nan_mismatch']}",
+        "",
+        f"{'ULP error':>12}  {'Count':>12}",
+    ]
+    lines += [f"{v:>12}  {c:>12}" for v, c in report["histogram"].items()]
+    if report["worst"]:
+        lines += ["", f"{'A':>{digits + 2}}  {'B':>{digits + 2}}  {'Emulated':>{digits + 2}}  {'Reference':>{digits + 2}}"]
+        lines += [f"0x{a:0{digits}x}  0x{b:0{digits}x}  0x{g:0{digits}x}  0x{r:0{digits}x}" for a, b, g, r in report["worst"]]
+    return "\n".join(lines)
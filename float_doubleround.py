@@ -0,0 +1,125 @@
+# Double-rounding detector: multi-step conversion chains vs a single correct rounding
+import numpy as np
+import float_formats as ff
+from float_decimal import parse_decimal
+from float_diff import ulp_distance
+
+DECIMAL = "decimal"
+EXHAUSTIVE_BITS = 32
+CHUNK = 1 << 22
+
+# --- Chains ---
+def parse_chain(chain):
+    # "decimal>float64>float16" or a list; the first entry is the source type
+    steps = chain.split(">") if isinstance(chain, str) else list(chain)
+    steps = [s.strip() if isinstance(s, str) else s for s in steps]
+    if len(steps) < 3:
+        raise ValueError("A chain needs a source and at least two conversions.")
+    if any(s == DECIMAL for s in steps[1:]):
+        raise ValueError("Only the source of a chain can be decimal.")
+    return [DECIMAL if steps[0] == DECIMAL else ff.get_format(steps[0])] + [ff.get_format(s) for s in steps[1:]]
+
+def chain_name(chain):
+    return " > ".join(s if s == DECIMAL else s.name for s in chain)
+
+def decimal_bits(tokens, fmt, rounding="rne"):
+    # Exact single rounding of decimal strings
+    tokens = np.asarray(tokens, dtype=str)
+    bits, valid = parse_decimal(tokens, fmt, rounding)
+    if not valid.all():
+        raise ValueError(f"Invalid decimal: {tokens[~valid][0]!r}")
+    return bits
+
+def run_chain(values, chain, rounding="rne"):
+    # (chained bits, directly rounded bits) in the last format of the chain
+    chain = parse_chain(chain)
+    source, steps, target = chain[0], chain[1:], chain[-1]
+    if source == DECIMAL:
+        bits = decimal_bits(values, steps[0], rounding)
+        direct = decimal_bits(values, target, rounding)
+    else:
+        exact = ff.decode(ff.encode(np.asarray(values, dtype=np.float64), source, rounding), source)
+        bits = ff.encode(exact, steps[0], rounding)
+        direct = ff.encode(exact, target, rounding)
+    for prev, fmt in zip(steps, steps[1:]):
+        bits = ff.encode(ff.decode(bits, prev), fmt, rounding)
+    return bits, direct
+
+# --- Analysis ---
+def analyze(values, chain, rounding="rne", examples=20):
+    chain = parse_chain(chain)
+    target = chain[-1]
+    values = np.asarray(values)
+    got, ref = run_chain(values, chain, rounding)
+    dist, nan_mismatch = ulp_distance(got, ref, target)
+    bad = (dist > 0) | nan_mismatch
+    idx = np.flatnonzero(bad)
+    _, exponent, _ = ff.compile_format(target).fields(ref[idx])
+    binades, counts = np.unique(exponent.astype(np.int64), return_counts=True)
+    mags = np.abs(ff.decode(ref[idx], target))
+    return {
+        "chain": chain_name(chain), "rounding": rounding, "count": len(values), "affected": len(idx),
+        "max_ulp": int(dist[bad].max()) if len(idx) else 0,
+        "binades": {int(e): int(c) for e, c in zip(binades, counts)},
+        "min_magnitude": float(mags.min()) if len(idx) else None,
+        "max_magnitude": float(mags.max()) if len(idx) else None,
+        "examples": [(str(values[i]), int(got[i]), int(ref[i])) for i in idx[:examples]],
+    }
+
+def merge_reports(reports, examples=20):
+    out = dict(reports[0], count=0, affected=0, max_ulp=0, binades={}, examples=[], min_magnitude=None, max_magnitude=None)
+    for r in reports:
+        out["count"] += r["count"]
+        out["affected"] += r["affected"]
+        out["max_ulp"] = max(out["max_ulp"], r["max_ulp"])
+        for e, c in r["binades"].items():
+            out["binades"][e] = out["binades"].get(e, 0) + c
+        for key, pick in (("min_magnitude", min), ("max_magnitude", max)):
+            if r[key] is not None:
+                out[key] = r[key] if out[key] is None else pick(out[key], r[key])
+        out["examples"] = (out["examples"] + r["examples"])[:examples]
+    out["binades"] = dict(sorted(out["binades"].items()))
+    return out
+
+def scan_exhaustive(chain, rounding="rne", chunk=CHUNK, examples=20):
+    # Every finite, non-negative bit pattern of a <= 32-bit source format (sign is symmetric except for rdn / rup)
+    chain = parse_chain(chain)
+    source = chain[0]
+    if source == DECIMAL or source.total_bits > EXHAUSTIVE_BITS:
+        raise ValueError(f"Exhaustive scans need a source format of {EXHAUSTIVE_BITS} bits or fewer.")
+    signs = [0] if rounding in ("rne", "rna", "rtz") else [0, 1]
+    reports = []
+    for sign in signs:
+        for start in range(0, source.max_mag + 1, chunk):
+            bits = np.arange(start, min(start + chunk, source.max_mag + 1), dtype=np.uint64)
+            bits |= np.uint64(sign << (source.total_bits - 1))
+            reports.append(analyze(ff.decode(bits.astype(source.uint_name), source), chain, rounding, examples))
+    report = merge_reports(reports, examples)
+    report["exhaustive"] = True
+    return report
+
+def midpoint_inputs(chain, n=1 << 16, seed=0, spread=4):
+    # Source values within a few source ULPs of a midpoint of the target format: where double rounding lives
+    chain = parse_chain(chain)
+    target = chain[-1]
+    rng = np.random.default_rng(seed)
+    lo = rng.integers(0, target.max_mag, n, dtype=np.uint64).astype(target.uint_name)
+    a, b = ff.decode(lo, target), ff.decode(lo + 1, target)
+    mid = a + (b - a) / 2
+    x = mid + rng.integers(-spread, spread + 1, n) * np.spacing(mid) * (2.0 ** rng.integers(0, 30, n))
+    x *= rng.choice([-1.0, 1.0], n)
+    if chain[0] == DECIMAL:
+        return np.array([repr(float(v)) if rng.random() < 0.5 else f"{v:.{rng.integers(5, 25)}g}" for v in x])
+    return x
+
+# --- Reports ---
+def format_report(report):
+    lines = [f"Chain    : {report['chain']} ({report['rounding']})", f"Values   : {report['count']}",
+             f"Affected : {report['affected']} ({100 * report['affected'] / max(report['count'], 1):.4f}%)",
+             f"Max ULP  : {report['max_ulp']}"]
+    if report["affected"]:
+        lines += [f"Range    : {report['min_magnitude']:.6g} .. {report['max_magnitude']:.6g}", "", "Per exponent field:"]
+        lines += [f"  {e:>6}: {c}" for e, c in report["binades"].items()]
+        lines += ["", "Examples (input -> chained / direct bits):"]
+        lines += [f"  {v}  ->  0x{got:x} / 0x{ref:x}" for v, got, ref in report["examples"]]
+    return "\n".join(lines)
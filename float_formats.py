@@ -0,0 +1,544 @@
+# Arbitrary (exponent, mantissa) float formats compiled into vectorized kernels
+import functools
+import math
+import re
+from collections import namedtuple
+from fractions import Fraction
+
+import float_codec
+
+ROUNDING_MODES = {
+    "rne": "Round to nearest, ties to even",
+    "rna": "Round to nearest, ties away from zero",
+    "rtz": "Round toward zero",
+    "rup": "Round toward +Inf",
+    "rdn": "Round toward -Inf",
+}
+
+# IEEE 754 exception flags, packed into a uint8 per element
+FLAG_INVALID = 1
+FLAG_DIVZERO = 2
+FLAG_OVERFLOW = 4
+FLAG_UNDERFLOW = 8
+FLAG_INEXACT = 16
+FLAG_NAMES = {FLAG_INVALID: "invalid", FLAG_DIVZERO: "divzero", FLAG_OVERFLOW: "overflow",
+              FLAG_UNDERFLOW: "underflow", FLAG_INEXACT: "inexact"}
+
+CLASSES = ["Zero", "Subnormal", "Normal", "Overflow or NaN"]
+# Fine-grained classes in IEEE 754 class() order
+FPCLASSES = ["sNaN", "qNaN", "-Inf", "-Normal", "-Subnormal", "-0", "+0", "+Subnormal", "+Normal", "+Inf"]
+BINARY_OPS = ["add", "sub", "mul", "div"]
+UNARY_OPS = ["sqrt"]
+# Raised whenever encode / apply_op results change (2: exact directed-rounding
+# residuals, 3: canonical quiet NaN). Persisted tables and cached results carry
+# it in their file names, so nothing built by an older kernel is read back.
+KERNEL_REVISION = 3
+
+# --- Format Spec ---
+# inf=True reserves the top exponent for Inf/NaN (IEEE); inf=False with nan=True
+# keeps only the all-ones pattern as NaN (E4M3FN style); neither makes every
+# pattern finite.
+class FloatFormat(namedtuple("FloatFormat", "name exp_bits man_bits bias subnormals inf nan")):
+    __slots__ = ()
+
+    @property
+    def total_bits(self):
+        return 1 + self.exp_bits + self.man_bits
+
+    @property
+    def emin(self):
+        return 1 - self.bias
+
+    @property
+    def emax(self):
+        return (1 << self.exp_bits) - (2 if self.inf else 1) - self.bias
+
+    @property
+    def inf_mag(self):
+        return ((1 << self.exp_bits) - 1) << self.man_bits if self.inf else None
+
+    @property
+    def nan_mag(self):
+        if self.inf:
+            return self.inf_mag | (1 << (self.man_bits - 1))
+        return (1 << (self.exp_bits + self.man_bits)) - 1 if self.nan else None
+
+    @property
+    def max_mag(self):
+        all_ones = (1 << (self.exp_bits + self.man_bits)) - 1
+        if self.inf:
+            return self.inf_mag - 1
+        return all_ones - 1 if self.nan else all_ones
+
+    @property
+    def uint_name(self):
+        return next(f"uint{n}" for n in (8, 16, 32, 64) if self.total_bits <= n)
+
+def make_format(exp_bits, man_bits, bias=None, subnormals=True, inf=True, nan=True, name=None):
+    if bias is None:
+        bias = (1 << (exp_bits - 1)) - 1
+    if not 1 <= exp_bits <= 11 or not 0 <= man_bits <= 52:
+        raise ValueError("Formats need 1-11 exponent bits and 0-52 mantissa bits.")
+    if inf and not (nan and man_bits > 0):
+        raise ValueError("IEEE-style Inf needs NaN encodings and at least one mantissa bit.")
+    if name is None:
+        name = f"E{exp_bits}M{man_bits}"
+        if not inf:
+            name += "FN" if nan else "FNN"
+        if bias != (1 << (exp_bits - 1)) - 1:
+            name += f"B{bias}"
+        if not subnormals:
+            name += "FTZ"
+    fmt = FloatFormat(name, exp_bits, man_bits, bias, subnormals, inf, nan)
+    # Kernels go through float64, so the whole format has to fit inside it
+    if fmt.emax > 1023 or fmt.emin - man_bits < -1074:
+        raise ValueError(f"{name} does not fit inside float64.")
+    return fmt
+
+FORMATS = {
+    "float16": make_format(5, 10, name="float16"),
+    "bfloat16": make_format(8, 7, name="bfloat16"),
+    "float32": make_format(8, 23, name="float32"),
+    "float64": make_format(11, 52, name="float64"),
+    "e4m3": make_format(4, 3, inf=False, name="e4m3"),
+    "e5m2": make_format(5, 2, name="e5m2"),
+}
+
+def get_format(fmt):
+    if isinstance(fmt, FloatFormat):
+        return fmt
+    name = (getattr(fmt, "__name__", None) or str(fmt)).strip()
+    if name.lower() in FORMATS:
+        return FORMATS[name.lower()]
+    match = re.fullmatch(r"E(\d+)M(\d+)(FNN|FN)?(?:B(-?\d+))?(FTZ)?", name.upper())
+    if not match:
+        raise ValueError(f"Unknown format: {fmt!r}")
+    exp_bits, man_bits, policy, bias, ftz = match.groups()
+    return make_format(int(exp_bits), int(man_bits), int(bias) if bias is not None else None,
+                       subnormals=ftz is None, inf=policy is None, nan=policy != "FNN")
+
+def get_params(fmt):
+    fmt = get_format(fmt)
+    return fmt.total_bits, fmt.exp_bits, fmt.man_bits, fmt.bias
+
+def is_native(fmt):
+    return fmt.name in float_codec.FORMATS and FORMATS[fmt.name] == fmt
+
+# --- Scalar Breakdown ---
+def status_of(e, m, fmt):
+    all_ones_e = (1 << fmt.exp_bits) - 1
+    if e == 0 and (m == 0 or not fmt.subnormals):
+        return "Zero"
+    if e == 0:
+        return "Subnormal"
+    if (fmt.inf and e == all_ones_e) or (not fmt.inf and fmt.nan and e == all_ones_e and m == (1 << fmt.man_bits) - 1):
+        return "Overflow or NaN"
+    return "Normal"
+
+def fpclass_of(bits, fmt):
+    fmt = get_format(fmt)
+    bits = int(bits)
+    sign = "-" if bits >> (fmt.total_bits - 1) else "+"
+    e = (bits >> fmt.man_bits) & ((1 << fmt.exp_bits) - 1)
+    m = bits & ((1 << fmt.man_bits) - 1)
+    status = status_of(e, m, fmt)
+    if status == "Overflow or NaN":
+        if fmt.inf and m == 0:
+            return sign + "Inf"
+        if not fmt.inf:
+            return "qNaN"
+        quiet = 1 << (fmt.man_bits - 1)
+        return f"{'qNaN' if m & quiet else 'sNaN'} (payload 0x{m & (quiet - 1):x})"
+    return sign + {"Zero": "0"}.get(status, status)
+
+def breakdown(bits, fmt):
+    fmt = get_format(fmt)
+    if is_native(fmt):
+        return float_codec.breakdown(bits, fmt.name)
+    total_bits, exp_bits, man_bits, bias = get_params(fmt)
+    bits = int(bits)
+    s = (bits >> (exp_bits + man_bits)) & 0x1
+    e = (bits >> man_bits) & ((1 << exp_bits) - 1)
+    m = bits & ((1 << man_bits) - 1)
+    status = status_of(e, m, fmt)
+    mantissa_val = m / (1 << man_bits)
+
+    if status == "Zero":
+        formula = "0"
+    elif status == "Subnormal":
+        formula = f"{'-1' if s else '1'} × 2^{1-bias} × {mantissa_val:.4g}"
+    elif status == "Overflow or NaN":
+        formula = "Inf or NaN" if fmt.inf else "NaN"
+    else:
+        formula = f"{'-1' if s else '1'} × 2^{e - bias} × {1 + mantissa_val:.4g}"
+
+    return s, e, m, formula, f"{bits:0{total_bits}b}", status
+
+# --- Kernels ---
+FormatKernels = namedtuple("FormatKernels", "fmt encode decode round fields classify decode_table")
+
+@functools.lru_cache(maxsize=None)
+def compile_format(fmt):
+    import numpy as np
+
+    fmt = get_format(fmt)
+    E, M, emin = fmt.exp_bits, fmt.man_bits, fmt.emin
+    uint = np.dtype(fmt.uint_name)
+    sign_shift = np.uint64(E + M)
+    e_mask = (1 << E) - 1
+    m_mask = (1 << M) - 1
+    min_normal = math.ldexp(1.0, emin)
+    native = is_native(fmt)
+
+    def special_mag(value):
+        return np.uint64(value if value is not None else 0)
+
+    inf_or_nan = special_mag(fmt.inf_mag if fmt.inf else fmt.nan_mag if fmt.nan else fmt.max_mag)
+    nan_mag = special_mag(fmt.nan_mag)
+    max_mag = np.uint64(fmt.max_mag)
+
+    def encode(x, rounding="rne", residual=None, with_flags=False):
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Unknown rounding mode: {rounding!r}")
+        x = np.asarray(x, dtype=np.float64)
+        if native and rounding == "rne" and residual is None and not with_flags:
+            with np.errstate(over="ignore"):
+                return x.astype(fmt.name).view(uint)
+
+        sign = np.signbit(x)
+        nan = np.isnan(x)
+        inf = np.isinf(x)
+        a = np.where(nan | inf, 0.0, np.abs(x))
+        _, k = np.frexp(a)
+        exp = np.where(a == 0, emin, np.maximum(k - 1, emin))
+        t = np.ldexp(a, M - exp)
+        lo = np.floor(t)
+        frac = t - lo
+
+        # r is the sign of (exact magnitude - |x|) when x is itself a rounded result
+        if residual is None:
+            r = np.zeros(x.shape, dtype=np.int8)
+        else:
+            residual = np.nan_to_num(np.asarray(residual, dtype=np.float64), posinf=0.0, neginf=0.0)
+            r = np.sign(residual)
+            r = np.where(sign, -r, r).astype(np.int8)
+        # Inf with a residual toward zero is a finite exact value past float64's range
+        past_range = inf & (r < 0)
+        inf &= ~past_range
+        on_grid = frac == 0
+        lo = lo - (on_grid & (r < 0))
+        cmp = np.where(frac > 0.5, 1, np.where(frac == 0.5, r, -1))
+        cmp = np.where(on_grid & (r < 0), 1, cmp)
+        if residual is not None:
+            # A residual of exactly half a step ties x with its float64 neighbour,
+            # which is a tie here too wherever the two grids coincide
+            with np.errstate(over="ignore"):
+                tie = on_grid & (np.abs(residual) == 0.5) & (np.ldexp(1.0, exp - M) == np.spacing(a))
+            cmp = np.where(tie, 0, cmp)
+        inexact = ~on_grid | (r != 0)
+
+        if rounding == "rne":
+            up = inexact & ((cmp > 0) | ((cmp == 0) & (np.fmod(lo, 2) == 1)))
+        elif rounding == "rna":
+            up = inexact & (cmp >= 0)
+        elif rounding == "rtz":
+            up = np.zeros(x.shape, dtype=bool)
+        elif rounding == "rup":
+            up = inexact & ~sign
+        else:
+            up = inexact & sign
+
+        n = (lo + up).astype(np.uint64)
+        exp_field = np.minimum(exp - emin, (1 << E) + 1).astype(np.uint64)
+        mag = (exp_field << np.uint64(M)) + n
+
+        tiny = (a < min_normal) & (a != 0)
+        flush = np.zeros(x.shape, dtype=bool)
+        if not fmt.subnormals:
+            flush = (mag < np.uint64(1 << M)) & (mag != 0)
+            mag = np.where(flush, np.uint64(0), mag)
+
+        overflow = (mag > max_mag) | past_range
+        toward_max = (rounding == "rtz") | ((rounding == "rup") & sign) | ((rounding == "rdn") & ~sign)
+        mag = np.where(overflow, np.where(toward_max, max_mag, inf_or_nan), mag)
+        mag = np.where(inf, inf_or_nan, mag)
+        mag = np.where(nan, nan_mag, mag)
+
+        bits = ((sign.astype(np.uint64) << sign_shift) | mag).astype(uint)
+        if not with_flags:
+            return bits
+        flags = np.where(inexact | overflow | flush, FLAG_INEXACT, 0)
+        flags |= np.where(overflow, FLAG_OVERFLOW, 0)
+        flags |= np.where(tiny & (inexact | flush), FLAG_UNDERFLOW, 0)
+        flags |= np.where((nan & (fmt.nan_mag is None)) | (inf & (fmt.inf_mag is None)), FLAG_INVALID, 0)
+        return bits, flags.astype(np.uint8)
+
+    def fields(bits):
+        b = np.asarray(bits).astype(np.uint64)
+        s = (b >> sign_shift) & np.uint64(1)
+        e = (b >> np.uint64(M)) & np.uint64(e_mask)
+        m = b & np.uint64(m_mask)
+        return s, e, m
+
+    def classify(bits):
+        s, e, m = fields(bits)
+        if fmt.inf:
+            special = e == e_mask
+        elif fmt.nan:
+            special = (e == e_mask) & (m == m_mask)
+        else:
+            special = np.zeros(e.shape, dtype=bool)
+        zero = (e == 0) & ((m == 0) | (not fmt.subnormals))
+        return np.select([zero, e == 0, special], [0, 1, 3], default=2).astype(np.uint8)
+
+    def compute_decode(bits):
+        s, e, m = fields(bits)
+        mf = m.astype(np.float64)
+        sub = np.ldexp(mf, emin - M) if fmt.subnormals else np.zeros(mf.shape)
+        with np.errstate(over="ignore"):
+            val = np.where(e == 0, sub, np.ldexp(mf + (1 << M), e.astype(np.int64) - fmt.bias - M))
+        if fmt.inf:
+            val = np.where(e == e_mask, np.where(m == 0, np.inf, np.nan), val)
+        elif fmt.nan:
+            val = np.where((e == e_mask) & (m == m_mask), np.nan, val)
+        return np.where(s == 1, -val, val)
+
+    table = compute_decode(np.arange(1 << fmt.total_bits, dtype=np.uint64)) if fmt.total_bits <= 16 else None
+
+    def decode(bits):
+        if table is not None:
+            return table[np.asarray(bits).astype(np.intp)]
+        if native:
+            with np.errstate(invalid="ignore"):
+                return np.asarray(bits).astype(uint).view(fmt.name).astype(np.float64)
+        return compute_decode(bits)
+
+    def round_values(x, rounding="rne"):
+        return decode(encode(x, rounding))
+
+    return FormatKernels(fmt, encode, decode, round_values, fields, classify, table)
+
+# --- Array API ---
+def encode(x, fmt, rounding="rne", with_flags=False):
+    return compile_format(get_format(fmt)).encode(x, rounding, with_flags=with_flags)
+
+def decode(bits, fmt):
+    return compile_format(get_format(fmt)).decode(bits)
+
+def classify(bits, fmt):
+    return compile_format(get_format(fmt)).classify(bits)
+
+def two_sum(a, b):
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+def two_prod(a, b):
+    import numpy as np
+    p = a * b
+    split = 134217729.0  # 2^27 + 1 (Dekker)
+    with np.errstate(over="ignore", invalid="ignore"):
+        ca, cb = split * a, split * b
+        ah, bh = ca - (ca - a), cb - (cb - b)
+        al, bl = a - ah, b - bh
+        return p, ((ah * bh - p) + ah * bl + al * bh) + al * bl
+
+# Exact operands are decoded to float64 and the float64 result is rounded
+# again with its exact residual, which gives the correctly rounded result in
+# every rounding mode. Error terms are taken on operands scaled into
+# [0.5, 1), so the Dekker split cannot overflow and the error of a subnormal
+# result cannot underflow.
+def op_residual(op, a, b=None):
+    # float64 result of the op plus (exact - result) in float64 steps toward the
+    # exact value: under one half, exactly one half on a tie. A finite exact
+    # value past float64's range comes back as Inf with a residual of -sign(Inf).
+    import numpy as np
+    with np.errstate(all="ignore"):
+        a = np.asarray(a, dtype=np.float64)
+        ma, ea = np.frexp(a)
+        # exact - y == 2^scale * (u + v) / w, with u, v and w exact
+        if op == "sqrt":
+            y = np.sqrt(a)
+            odd = ea & 1
+            ma, scale = np.ldexp(ma, odd), (ea - odd) >> 1
+            root = np.ldexp(y, -scale)
+            p, e = two_prod(root, root)
+            # Only approximately: (root + d)^2 - root^2 = d * (2 root + d). Roots are never ties.
+            u, v, w = ma - p, -e, 2 * root
+            finite = np.isfinite(a)
+        else:
+            b = np.asarray(b, dtype=np.float64)
+            mb, eb = np.frexp(b)
+            finite = np.isfinite(a) & np.isfinite(b)
+            if op in ("add", "sub"):
+                # two_sum stays exact across the whole range, so sums need no scaling
+                y, u = two_sum(a, b if op == "add" else -b)
+                v, w, scale = 0.0, 1.0, 0
+            elif op == "mul":
+                y = a * b
+                scale = ea + eb
+                p, e = two_prod(ma, mb)
+                u, v, w = p - np.ldexp(y, -scale), e, 1.0
+            elif op == "div":
+                y = a / b
+                scale = ea - eb
+                p, e = two_prod(np.ldexp(y, -scale), mb)
+                u, v, w = ma - p, -e, mb
+                finite &= b != 0
+            else:
+                raise ValueError(f"Unknown operation: {op!r}")
+        hi, lo = two_sum(u, v)
+        toward = np.sign(hi) * np.sign(w)
+        step = np.ldexp(np.abs(np.nextafter(y, toward * np.inf) - y), -scale)
+        tie = (hi != 0) & (hi == toward * step * w * 0.5) & (lo == 0) & (op != "sqrt")
+        below_half = np.nextafter(0.5, 0.0)
+        ratio = np.clip(hi / w / step, -below_half, below_half)
+        ratio = np.where(hi == 0, 0.0, np.where(ratio == 0, toward * 5e-324, ratio))
+        residual = np.where(tie, toward * 0.5, ratio)
+        overflow = finite & np.isinf(y)
+        return y, np.where(np.isfinite(y) & finite, residual, np.where(overflow, -np.sign(y), 0.0))
+
+def apply_op(op, a_bits, b_bits, fmt, rounding="rne", with_flags=False):
+    import numpy as np
+    fmt = get_format(fmt)
+    k = compile_format(fmt)
+    a = k.decode(a_bits)
+    b = k.decode(b_bits) if op != "sqrt" else None
+    y, err = op_residual(op, a, b)
+    bits, flags = k.encode(y, rounding, residual=err, with_flags=True)
+    if fmt.nan:
+        # The sign of a NaN from the host FPU varies by platform; results carry the
+        # canonical quiet NaN with the sign bit clear
+        bits = np.where(np.isnan(y), bits & ~np.array(1 << (fmt.total_bits - 1), dtype=bits.dtype), bits)
+    if not with_flags:
+        return bits
+    operand_nan = np.isnan(a) | (np.isnan(b) if b is not None else False)
+    invalid = np.isnan(y) & ~operand_nan
+    if fmt.inf and fmt.man_bits:
+        # IEEE formats: a NaN with the quiet bit clear is signaling
+        quiet = np.uint64(1 << (fmt.man_bits - 1))
+        invalid |= np.isnan(a) & ((np.asarray(a_bits, dtype=np.uint64) & quiet) == 0)
+        if b is not None:
+            invalid |= np.isnan(b) & ((np.asarray(b_bits, dtype=np.uint64) & quiet) == 0)
+    flags = flags | np.where(invalid, FLAG_INVALID, 0).astype(np.uint8)
+    if op == "div":
+        flags |= np.where((b == 0) & np.isfinite(a) & (a != 0), FLAG_DIVZERO, 0).astype(np.uint8)
+    return bits, flags
+
+def breakdown_array(bits, fmt):
+    k = compile_format(get_format(fmt))
+    s, e, m = k.fields(bits)
+    return s, e, m, k.classify(bits)
+
+# --- Exact Rounding ---
+# Rounds an exact rational (fractions.Fraction or int) into the format; used
+# where float64 intermediates are not accurate enough.
+def encode_fraction(q, fmt, rounding="rne", negative=None):
+    fmt = get_format(fmt)
+    E, M, emin = fmt.exp_bits, fmt.man_bits, fmt.emin
+    sign = q < 0 if negative is None else negative
+    a = abs(q)
+    if a == 0:
+        mag = 0
+    else:
+        num, den = a.numerator, a.denominator
+        e = num.bit_length() - den.bit_length()
+        if (num << max(-e, 0)) < (den << max(e, 0)):
+            e -= 1
+        exp = max(e, emin)
+        scaled = Fraction(a) * Fraction(2) ** (M - exp)
+        lo = scaled.numerator // scaled.denominator
+        frac = scaled - lo
+        if frac == 0:
+            up = False
+        elif rounding == "rne":
+            up = frac * 2 > 1 or (frac * 2 == 1 and lo % 2 == 1)
+        elif rounding == "rna":
+            up = frac * 2 >= 1
+        elif rounding == "rtz":
+            up = False
+        elif rounding == "rup":
+            up = not sign
+        elif rounding == "rdn":
+            up = sign
+        else:
+            raise ValueError(f"Unknown rounding mode: {rounding!r}")
+        mag = ((exp - emin) << M) + lo + up
+        if not fmt.subnormals and mag < (1 << M):
+            mag = 0
+        if mag > fmt.max_mag:
+            toward_max = rounding == "rtz" or (rounding == "rup" and sign) or (rounding == "rdn" and not sign)
+            if toward_max or not (fmt.inf or fmt.nan):
+                mag = fmt.max_mag
+            else:
+                mag = fmt.inf_mag if fmt.inf else fmt.nan_mag
+    return (int(sign) << (E + M)) | mag
+
+# --- Decimal Strings ---
+DECIMAL_RE = re.compile(r"([+-]?)(\d*)\.?(\d*)(?:e([+-]?\d+))?")
+# Beyond any 11-bit-exponent format in either direction, so clamping changes no result
+MAX_DECIMAL_EXP = 5000
+
+def decimal_fraction(s):
+    match = DECIMAL_RE.fullmatch(s.strip().lower())
+    if not match or not (match.group(2) or match.group(3)):
+        raise ValueError(f"Invalid decimal: {s!r}")
+    sign, whole, frac, exp = match.groups()
+    text = (whole + frac).lstrip("0")
+    stripped = text.rstrip("0")
+    e = int(exp or 0) - len(frac) + len(text) - len(stripped)
+    # int() refuses strings past a few thousand digits, so long significands go in pieces
+    digits = 0
+    for i in range(0, len(stripped), 4000):
+        piece = stripped[i:i + 4000]
+        digits = digits * 10 ** len(piece) + int(piece)
+    order = len(stripped) + e
+    if digits and abs(order) > MAX_DECIMAL_EXP:
+        digits, e = 1, MAX_DECIMAL_EXP if order > 0 else -MAX_DECIMAL_EXP
+    q = Fraction(digits * 10 ** e) if e >= 0 else Fraction(digits, 10 ** -e)
+    return -q if sign == "-" else q
+
+def decimal_to_bits(s, fmt, rounding="rne"):
+    # One correct rounding straight from the string; float(s) would round to float64 first
+    t = s.strip().lower()
+    if t.lstrip("+-") in ("nan", "inf", "infinity"):
+        return float_to_bits(float(t), fmt, rounding)
+    return encode_fraction(decimal_fraction(t), fmt, rounding, negative=t.startswith("-"))
+
+# --- Scalar API ---
+# Native formats in round-to-nearest stay on the struct codec; everything
+# else runs the compiled kernels on a one-element array.
+def bits_to_float(bits, fmt):
+    fmt = get_format(fmt)
+    if is_native(fmt):
+        return float_codec.bits_to_float(bits, fmt.name)
+    return float(decode([int(bits)], fmt)[0])
+
+def float_to_bits(value, fmt, rounding="rne"):
+    fmt = get_format(fmt)
+    if is_native(fmt) and rounding == "rne":
+        return float_codec.float_to_bits(value, fmt.name)
+    return int(encode([value], fmt, rounding)[0])
+
+SCALAR_OPS = {
+    "add": lambda a, b: a + b,
+    "sub": lambda a, b: a - b,
+    "mul": lambda a, b: a * b,
+    "div": lambda a, b: a / b,
+    "sqrt": lambda a, b: math.sqrt(a),
+}
+
+def scalar_op(op, a_bits, b_bits, fmt, rounding="rne"):
+    fmt = get_format(fmt)
+    # Double rounding through float64 is harmless for p <= 26 (53 >= 2p + 2)
+    if is_native(fmt) and rounding == "rne":
+        a = bits_to_float(a_bits, fmt)
+        b = bits_to_float(b_bits, fmt) if b_bits is not None else None
+        try:
+            y = SCALAR_OPS[op](a, b)
+            if y == y:
+                return float_to_bits(y, fmt)
+        except (ZeroDivisionError, ValueError):
+            pass
+    b = [int(b_bits)] if b_bits is not None else None
+    return int(apply_op(op, [int(a_bits)], b, fmt, rounding)[0])
@@ -0,0 +1,129 @@
+# Interval arithmetic over bit arrays: endpoints rounded outward (down / up) in the target format
+import numpy as np
+import float_formats as ff
+
+OPS = ff.BINARY_OPS + ff.UNARY_OPS
+
+# --- Endpoints ---
+# Intervals are paired (lo, hi) bit arrays of one format. An empty interval
+# has NaN endpoints; so does any interval with a NaN endpoint or lo > hi.
+# Formats without Inf cannot hold an unbounded endpoint, so a bound that
+# overflows them comes back NaN as well.
+def enclose(lo, hi, fmt):
+    # Smallest interval of the format containing the float64 range [lo, hi]
+    return ff.encode(lo, fmt, "rdn"), ff.encode(hi, fmt, "rup")
+
+def enclose_decimal(lo, hi, fmt):
+    # Same from decimal strings, rounded straight from the string
+    return ff.decimal_to_bits(lo, fmt, "rdn"), ff.decimal_to_bits(hi, fmt, "rup")
+
+def empty_like(bits, fmt):
+    k = ff.compile_format(ff.get_format(fmt))
+    nan = k.encode(np.full(np.shape(bits), np.nan))
+    return nan, nan.copy()
+
+def is_empty(lo_bits, hi_bits, fmt):
+    k = ff.compile_format(ff.get_format(fmt))
+    lo, hi = k.decode(lo_bits), k.decode(hi_bits)
+    return ~(lo <= hi)
+
+def contains(lo_bits, hi_bits, x, fmt):
+    k = ff.compile_format(ff.get_format(fmt))
+    return (k.decode(lo_bits) <= x) & (x <= k.decode(hi_bits))
+
+def width_ulps(lo_bits, hi_bits, fmt):
+    # Representable steps from lo to hi; 0 for a point interval
+    from float_diff import ulp_distance
+    dist, _ = ulp_distance(lo_bits, hi_bits, ff.get_format(fmt))
+    return dist
+
+# --- Operations ---
+def rounded(k, op, rounding, a, b=None):
+    # One endpoint combination, correctly rounded down ("rdn") or up ("rup")
+    y, err = ff.op_residual(op, a, b)
+    return k.decode(k.encode(y, rounding, residual=err))
+
+def hull(k, op, pairs):
+    # Lower / upper bound over endpoint combinations, picked exactly and then
+    # rounded once. (result, residual) pairs order exactly by result first and
+    # residual second. NaN candidates (0 * Inf, Inf / Inf) are limits that the
+    # other combinations already cover.
+    y, err = (np.stack(v) for v in zip(*(ff.op_residual(op, a, b) for a, b in pairs)))
+    nan = np.isnan(y)
+    out = []
+    for rounding, pick, fill in (("rdn", np.min, np.inf), ("rup", np.max, -np.inf)):
+        ys = np.where(nan, fill, y)
+        best = pick(ys, axis=0)
+        residual = pick(np.where(ys == best, err, fill), axis=0)
+        # -0 and +0 compare equal; a zero result takes the sign of its residual
+        best = np.where((best == 0) & (residual != 0), np.copysign(0.0, residual), best)
+        out.append(k.decode(k.encode(best, rounding, residual=np.where(np.isfinite(residual), residual, 0.0))))
+    return tuple(out)
+
+def divide(k, a_lo, a_hi, b_lo, b_hi):
+    lo, hi = hull(k, "div", [(a_lo, b_lo), (a_lo, b_hi), (a_hi, b_lo), (a_hi, b_hi)])
+    # Divisors containing zero (either signed zero counts as zero)
+    zero_in = (b_lo <= 0) & (b_hi >= 0)
+    if not zero_in.any():
+        return lo, hi
+    a_pos, a_neg, a_zero = a_lo > 0, a_hi < 0, (a_lo == 0) & (a_hi == 0)
+    b_zero = (b_lo == 0) & (b_hi == 0)
+    cases = [
+        # [0, 0] as divisor: no quotient exists
+        (b_zero, np.nan, np.nan),
+        (a_zero, 0.0, 0.0),
+        # a straddles zero, or b straddles it strictly: the hull is everything
+        (~a_pos & ~a_neg | (b_lo < 0) & (b_hi > 0), -np.inf, np.inf),
+        # One-sided divisors [0, d] and [c, 0]
+        ((b_lo == 0) & a_pos, lambda: rounded(k, "div", "rdn", a_lo, b_hi), np.inf),
+        ((b_lo == 0) & a_neg, -np.inf, lambda: rounded(k, "div", "rup", a_hi, b_hi)),
+        ((b_hi == 0) & a_neg, lambda: rounded(k, "div", "rdn", a_hi, b_lo), np.inf),
+        ((b_hi == 0) & a_pos, -np.inf, lambda: rounded(k, "div", "rup", a_lo, b_lo)),
+    ]
+    # Earlier cases win; bounds of the one-sided cases are only computed when they occur
+    for mask, c_lo, c_hi in reversed(cases):
+        mask = zero_in & mask
+        if mask.any():
+            lo = np.where(mask, c_lo() if callable(c_lo) else c_lo, lo)
+            hi = np.where(mask, c_hi() if callable(c_hi) else c_hi, hi)
+    return lo, hi
+
+def interval_op(op, a_lo, a_hi, b_lo=None, b_hi=None, fmt="float16"):
+    # Vectorized over paired endpoint arrays; returns (lo_bits, hi_bits)
+    fmt = ff.get_format(fmt)
+    if not fmt.nan:
+        raise ValueError(f"{fmt.name} has no NaN, so it cannot represent an empty interval.")
+    k = ff.compile_format(fmt)
+    a_lo, a_hi = k.decode(a_lo), k.decode(a_hi)
+    empty = ~(a_lo <= a_hi)
+    if op == "sqrt":
+        empty |= a_hi < 0
+        lo, hi = rounded(k, "sqrt", "rdn", np.maximum(a_lo, 0.0)), rounded(k, "sqrt", "rup", a_hi)
+    else:
+        if op not in ff.BINARY_OPS:
+            raise ValueError(f"Unknown operation: {op!r}")
+        b_lo, b_hi = k.decode(b_lo), k.decode(b_hi)
+        empty |= ~(b_lo <= b_hi)
+        if op == "add":
+            lo, hi = rounded(k, "add", "rdn", a_lo, b_lo), rounded(k, "add", "rup", a_hi, b_hi)
+        elif op == "sub":
+            lo, hi = rounded(k, "sub", "rdn", a_lo, b_hi), rounded(k, "sub", "rup", a_hi, b_lo)
+        elif op == "mul":
+            lo, hi = hull(k, "mul", [(a_lo, b_lo), (a_lo, b_hi), (a_hi, b_lo), (a_hi, b_hi)])
+        else:
+            lo, hi = divide(k, a_lo, a_hi, b_lo, b_hi)
+    lo, hi = np.where(empty, np.nan, lo), np.where(empty, np.nan, hi)
+    # Endpoints are already values of the format, so encoding them back is exact
+    return k.encode(lo, "rdn"), k.encode(hi, "rup")
+
+# --- Reports ---
+def format_interval(lo_bits, hi_bits, fmt):
+    fmt = ff.get_format(fmt)
+    k = ff.compile_format(fmt)
+    digits = -(-fmt.total_bits // 4)
+    lo_bits, hi_bits = np.array([lo_bits], dtype=fmt.uint_name), np.array([hi_bits], dtype=fmt.uint_name)
+    lo, hi = float(k.decode(lo_bits)[0]), float(k.decode(hi_bits)[0])
+    if not lo <= hi:
+        return "empty"
+    width = int(width_ulps(lo_bits, hi_bits, fmt)[0])
+    return f"[{lo!r}, {hi!r}]  (0x{int(lo_bits[0]):0{digits}x}, 0x{int(hi_bits[0]):0{digits}x}, {width} ULPs wide)"
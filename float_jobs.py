@@ -0,0 +1,349 @@
+# Background jobs: chunked analyses on a process pool with persisted progress, cancel / resume and fair scheduling
+import contextlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from collections import namedtuple
+from multiprocessing import Pool
+
+import numpy as np
+import float_formats as ff
+from float_cache import CACHE_DIR
+
+JOBS_VERSION = 2
+STATUSES = ["queued", "running", "done", "cancelled", "failed"]
+# A claimed chunk belongs to its runner until the lease expires; live runners
+# renew theirs well before that, so only chunks of a dead process go back
+LEASE = 30.0
+RENEW = LEASE / 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, owner TEXT NOT NULL, kind TEXT NOT NULL, params TEXT NOT NULL,
+    status TEXT NOT NULL, total INTEGER NOT NULL, done INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL, updated REAL NOT NULL, error TEXT
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    job INTEGER NOT NULL, idx INTEGER NOT NULL, result BLOB, claimed TEXT, expires REAL, PRIMARY KEY (job, idx)
+);
+"""
+
+# --- Job Kinds ---
+# plan(params) -> number of chunks, run(params, i) -> partial result, merge(parts) -> result
+JobKind = namedtuple("JobKind", "label plan run merge")
+
+def sweep_block(fmt):
+    # Operand a values per chunk, so each chunk covers about 2^20 pairs
+    return max(1, (1 << 20) >> fmt.total_bits)
+
+def division_plan(params):
+    fmt = ff.get_format(params["format"])
+    if fmt.total_bits > 16:
+        raise ValueError("Exhaustive sweeps cover formats of 16 bits or fewer.")
+    return -(-(1 << fmt.total_bits) // sweep_block(fmt))
+
+def division_run(params, i):
+    import float_division
+    from float_diff import ulp_distance
+    fmt = ff.get_format(params["format"])
+    design = float_division.make_design(**params["design"])
+    block, n = sweep_block(fmt), 1 << fmt.total_bits
+    a_values = np.arange(i * block, min((i + 1) * block, n), dtype=np.uint64)
+    a = np.repeat(a_values, n).astype(fmt.uint_name)
+    b = np.tile(np.arange(n, dtype=np.uint64), len(a_values)).astype(fmt.uint_name)
+    got = float_division.emulate(a, b, fmt, design, params.get("rounding", "rne"))
+    ref = ff.apply_op("div", a, b, fmt, params.get("rounding", "rne"))
+    dist, nan_mismatch = ulp_distance(got, ref, fmt)
+    values, counts = np.unique(dist[~nan_mismatch], return_counts=True)
+    worst = int(np.argmax(np.where(nan_mismatch, 0, dist)))
+    return {"histogram": {int(v): int(c) for v, c in zip(values, counts)}, "nan_mismatch": int(nan_mismatch.sum()),
+            "worst": (int(dist[worst]), int(a[worst]), int(b[worst]), int(got[worst]), int(ref[worst]))}
+
+def division_merge(parts):
+    histogram = {}
+    for p in parts:
+        for v, c in p["histogram"].items():
+            histogram[v] = histogram.get(v, 0) + c
+    worst = max((p["worst"] for p in parts), default=None)
+    return {"pairs": sum(histogram.values()) + sum(p["nan_mismatch"] for p in parts),
+            "exact": histogram.get(0, 0), "max_ulp": max(histogram, default=0),
+            "histogram": dict(sorted(histogram.items())), "nan_mismatch": sum(p["nan_mismatch"] for p in parts),
+            "worst": worst}
+
+STATS_CHUNK = 1 << 22
+
+def store_upload(data):
+    # Uploaded dumps are content-addressed so resubmitting one reuses the file
+    import hashlib
+    path = os.path.join(CACHE_DIR, "uploads", hashlib.sha256(data).hexdigest() + ".bin")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return path
+
+def stats_plan(params):
+    fmt = ff.get_format(params["format"])
+    n = os.path.getsize(params["path"]) // np.dtype(fmt.uint_name).itemsize
+    return max(1, -(-n // STATS_CHUNK))
+
+def stats_run(params, i):
+    import float_class
+    from float_diff import open_dump
+    fmt = ff.get_format(params["format"])
+    n = os.path.getsize(params["path"]) // np.dtype(fmt.uint_name).itemsize
+    bits = np.asarray(open_dump(params["path"], fmt, i * STATS_CHUNK, min((i + 1) * STATS_CHUNK, n)))
+    values = ff.decode(bits, fmt)
+    finite = values[np.isfinite(values)]
+    return {"elements": len(bits), "classes": float_class.class_counts(bits, fmt).tolist(),
+            "min": float(finite.min()) if len(finite) else None, "max": float(finite.max()) if len(finite) else None,
+            "sum": float(finite.sum(dtype=np.float64)), "finite": len(finite)}
+
+def stats_merge(parts):
+    mins = [p["min"] for p in parts if p["min"] is not None]
+    maxs = [p["max"] for p in parts if p["max"] is not None]
+    finite = sum(p["finite"] for p in parts)
+    classes = np.sum([p["classes"] for p in parts], axis=0).tolist() if parts else []
+    return {"elements": sum(p["elements"] for p in parts), "classes": dict(zip(ff.FPCLASSES, classes)),
+            "min": min(mins, default=None), "max": max(maxs, default=None),
+            "mean": sum(p["sum"] for p in parts) / finite if finite else None}
+
+KINDS = {
+    "division_sweep": JobKind("Exhaustive division emulation sweep", division_plan, division_run, division_merge),
+    "file_stats": JobKind("Raw dump statistics", stats_plan, stats_run, stats_merge),
+}
+
+def run_chunk(task):
+    job_id, kind, params, i = task
+    return job_id, i, KINDS[kind].run(params, i)
+
+# --- Runner ---
+# Runners in any number of processes share one database. Chunks are claimed
+# inside a write transaction, so each runs once unless its runner dies and
+# the lease runs out; the per-owner limit counts live claims of every runner.
+class JobRunner:
+    def __init__(self, path=None, workers=None, owner_limit=None):
+        self.path = path or os.path.join(CACHE_DIR, f"jobs_v{JOBS_VERSION}.sqlite")
+        self.workers = workers or os.cpu_count() or 1
+        self.owner_limit = owner_limit or self.workers * 2
+        self.name = uuid.uuid4().hex
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.in_flight = {}  # (job, chunk) -> owner
+        self.pool = None
+        self.thread = None
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.connect().executescript(SCHEMA)
+
+    def connect(self):
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self.local.db = db
+        return db
+
+    def submit(self, owner, kind, params):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown job kind: {kind!r}")
+        total = KINDS[kind].plan(params)
+        now = time.time()
+        db = self.connect()
+        with self.transaction(db):
+            job_id = db.execute(
+                "INSERT INTO jobs (owner, kind, params, status, total, created, updated) VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (owner, kind, json.dumps(params, sort_keys=True), total, now, now)).lastrowid
+            db.executemany("INSERT INTO chunks (job, idx) VALUES (?, ?)", ((job_id, i) for i in range(total)))
+        self.start()
+        return job_id
+
+    @staticmethod
+    @contextlib.contextmanager
+    def transaction(db):
+        # IMMEDIATE takes the write lock up front, so concurrent claims queue up instead of interleaving
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def set_status(self, job_id, status, error=None):
+        self.connect().execute("UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ?",
+                               (status, error, time.time(), job_id))
+
+    def cancel(self, job_id):
+        # Chunks already on the pool finish and are kept for a later resume
+        self.connect().execute("UPDATE jobs SET status = 'cancelled', updated = ? WHERE id = ? AND status IN ('queued', 'running')",
+                               (time.time(), job_id))
+
+    def resume(self, job_id):
+        self.connect().execute("UPDATE jobs SET status = 'queued', error = NULL, updated = ? WHERE id = ? "
+                               "AND status IN ('cancelled', 'failed')", (time.time(), job_id))
+        self.start()
+
+    def delete(self, job_id):
+        db = self.connect()
+        self.cancel(job_id)
+        db.execute("DELETE FROM chunks WHERE job = ?", (job_id,))
+        db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def jobs(self, owner=None):
+        query = "SELECT id, owner, kind, params, status, total, done, created, updated, error FROM jobs"
+        rows = self.connect().execute(query + (" WHERE owner = ?" if owner else "") + " ORDER BY id",
+                                      (owner,) if owner else ()).fetchall()
+        keys = ["id", "owner", "kind", "params", "status", "total", "done", "created", "updated", "error"]
+        return [dict(zip(keys, row), params=json.loads(row[3])) for row in rows]
+
+    def job(self, job_id):
+        return next((j for j in self.jobs() if j["id"] == job_id), None)
+
+    def result(self, job_id):
+        job = self.job(job_id)
+        rows = self.connect().execute("SELECT result FROM chunks WHERE job = ? AND result IS NOT NULL ORDER BY idx",
+                                      (job_id,)).fetchall()
+        return KINDS[job["kind"]].merge([pickle.loads(r[0]) for r in rows])
+
+    # --- Scheduling ---
+    def next_tasks(self, free):
+        # Claims up to `free` chunks: round-robin over owners by live claims across
+        # all runners, oldest job first within an owner
+        db = self.connect()
+        tasks = []
+        with self.transaction(db):
+            now = time.time()
+            db.execute("UPDATE jobs SET status = 'done', done = total, updated = ? WHERE status IN ('queued', 'running') "
+                       "AND NOT EXISTS (SELECT 1 FROM chunks WHERE job = jobs.id AND result IS NULL)", (now,))
+            load = dict(db.execute("SELECT owner, count(*) FROM chunks JOIN jobs ON jobs.id = chunks.job "
+                                   "WHERE result IS NULL AND expires >= ? GROUP BY owner", (now,)))
+            pending = {}
+            for job_id, owner, kind, params in db.execute("SELECT id, owner, kind, params FROM jobs "
+                                                          "WHERE status IN ('queued', 'running') ORDER BY id"):
+                pending.setdefault(owner, []).append((job_id, kind, json.loads(params)))
+            while free > 0 and pending:
+                owner = min(pending, key=lambda o: (load.get(o, 0), pending[o][0][0]))
+                if load.get(owner, 0) >= self.owner_limit:
+                    del pending[owner]
+                    continue
+                job_id, kind, params = pending[owner][0]
+                # Unclaimed, or claimed by a runner whose lease ran out
+                claim = db.execute("UPDATE chunks SET claimed = ?, expires = ? WHERE job = ? AND idx = "
+                                   "(SELECT idx FROM chunks WHERE job = ? AND result IS NULL AND (claimed IS NULL OR expires < ?) "
+                                   "ORDER BY idx LIMIT 1) RETURNING idx",
+                                   (self.name, now + LEASE, job_id, job_id, now)).fetchone()
+                if claim is None:
+                    pending[owner].pop(0)
+                    if not pending[owner]:
+                        del pending[owner]
+                    continue
+                tasks.append((owner, (job_id, kind, params, claim[0])))
+                load[owner] = load.get(owner, 0) + 1
+                free -= 1
+            db.executemany("UPDATE jobs SET status = 'running', updated = ? WHERE id = ? AND status = 'queued'",
+                           {(now, task[0]) for _, task in tasks})
+        return tasks
+
+    def renew(self):
+        # Only chunks still on the pool: one whose result could not be stored lets its lease run out
+        with self.lock:
+            keys = list(self.in_flight)
+        expires = time.time() + LEASE
+        self.connect().executemany("UPDATE chunks SET expires = ? WHERE job = ? AND idx = ? AND claimed = ? AND result IS NULL",
+                                   [(expires, job_id, i, self.name) for job_id, i in keys])
+
+    def release(self, job_id, i):
+        self.connect().execute("UPDATE chunks SET claimed = NULL, expires = NULL WHERE job = ? AND idx = ? AND claimed = ?",
+                               (job_id, i, self.name))
+
+    # Pool callbacks run on the pool's result thread, which must survive database errors
+    def on_done(self, out):
+        job_id, i, part = out
+        with self.lock:
+            self.in_flight.pop((job_id, i), None)
+        try:
+            self.store(job_id, i, part)
+        except Exception:
+            traceback.print_exc()
+
+    def store(self, job_id, i, part):
+        db = self.connect()
+        # A chunk finished elsewhere after this runner lost its lease keeps the first result
+        db.execute("UPDATE chunks SET result = ?, claimed = NULL, expires = NULL WHERE job = ? AND idx = ? AND result IS NULL",
+                   (pickle.dumps(part), job_id, i))
+        db.execute("UPDATE jobs SET done = (SELECT count(*) FROM chunks WHERE job = ? AND result IS NOT NULL), updated = ? "
+                   "WHERE id = ?", (job_id, time.time(), job_id))
+
+    def on_error(self, task, err):
+        with self.lock:
+            self.in_flight.pop((task[0], task[3]), None)
+        try:
+            self.release(task[0], task[3])
+            self.set_status(task[0], "failed", "".join(traceback.format_exception_only(type(err), err)).strip())
+        except Exception:
+            traceback.print_exc()
+
+    def dispatch(self):
+        renewed = time.time()
+        while True:
+            tasks = []
+            try:
+                if self.in_flight and time.time() - renewed > RENEW:
+                    self.renew()
+                    renewed = time.time()
+                with self.lock:
+                    free = self.workers * 2 - len(self.in_flight)
+                    tasks = self.next_tasks(free) if free > 0 else []
+                    for owner, task in tasks:
+                        self.in_flight[(task[0], task[3])] = owner
+                for owner, task in tasks:
+                    self.pool.apply_async(run_chunk, (task,), callback=self.on_done,
+                                          error_callback=lambda err, task=task: self.on_error(task, err))
+            except Exception:
+                # e.g. "database is locked" while other replicas write the same file:
+                # report it and retry on the next round rather than stop dispatching
+                traceback.print_exc()
+            time.sleep(0.1 if tasks or self.in_flight else 0.5)
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.pool = Pool(self.workers)
+                self.thread = threading.Thread(target=self.dispatch, name="float-jobs", daemon=True)
+                self.thread.start()
+
+    def wait(self, job_id, poll=0.5, on_progress=None):
+        while True:
+            job = self.job(job_id)
+            if on_progress:
+                on_progress(job)
+            if job["status"] in ("done", "cancelled", "failed"):
+                return job
+            if self.thread is not None and not self.thread.is_alive():
+                raise RuntimeError(f"The job dispatcher stopped; job {job_id} is still {job['status']}.")
+            time.sleep(poll)
+
+# --- Reports ---
+def format_result(job, result):
+    lines = [f"Job {job['id']}: {KINDS[job['kind']].label} ({job['status']}, {job['done']}/{job['total']} chunks)",
+             "  " + ", ".join(f"{k}={v}" for k, v in sorted(job["params"].items()))]
+    if job["kind"] == "division_sweep":
+        pairs = result["pairs"] or 1
+        lines += [f"  Pairs       : {result['pairs']}", f"  Exact       : {result['exact']} ({100 * result['exact'] / pairs:.4f}%)",
+                  f"  Max ULP     : {result['max_ulp']}", f"  NaN mismatch: {result['nan_mismatch']}"]
+        lines += [f"  {v:>4} ULP  : {c}" for v, c in result["histogram"].items() if v]
+        if result["worst"] and result["worst"][0]:
+            dist, a, b, got, ref = result["worst"]
+            lines.append(f"  Worst       : 0x{a:x} / 0x{b:x} -> 0x{got:x}, expected 0x{ref:x} ({dist} ULP)")
+    else:
+        lines += [f"  Elements    : {result['elements']}", f"  Finite min  : {result['min']}",
+                  f"  Finite max  : {result['max']}", f"  Finite mean : {result['mean']}"]
+        lines += [f"  {name:<12}: {count}" for name, count in result["classes"].items() if count]
+    return "\n".join(lines)
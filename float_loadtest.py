@@ -0,0 +1,136 @@
+# Headless concurrent-session load harness for the Streamlit toolkits (float16_stream.py, float16-32-64.py)
+import json
+import os
+import random
+import resource
+import time
+from multiprocessing import Pool
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+OP_PAGES = ["Addition", "Subtraction", "Multiplication", "Division"]
+# Relative frequency of each interaction in a simulated session
+ACTIONS = {"convert": 5, "op": 4, "sqrt": 1}
+
+# --- Process Metrics ---
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# --- Interactions ---
+def random_value(rng):
+    kind = rng.random()
+    if kind < 0.2:
+        return f"0x{rng.getrandbits(16):04x}"
+    if kind < 0.3:
+        return rng.choice(["0", "-0", "inf", "nan", "65504", "6e-8"])
+    return f"{rng.uniform(-1000, 1000):.{rng.randint(1, 8)}g}"
+
+def select_page(at, name, timed):
+    tool = next(w for w in at.sidebar.selectbox if w.label == "Select Tool")
+    if name not in tool.options:
+        name = tool.options[0] if name == "Converter" else name
+    if tool.value != name:
+        tool.select(name)
+        timed("navigate")
+
+# Each step sets widgets the way a user would, then times the rerun it triggers
+def step(at, action, rng, timed):
+    if action == "convert":
+        select_page(at, "Converter", timed)
+        at.text_input[0].input(random_value(rng))
+    elif action == "op":
+        select_page(at, rng.choice(OP_PAGES), timed)
+        at.text_input[0].input(random_value(rng))
+        at.text_input[1].input(random_value(rng))
+    else:
+        select_page(at, "Square Root", timed)
+        at.text_input[0].input(random_value(rng))
+    timed(action)
+
+def run_session(job):
+    path, steps, seed, timeout = job
+    rng = random.Random(seed)
+    samples, errors = [], []
+
+    def timed(action):
+        start = time.perf_counter()
+        at.run()
+        samples.append((action, time.perf_counter() - start))
+        if at.exception:
+            errors.append(f"{action}: {at.exception[0].message}")
+
+    rss_start = rss_bytes()
+    at = AppTest.from_file(os.path.abspath(path), default_timeout=timeout)
+    timed("load")
+    actions, weights = list(ACTIONS), list(ACTIONS.values())
+    for _ in range(steps):
+        step(at, rng.choices(actions, weights)[0], rng, timed)
+    return samples, errors, rss_bytes() - rss_start
+
+# --- Harness ---
+def percentiles(seconds):
+    ms = np.array(seconds) * 1000.0
+    return {"count": len(ms), "p50": float(np.percentile(ms, 50)), "p90": float(np.percentile(ms, 90)),
+            "p99": float(np.percentile(ms, 99)), "max": float(ms.max())}
+
+def load_test(path, sessions=4, steps=20, seed=0, timeout=60):
+    # AppTest recompiles the script on every run and that is not thread-safe,
+    # so each simulated session gets its own process; on a shared host they
+    # still contend for CPU the way server sessions do. One process per core at
+    # most; the sessions beyond that queue for a free process.
+    jobs = [(path, steps, seed + i, timeout) for i in range(sessions)]
+    processes = min(sessions, os.cpu_count() or 1)
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        results = pool.map(run_session, jobs, chunksize=1)
+    wall = time.perf_counter() - start
+
+    samples = [s for session, _, _ in results for s in session]
+    errors = [e for _, session, _ in results for e in session]
+    reruns = [t for action, t in samples if action != "load"]
+    by_action = {}
+    for action, t in samples:
+        by_action.setdefault(action, []).append(t)
+    return {
+        "app": os.path.basename(path),
+        "sessions": sessions,
+        "processes": processes,
+        "steps": steps,
+        "seed": seed,
+        "wall_seconds": wall,
+        "reruns": len(reruns),
+        "throughput": len(reruns) / wall if wall else 0.0,
+        "latency_ms": percentiles(reruns) if reruns else None,
+        "by_action": {action: percentiles(ts) for action, ts in by_action.items()},
+        "rss_per_session": sum(r[2] for r in results) / sessions,
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+
+def sweep(path, session_counts, steps=20, seed=0, timeout=60):
+    return [load_test(path, n, steps, seed, timeout) for n in session_counts]
+
+def format_report(reports):
+    lines = [f"App: {reports[0]['app']}  ({reports[0]['steps']} steps per session, seed {reports[0]['seed']})", "",
+             f"{'Sessions':>8}  {'Procs':>5}  {'Reruns':>7}  {'Rerun/s':>8}  {'p50 ms':>8}  {'p90 ms':>8}  {'p99 ms':>8}  "
+             f"{'Max ms':>8}  {'MB/session':>10}  {'Errors':>6}"]
+    for r in reports:
+        lat = r["latency_ms"] or {"p50": 0, "p90": 0, "p99": 0, "max": 0}
+        lines.append(f"{r['sessions']:>8}  {r['processes']:>5}  {r['reruns']:>7}  {r['throughput']:>8.1f}  {lat['p50']:>8.1f}  {lat['p90']:>8.1f}  "
+                     f"{lat['p99']:>8.1f}  {lat['max']:>8.1f}  {r['rss_per_session'] / 2**20:>10.2f}  {r['error_count']:>6}")
+    last = reports[-1]
+    lines += ["", f"Per action at {last['sessions']} sessions:", f"{'Action':>10}  {'Count':>6}  {'p50 ms':>8}  {'p99 ms':>8}"]
+    for action, p in last["by_action"].items():
+        lines.append(f"{action:>10}  {p['count']:>6}  {p['p50']:>8.1f}  {p['p99']:>8.1f}")
+    for r in reports:
+        lines += [f"[{r['sessions']} sessions] {e}" for e in r["errors"][:5]]
+    return "\n".join(lines)
+
+def write_report(reports, path):
+    with open(path, "w") as f:
+        json.dump(reports, f, indent=2)
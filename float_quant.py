@@ -0,0 +1,298 @@
+# Affine integer quantization (int8 / int4 ...) with per-tensor or per-channel calibration
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+import float_formats as ff
+from float_diff import open_dump
+
+CHUNK = 1 << 20
+BINS = 2048
+METHODS = ("minmax", "percentile", "mse")
+# Clipping ranges tried by the MSE search, as fractions of the calibrated max
+MSE_STEPS = 100
+MSE_FLOOR = 0.05
+
+# --- Integer Formats ---
+class IntFormat(namedtuple("IntFormat", "name bits signed")):
+    __slots__ = ()
+
+    @property
+    def qmin(self):
+        return -(1 << (self.bits - 1)) if self.signed else 0
+
+    @property
+    def qmax(self):
+        return (1 << (self.bits - 1)) - 1 if self.signed else (1 << self.bits) - 1
+
+    @property
+    def dtype(self):
+        # Storage type; sub-byte formats are held one value per byte
+        return np.dtype(f"{'int' if self.signed else 'uint'}{8 if self.bits <= 8 else 16}")
+
+def get_int_format(fmt):
+    if isinstance(fmt, IntFormat):
+        return fmt
+    match = re.fullmatch(r"(u?)int(\d+)", str(fmt).strip().lower())
+    if not match or not 2 <= int(match.group(2)) <= 16:
+        raise ValueError(f"Unknown integer format: {fmt!r}")
+    return IntFormat(match.group(0), int(match.group(2)), not match.group(1))
+
+def is_int_format(fmt):
+    try:
+        get_int_format(fmt)
+    except ValueError:
+        return False
+    return True
+
+# --- Chunks ---
+def iter_rows(x, axis=None, chunk=CHUNK):
+    # (rows, channels) float64 blocks; one channel per tensor, or the channel axis last
+    x = np.asarray(x)
+    if axis is None:
+        flat = x.reshape(-1)
+        for pos in range(0, len(flat), chunk):
+            yield flat[pos:pos + chunk].astype(np.float64)[:, None]
+        return
+    moved = np.moveaxis(x, axis, -1)
+    if moved.ndim == 1:
+        moved = moved[None, :]
+    per_row = max(1, moved[0].size)
+    step = max(1, chunk // per_row)
+    for pos in range(0, len(moved), step):
+        yield moved[pos:pos + step].reshape(-1, moved.shape[-1]).astype(np.float64)
+
+def dump_values(path, fmt, channels=None):
+    # Values of a raw little-endian dump: native formats stay memory-mapped, others are decoded
+    fmt = ff.get_format(fmt)
+    bits = open_dump(path, fmt, 0, os.path.getsize(path) // np.dtype(fmt.uint_name).itemsize)
+    values = bits.view(f"<f{fmt.total_bits // 8}") if ff.is_native(fmt) else ff.decode(np.asarray(bits), fmt)
+    if channels is None:
+        return values
+    if len(values) % channels:
+        raise ValueError(f"{len(values)} values do not split into rows of {channels} channels.")
+    return values.reshape(-1, channels)
+
+def channel_shape(x, axis):
+    # Broadcastable shape of per-channel parameters against x
+    x = np.asarray(x)
+    if axis is None:
+        return ()
+    shape = [1] * x.ndim
+    shape[axis] = x.shape[axis]
+    return tuple(shape)
+
+# --- Calibration ---
+class Calibrator:
+    # Streams chunks twice at most: once for the per-channel range, and for
+    # percentile / MSE once more into a fixed-bin histogram per channel.
+    # Symmetric schemes calibrate |x| over [0, max|x|].
+    def __init__(self, qfmt, method="minmax", symmetric=False, percentile=99.99, bins=BINS):
+        if method not in METHODS:
+            raise ValueError(f"Unknown calibration method: {method!r}")
+        self.qfmt = get_int_format(qfmt)
+        self.method, self.symmetric, self.percentile, self.bins = method, symmetric, percentile, bins
+        self.lo = self.hi = self.hist = None
+
+    @property
+    def needs_histogram(self):
+        return self.method != "minmax"
+
+    def prepare(self, rows):
+        rows = np.where(np.isfinite(rows), rows, np.nan)
+        return np.abs(rows) if self.symmetric else rows
+
+    def observe_range(self, rows):
+        rows = self.prepare(rows)
+        with np.errstate(invalid="ignore"):
+            lo, hi = np.fmin.reduce(rows, axis=0), np.fmax.reduce(rows, axis=0)
+        self.lo = lo if self.lo is None else np.fmin(self.lo, lo)
+        self.hi = hi if self.hi is None else np.fmax(self.hi, hi)
+
+    def observe_histogram(self, rows):
+        rows = self.prepare(rows)
+        lo, hi = self.range()
+        channels = rows.shape[1]
+        width = np.where(hi > lo, hi - lo, 1.0)
+        idx = np.clip(np.floor((rows - lo) / width * self.bins), 0, self.bins - 1)
+        ok = ~np.isnan(idx)
+        flat = (idx[ok].astype(np.int64) + np.nonzero(ok)[1] * self.bins)
+        counts = np.bincount(flat, minlength=channels * self.bins).reshape(channels, self.bins)
+        self.hist = counts if self.hist is None else self.hist + counts
+
+    def range(self):
+        # Observed range per channel, widened to contain zero (zero must be exact)
+        lo, hi = np.nan_to_num(self.lo), np.nan_to_num(self.hi)
+        return np.minimum(lo, 0.0), np.maximum(hi, 0.0)
+
+    def clip_range(self):
+        lo, hi = self.range()
+        if self.method == "minmax":
+            return lo, hi
+        edges = lo[:, None] + (hi - lo)[:, None] * np.arange(self.bins + 1) / self.bins
+        if self.method == "percentile":
+            return self.percentile_range(edges)
+        return self.mse_range(edges)
+
+    def percentile_range(self, edges):
+        cum = np.cumsum(self.hist, axis=1)
+        total = np.maximum(cum[:, -1:], 1)
+        tail = (100.0 - self.percentile) / 100.0 * (1 if self.symmetric else 0.5)
+        rows = np.arange(len(edges))
+        upper = edges[rows, np.argmax(cum >= (1 - tail) * total, axis=1) + 1]
+        lower = edges[rows, np.argmax(cum > tail * total, axis=1)]
+        return np.minimum(self.range()[0] if self.symmetric else lower, 0.0), np.maximum(upper, 0.0)
+
+    def mse_range(self, edges):
+        # Expected squared error per candidate clip: uniform rounding noise
+        # (scale^2 / 12) inside the range, distance to the clip point outside
+        lo, hi = self.range()
+        centers = (edges[:, :-1] + edges[:, 1:]) / 2
+        best = np.full(len(lo), np.inf)
+        best_lo, best_hi = lo.copy(), hi.copy()
+        for r in np.linspace(MSE_FLOOR, 1.0, MSE_STEPS):
+            c_lo, c_hi = lo * r, hi * r
+            scale, _ = affine_params(c_lo, c_hi, self.qfmt, self.symmetric)
+            inside = scale[:, None] ** 2 / 12
+            outside = np.maximum(centers - c_hi[:, None], 0) ** 2 + np.maximum(c_lo[:, None] - centers, 0) ** 2
+            err = np.sum(self.hist * np.where(outside > 0, outside, inside), axis=1)
+            better = err < best
+            best[better], best_lo[better], best_hi[better] = err[better], c_lo[better], c_hi[better]
+        return best_lo, best_hi
+
+    def params(self):
+        if self.lo is None or self.needs_histogram and self.hist is None:
+            raise ValueError("Nothing has been observed.")
+        return affine_params(*self.clip_range(), self.qfmt, self.symmetric)
+
+def affine_params(lo, hi, qfmt, symmetric=False):
+    # (scale, zero_point) mapping [lo, hi] onto [qmin, qmax]; zero is always exactly representable
+    qfmt = get_int_format(qfmt)
+    lo, hi = np.minimum(lo, 0.0), np.maximum(hi, 0.0)
+    if symmetric:
+        bound = np.maximum(-lo, hi)
+        half = qfmt.qmax if qfmt.signed else (qfmt.qmax - qfmt.qmin) // 2
+        scale = bound / half
+        zero_point = np.full(np.shape(scale), 0 if qfmt.signed else (qfmt.qmax + 1) // 2, dtype=np.int64)
+    else:
+        scale = (hi - lo) / (qfmt.qmax - qfmt.qmin)
+        safe = np.where(scale > 0, scale, 1.0)
+        zero_point = np.clip(np.round(qfmt.qmin - lo / safe), qfmt.qmin, qfmt.qmax).astype(np.int64)
+    return np.where(scale > 0, scale, 1.0), zero_point
+
+def calibrate(x, qfmt, method="minmax", axis=None, symmetric=False, percentile=99.99, chunk=CHUNK):
+    # x is an array (or memmap); per-channel params come back broadcastable against it
+    cal = Calibrator(qfmt, method, symmetric, percentile)
+    for rows in iter_rows(x, axis, chunk):
+        cal.observe_range(rows)
+    if cal.needs_histogram:
+        for rows in iter_rows(x, axis, chunk):
+            cal.observe_histogram(rows)
+    scale, zero_point = cal.params()
+    shape = channel_shape(x, axis)
+    return scale.reshape(shape), zero_point.reshape(shape)
+
+# --- Quantize / Dequantize ---
+def quantize(x, scale, zero_point, qfmt):
+    # Round half to even, saturate; NaN maps to the zero point
+    qfmt = get_int_format(qfmt)
+    with np.errstate(invalid="ignore", over="ignore"):
+        q = np.rint(np.asarray(x, dtype=np.float64) / scale) + zero_point
+    q = np.clip(np.where(np.isnan(q), zero_point, q), qfmt.qmin, qfmt.qmax)
+    return q.astype(qfmt.dtype)
+
+def dequantize(q, scale, zero_point):
+    return (np.asarray(q, dtype=np.float64) - zero_point) * scale
+
+def quantize_stream(x, scale, zero_point, qfmt, axis=None, chunk=CHUNK):
+    # Flat quantized blocks in iter_rows order (channel axis last)
+    scale, zero_point = np.reshape(scale, -1), np.reshape(zero_point, -1)
+    for rows in iter_rows(x, axis, chunk):
+        yield quantize(rows, scale, zero_point, qfmt).reshape(-1)
+
+def pack_int4(q):
+    # Two 4-bit values per byte, the first in the low nibble
+    q = np.asarray(q).reshape(-1).astype(np.uint8) & 0xF
+    if len(q) % 2:
+        q = np.append(q, np.uint8(0))
+    return q[0::2] | (q[1::2] << 4)
+
+# --- Error Reports ---
+class ErrorStats:
+    # Streaming error accumulator shared by float formats and integer schemes,
+    # so that reports of both line up column for column
+    def __init__(self, name):
+        self.name = name
+        self.count = self.nonfinite = self.clipped = 0
+        self.sum_sq = self.sum_abs = self.signal = 0.0
+        self.max_abs = self.max_rel = 0.0
+
+    def update(self, x, y, clipped):
+        x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+        ok = np.isfinite(x)
+        self.nonfinite += int(np.count_nonzero(~ok))
+        x, y, clipped = x[ok], y[ok], clipped[ok]
+        with np.errstate(invalid="ignore", over="ignore"):
+            err = np.abs(y - x)
+            rel = np.where(x != 0, err / np.abs(x), np.where(err == 0, 0.0, np.inf))
+        self.count += len(x)
+        self.clipped += int(np.count_nonzero(clipped))
+        self.sum_sq += float(np.sum(err ** 2))
+        self.sum_abs += float(np.sum(err))
+        self.signal += float(np.sum(x ** 2))
+        if len(x):
+            self.max_abs = max(self.max_abs, float(err.max()))
+            self.max_rel = max(self.max_rel, float(rel.max()))
+
+    def report(self):
+        n = max(self.count, 1)
+        with np.errstate(divide="ignore"):
+            sqnr = float(10 * np.log10(self.signal / self.sum_sq)) if self.sum_sq else float("inf")
+        return {"target": self.name, "count": self.count, "nonfinite": self.nonfinite, "clipped": self.clipped,
+                "rmse": (self.sum_sq / n) ** 0.5, "mean_abs": self.sum_abs / n, "max_abs": self.max_abs,
+                "max_rel": self.max_rel, "sqnr_db": sqnr}
+
+def float_roundtrip(x, fmt, rounding="rne"):
+    # (reconstruction, clipped) of a float-format conversion
+    fmt = ff.get_format(fmt)
+    y = ff.decode(ff.encode(x, fmt, rounding), fmt)
+    top, below = ff.decode(np.array([fmt.max_mag, fmt.max_mag - 1], dtype=fmt.uint_name), fmt)
+    # Beyond half an ULP past the largest finite value, like the integer schemes
+    return y, np.isfinite(x) & (np.abs(x) > top + (top - below) / 2)
+
+def int_roundtrip(x, scale, zero_point, qfmt):
+    qfmt = get_int_format(qfmt)
+    q = quantize(x, scale, zero_point, qfmt)
+    lo, hi = dequantize(qfmt.qmin, scale, zero_point), dequantize(qfmt.qmax, scale, zero_point)
+    return dequantize(q, scale, zero_point), (x < lo - scale / 2) | (x > hi + scale / 2)
+
+def compare(x, targets, axis=None, rounding="rne", chunk=CHUNK):
+    # targets: float format names, or (name, scale, zero_point, qfmt) integer schemes from calibrate()
+    x = np.asarray(x)
+    stats = []
+    for target in targets:
+        if isinstance(target, (str, ff.FloatFormat)):
+            name = ff.get_format(target).name
+            step = lambda rows: float_roundtrip(rows, target, rounding)
+        else:
+            name, scale, zero_point, qfmt = target
+            scale, zero_point = np.reshape(scale, -1), np.reshape(zero_point, -1)
+            step = lambda rows: int_roundtrip(rows, scale, zero_point, qfmt)
+        s = ErrorStats(name)
+        for rows in iter_rows(x, axis, chunk):
+            y, clipped = step(rows)
+            s.update(rows, y, clipped)
+        stats.append(s.report())
+    return stats
+
+def scheme_name(qfmt, method, axis, symmetric):
+    return f"{get_int_format(qfmt).name} {method} {'per-channel' if axis is not None else 'per-tensor'}" \
+           f"{' symmetric' if symmetric else ''}"
+
+def format_reports(reports):
+    lines = [f"{'Target':<36} {'RMSE':>11} {'Mean |err|':>11} {'Max |err|':>11} {'Max rel':>10} {'SQNR dB':>8} {'Clipped':>9}"]
+    for r in reports:
+        lines.append(f"{r['target']:<36} {r['rmse']:>11.4g} {r['mean_abs']:>11.4g} {r['max_abs']:>11.4g} "
+                     f"{r['max_rel']:>10.3g} {r['sqnr_db']:>8.2f} {r['clipped']:>9}")
+    return "\n".join(lines)
@@ -0,0 +1,204 @@
+# Coverage-directed operand sampler over (class pair, exponent difference) bins
+import numpy as np
+import float_formats as ff
+
+CLASSES = ff.CLASSES
+ZERO, SUBNORMAL, NORMAL, SPECIAL = range(len(CLASSES))
+
+# Exponent-difference bucket edges; p is the significand precision, so the
+# last buckets straddle the point where the smaller operand stops mattering.
+def bucket_edges(fmt):
+    p = fmt.man_bits + 1
+    return sorted({0, 1, 2, 4, p, p + 2})
+
+def bucket_labels(fmt):
+    edges = bucket_edges(fmt)
+    labels = [str(lo) if hi - lo == 1 else f"{lo}-{hi - 1}" for lo, hi in zip(edges, edges[1:])]
+    return labels + [f">={edges[-1]}"]
+
+# Normal pairs with both operands in the top two binades, where sums and
+# products overflow; they get their own bin, weighted under this name
+NEAR_OVERFLOW = "near overflow"
+NEAR_OVERFLOW_BINADES = 2
+
+# --- Per-Class Field Ranges ---
+def exponent_range(fmt, cls):
+    # Effective exponent field (subnormals count as 1) of each finite class
+    top = (1 << fmt.exp_bits) - 1
+    if cls == SUBNORMAL:
+        return (1, 1) if fmt.subnormals and fmt.man_bits else None
+    if cls == NORMAL:
+        hi = top - 1 if fmt.inf or (fmt.nan and fmt.man_bits == 0) else top
+        return (1, hi) if hi >= 1 else None
+    return None
+
+def class_feasible(fmt, cls):
+    if cls == SPECIAL:
+        return fmt.inf or fmt.nan
+    if cls == ZERO:
+        return True
+    return exponent_range(fmt, cls) is not None
+
+def build_magnitudes(fmt, cls, e, rng):
+    # e is the exponent field for NORMAL and ignored otherwise
+    n = len(e)
+    M = fmt.man_bits
+    top = (1 << fmt.exp_bits) - 1
+    if cls == ZERO:
+        e = np.zeros(n, dtype=np.uint64)
+        m = np.zeros(n, dtype=np.uint64) if fmt.subnormals else rng.integers(0, 1 << M, size=n, dtype=np.uint64)
+    elif cls == SUBNORMAL:
+        e = np.zeros(n, dtype=np.uint64)
+        m = rng.integers(1, 1 << M, size=n, dtype=np.uint64)
+    elif cls == NORMAL:
+        e = e.astype(np.uint64)
+        m = rng.integers(0, 1 << M, size=n, dtype=np.uint64)
+        if not fmt.inf and fmt.nan:
+            # E4M3FN style: the all-ones pattern is NaN, so the top binade stops one short
+            m = np.where(e == top, rng.integers(0, max((1 << M) - 1, 1), size=n, dtype=np.uint64), m)
+    else:
+        e = np.full(n, top, dtype=np.uint64)
+        if fmt.inf:
+            # Infinity and every NaN payload, signaling and quiet
+            m = rng.integers(0, 1 << M, size=n, dtype=np.uint64)
+        else:
+            m = np.full(n, (1 << M) - 1, dtype=np.uint64)
+    return (e << np.uint64(M)) | m
+
+# --- Bins ---
+def pair_exponents(range_a, range_b, lo, hi, n, rng):
+    # Uniform over every (ea, eb) in the ranges with lo <= |ea - eb| <= hi
+    (la, ha), (lb, hb) = range_a, range_b
+    d = np.arange(lo, hi + 1)
+    t = np.unique(np.concatenate([-d, d]))
+    start = np.maximum(la, lb - t)
+    count = np.maximum(0, np.minimum(ha, hb - t) - start + 1)
+    total = int(count.sum())
+    if total == 0 or n == 0:
+        return None if total == 0 else (np.empty(0, np.int64), np.empty(0, np.int64))
+    cum = np.cumsum(count)
+    u = rng.integers(0, total, size=n)
+    k = np.searchsorted(cum, u, side="right")
+    ea = start[k] + (u - (cum[k] - count[k]))
+    return ea, ea + t[k]
+
+class CoverageSampler:
+    def __init__(self, fmt, pair_weights=None, bucket_weights=None, seed=0):
+        self.fmt = ff.get_format(fmt)
+        self.rng = np.random.default_rng(seed)
+        self.edges = np.array(bucket_edges(self.fmt))
+        labels = bucket_labels(self.fmt)
+        max_diff = (1 << self.fmt.exp_bits) - 1
+        pair_weights = pair_weights or {}
+        bucket_weights = bucket_weights or {}
+
+        # bins: (class_a, class_b, bucket, label, weight); bucket -1 = no exponent relation.
+        # spans: (range_a, range_b, lo, hi) exponent pairs drawn for each bin, None without a relation
+        self.bins, self.spans = [], []
+        self.index = np.full((len(CLASSES), len(CLASSES), len(labels)), -1, dtype=np.int64)
+        for ca in range(len(CLASSES)):
+            for cb in range(len(CLASSES)):
+                if not (class_feasible(self.fmt, ca) and class_feasible(self.fmt, cb)):
+                    continue
+                w = pair_weights.get((CLASSES[ca], CLASSES[cb]), 1.0)
+                if w <= 0:
+                    continue
+                ra, rb = exponent_range(self.fmt, ca), exponent_range(self.fmt, cb)
+                if ra is None or rb is None:
+                    self.index[ca, cb, :] = len(self.bins)
+                    self.bins.append((ca, cb, -1, f"{CLASSES[ca]} × {CLASSES[cb]}", w))
+                    self.spans.append(None)
+                    continue
+                for j, label in enumerate(labels):
+                    lo = int(self.edges[j])
+                    hi = int(self.edges[j + 1]) - 1 if j + 1 < len(self.edges) else max_diff
+                    wb = bucket_weights.get(label, 1.0)
+                    if wb <= 0 or lo > hi or pair_exponents(ra, rb, lo, hi, 0, self.rng) is None:
+                        continue
+                    self.index[ca, cb, j] = len(self.bins)
+                    self.bins.append((ca, cb, j, f"{CLASSES[ca]} × {CLASSES[cb]}, Δe {label}", w * wb))
+                    self.spans.append((ra, rb, lo, hi))
+        # Only when the normal range reaches below the top binades, so the Δe bins stay reachable
+        self.near, normal = None, exponent_range(self.fmt, NORMAL)
+        w = pair_weights.get((CLASSES[NORMAL], CLASSES[NORMAL]), 1.0) * bucket_weights.get(NEAR_OVERFLOW, 1.0)
+        if normal and normal[1] - NEAR_OVERFLOW_BINADES >= normal[0] and w > 0:
+            self.near = len(self.bins)
+            top = (normal[1] - NEAR_OVERFLOW_BINADES + 1, normal[1])
+            self.bins.append((NORMAL, NORMAL, len(labels), f"{CLASSES[NORMAL]} × {CLASSES[NORMAL]}, {NEAR_OVERFLOW}", w))
+            self.spans.append((top, top, 0, NEAR_OVERFLOW_BINADES - 1))
+        self.weights = np.array([b[4] for b in self.bins], dtype=np.float64)
+        self.hits = np.zeros(len(self.bins), dtype=np.int64)
+
+    def bin_of(self, a_bits, b_bits):
+        k = ff.compile_format(self.fmt)
+        _, ea, _ = k.fields(a_bits)
+        _, eb, _ = k.fields(b_bits)
+        diff = np.abs(np.maximum(ea.astype(np.int64), 1) - np.maximum(eb.astype(np.int64), 1))
+        bucket = np.searchsorted(self.edges, diff, side="right") - 1
+        ca, cb = k.classify(a_bits), k.classify(b_bits)
+        ids = self.index[ca, cb, bucket]
+        if self.near is not None:
+            top = self.spans[self.near][0][0]
+            ids = np.where((ca == NORMAL) & (cb == NORMAL) & (ea >= top) & (eb >= top), self.near, ids)
+        return ids
+
+    def update(self, a_bits, b_bits):
+        ids = self.bin_of(a_bits, b_bits)
+        before = np.count_nonzero(self.hits)
+        self.hits += np.bincount(ids[ids >= 0], minlength=len(self.bins))
+        return np.count_nonzero(self.hits) - before
+
+    @property
+    def covered(self):
+        return bool((self.hits > 0).all())
+
+    def sample(self, n):
+        # Exactly n pairs: one draw is reserved for each bin not yet hit (a random
+        # subset when there are more of those than n), the rest go by weight
+        missing = np.flatnonzero(self.hits == 0)
+        if len(missing) > n:
+            missing = self.rng.choice(missing, size=n, replace=False)
+        counts = self.rng.multinomial(n - len(missing), self.weights / self.weights.sum())
+        counts[missing] += 1
+        uint = np.dtype(self.fmt.uint_name)
+        sign_shift = np.uint64(self.fmt.exp_bits + self.fmt.man_bits)
+        a_parts, b_parts = [], []
+        for (ca, cb, _, _, _), span, c in zip(self.bins, self.spans, counts):
+            if not c:
+                continue
+            if span is None:
+                ea = eb = np.full(c, 1, dtype=np.int64)
+                ra, rb = exponent_range(self.fmt, ca), exponent_range(self.fmt, cb)
+                if ra:
+                    ea = self.rng.integers(ra[0], ra[1] + 1, size=c)
+                if rb:
+                    eb = self.rng.integers(rb[0], rb[1] + 1, size=c)
+            else:
+                ea, eb = pair_exponents(*span, c, self.rng)
+            a = build_magnitudes(self.fmt, ca, ea, self.rng) | (self.rng.integers(0, 2, size=c, dtype=np.uint64) << sign_shift)
+            b = build_magnitudes(self.fmt, cb, eb, self.rng) | (self.rng.integers(0, 2, size=c, dtype=np.uint64) << sign_shift)
+            a_parts.append(a)
+            b_parts.append(b)
+        order = self.rng.permutation(n)
+        a_bits = np.concatenate(a_parts or [np.empty(0, np.uint64)])[order].astype(uint)
+        b_bits = np.concatenate(b_parts or [np.empty(0, np.uint64)])[order].astype(uint)
+        self.update(a_bits, b_bits)
+        return a_bits, b_bits
+
+    def sample_until_covered(self, batch=4096, max_batches=1000):
+        for _ in range(max_batches):
+            yield self.sample(batch)
+            if self.covered:
+                return
+
+    def report(self):
+        return [{"bin": label, "weight": w, "hits": int(h)} for (_, _, _, label, w), h in zip(self.bins, self.hits)]
+
+def format_report(sampler):
+    rows = sampler.report()
+    width = max(len(r["bin"]) for r in rows)
+    lines = [f"Format   : {sampler.fmt.name}",
+             f"Covered  : {int(np.count_nonzero(sampler.hits))} of {len(rows)} bins", "",
+             f"{'Bin':<{width}}  {'Weight':>8}  {'Hits':>10}"]
+    lines += [f"{r['bin']:<{width}}  {r['weight']:>8g}  {r['hits']:>10}" for r in rows]
+    return "\n".join(lines)
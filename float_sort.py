@@ -0,0 +1,126 @@
+# IEEE totalOrder sort keys, LSD radix sort and unique / count over float bit arrays
+import os
+
+import numpy as np
+import float_formats as ff
+from float_diff import open_dump
+
+# Formats up to this width sort by counting into one bin per bit pattern
+COUNTING_BITS = 16
+DIGIT_BITS = 16
+CHUNK = 1 << 22
+
+# --- Keys ---
+# totalOrder: -NaN < -Inf < ... < -0 < +0 < ... < +Inf < +NaN, NaNs by
+# payload. Flipping every bit of negatives and only the sign bit of
+# positives makes that the unsigned integer order of the keys.
+def flip_mask(fmt, negative):
+    # All ones where negative is 1, the sign bit alone where it is 0
+    uint = np.dtype(fmt.uint_name).type
+    mask, sign = uint((1 << fmt.total_bits) - 1), uint(1 << (fmt.total_bits - 1))
+    return (negative * mask) | sign
+
+def total_order_key(bits, fmt):
+    fmt = ff.get_format(fmt)
+    bits = np.asarray(bits).astype(fmt.uint_name)
+    return bits ^ flip_mask(fmt, bits >> (fmt.total_bits - 1))
+
+def from_key(keys, fmt):
+    fmt = ff.get_format(fmt)
+    keys = np.asarray(keys).astype(fmt.uint_name)
+    return keys ^ flip_mask(fmt, (keys >> (fmt.total_bits - 1)) ^ 1)
+
+# --- Sorting ---
+def radix_argsort(keys, bits=None, digit_bits=DIGIT_BITS):
+    # Stable LSD radix sort of unsigned keys, one pass per digit. numpy's stable
+    # sort of 16-bit digits is itself a counting sort, so every pass is O(n).
+    # Digits that are the same for every key are skipped.
+    keys = np.asarray(keys)
+    bits = bits or keys.dtype.itemsize * 8
+    if bits <= digit_bits:
+        return np.argsort(keys, kind="stable")
+    wide, digit = keys.astype(np.uint64), np.uint64((1 << digit_bits) - 1)
+    order = None
+    for shift in range(0, bits, digit_bits):
+        digits = ((wide >> np.uint64(shift)) & digit).astype(np.uint16)
+        if len(digits) and digits.min() == digits.max():
+            continue
+        digits = digits if order is None else digits[order]
+        step = np.argsort(digits, kind="stable")
+        order = step if order is None else order[step]
+    return np.arange(len(keys)) if order is None else order
+
+def argsort_bits(bits, fmt):
+    # Stable indices that put bits in totalOrder
+    fmt = ff.get_format(fmt)
+    return radix_argsort(total_order_key(bits, fmt), fmt.total_bits)
+
+def key_histogram(keys, fmt):
+    return np.bincount(np.asarray(keys).astype(np.intp), minlength=1 << ff.get_format(fmt).total_bits)
+
+def sort_bits(bits, fmt):
+    # Values only: narrow formats by a counting sort over every bit pattern. Equal
+    # keys are equal bits, so wider ones need no stable sort and take numpy's.
+    fmt = ff.get_format(fmt)
+    keys = total_order_key(bits, fmt)
+    if fmt.total_bits <= COUNTING_BITS:
+        counts = key_histogram(keys, fmt)
+        return from_key(np.repeat(np.arange(len(counts), dtype=fmt.uint_name), counts), fmt)
+    return from_key(np.sort(keys), fmt)
+
+def unique_counts(bits, fmt):
+    # Distinct bit patterns in totalOrder with their counts; -0 / +0 and NaN payloads stay distinct
+    fmt = ff.get_format(fmt)
+    keys = total_order_key(bits, fmt)
+    if fmt.total_bits <= COUNTING_BITS:
+        counts = key_histogram(keys, fmt)
+        present = np.flatnonzero(counts)
+        return from_key(present.astype(fmt.uint_name), fmt), counts[present]
+    keys = np.sort(keys)
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]])) if len(keys) else np.zeros(0, dtype=np.intp)
+    return from_key(keys[starts], fmt), np.diff(np.append(starts, len(keys)))
+
+# --- Dumps ---
+def dump_histogram(path, fmt, chunk=CHUNK):
+    # Counts per totalOrder key of a raw dump, chunk by chunk; narrow formats only
+    fmt = ff.get_format(fmt)
+    if fmt.total_bits > COUNTING_BITS:
+        raise ValueError(f"Streaming histograms need a format of {COUNTING_BITS} bits or fewer.")
+    n = os.path.getsize(path) // np.dtype(fmt.uint_name).itemsize
+    counts = np.zeros(1 << fmt.total_bits, dtype=np.int64)
+    for start in range(0, n, chunk):
+        counts += key_histogram(total_order_key(open_dump(path, fmt, start, min(start + chunk, n)), fmt), fmt)
+    return counts
+
+def sort_dump(path, dest, fmt, unique=False, chunk=CHUNK):
+    # Writes the sorted (or deduplicated) dump; returns the number of values written
+    fmt = ff.get_format(fmt)
+    out_type = np.dtype(fmt.uint_name).newbyteorder("<")
+    if fmt.total_bits <= COUNTING_BITS:
+        counts = dump_histogram(path, fmt, chunk)
+        if unique:
+            counts = np.minimum(counts, 1)
+        # Values come back run by run, so memory stays at one chunk of output
+        keys = np.arange(len(counts), dtype=fmt.uint_name)
+        ends = np.cumsum(counts)
+        with open(dest, "wb") as f:
+            for start in range(0, int(ends[-1]), chunk):
+                stop = min(start + chunk, int(ends[-1]))
+                lo, hi = np.searchsorted(ends, [start, stop - 1], side="right")
+                run = np.minimum(ends[lo:hi + 1], stop) - np.maximum(ends[lo:hi + 1] - counts[lo:hi + 1], start)
+                f.write(from_key(np.repeat(keys[lo:hi + 1], run), fmt).astype(out_type).tobytes())
+        return int(ends[-1])
+    bits = np.asarray(open_dump(path, fmt, 0, os.path.getsize(path) // out_type.itemsize))
+    out = unique_counts(bits, fmt)[0] if unique else sort_bits(bits, fmt)
+    out.astype(out_type).tofile(dest)
+    return len(out)
+
+def format_counts(values, counts, fmt, top=20):
+    fmt = ff.get_format(fmt)
+    digits = -(-fmt.total_bits // 4)
+    decoded = ff.decode(values, fmt)
+    lines = [f"Values   : {int(counts.sum())}", f"Distinct : {len(values)}", "",
+             f"{'Bits':>{digits + 2}}  {'Value':>14}  {'Count':>12}"]
+    for i in np.argsort(-counts, kind="stable")[:top]:
+        lines.append(f"0x{int(values[i]):0{digits}x}  {decoded[i]:>14.6g}  {counts[i]:>12}")
+    return "\n".join(lines)
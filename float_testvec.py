@@ -0,0 +1,117 @@
+# Deterministic, streaming test-vector generator for floating-point RTL verification
+import os
+from multiprocessing import Pool
+
+import numpy as np
+import float_formats as ff
+from float_batch import hex_strings
+from float_sampler import CoverageSampler
+
+OPS = ff.BINARY_OPS + ff.UNARY_OPS
+ROUNDINGS = list(ff.ROUNDING_MODES)
+
+MAGIC = b"FPTV"
+VERSION = 1
+HEADER = np.dtype([("magic", "S4"), ("version", "u1"), ("total_bits", "u1"), ("exp_bits", "u1"), ("man_bits", "u1"),
+                   ("format", "S24"), ("seed", "<u8"), ("shard", "<u4"), ("chunk", "<u4"), ("count", "<u8")])
+
+def record_dtype(fmt):
+    uint = "<" + np.dtype(fmt.uint_name).str[1:]
+    return np.dtype([("op", "u1"), ("rounding", "u1"), ("flags", "u1"), ("pad", "u1"),
+                     ("a", uint), ("b", uint), ("result", uint)])
+
+# --- Generation ---
+# Every chunk draws from its own stream keyed on (seed, shard, chunk index), so
+# output depends only on those and the chunk size, never on the worker count.
+def generate_chunk(job):
+    fmt, ops, roundings, seed, shard, index, n, directed = job
+    rng = np.random.default_rng([seed, shard, index])
+    out = np.zeros(n, dtype=record_dtype(fmt))
+    out["op"] = rng.choice([OPS.index(op) for op in ops], size=n)
+    out["rounding"] = rng.choice([ROUNDINGS.index(r) for r in roundings], size=n)
+    if directed:
+        out["a"], out["b"] = CoverageSampler(fmt, seed=rng).sample(n)
+    else:
+        out["a"] = rng.integers(0, 1 << fmt.total_bits, size=n, dtype=np.uint64)
+        out["b"] = rng.integers(0, 1 << fmt.total_bits, size=n, dtype=np.uint64)
+    for op in ops:
+        op_code = OPS.index(op)
+        if op in ff.UNARY_OPS:
+            out["b"][out["op"] == op_code] = 0
+        for rounding in roundings:
+            idx = np.flatnonzero((out["op"] == op_code) & (out["rounding"] == ROUNDINGS.index(rounding)))
+            if not len(idx):
+                continue
+            b = out["b"][idx] if op in ff.BINARY_OPS else None
+            bits, flags = ff.apply_op(op, out["a"][idx], b, fmt, rounding, with_flags=True)
+            out["result"][idx] = bits
+            out["flags"][idx] = flags
+    return out
+
+def iter_chunks(fmt, count, ops=None, roundings=None, seed=0, shard=0, chunk=1 << 16, workers=None, directed=False):
+    fmt = ff.get_format(fmt)
+    ops = list(ops or OPS)
+    roundings = list(roundings or ROUNDINGS)
+    for name in ops:
+        if name not in OPS:
+            raise ValueError(f"Unknown operation: {name!r}")
+    for name in roundings:
+        if name not in ROUNDINGS:
+            raise ValueError(f"Unknown rounding mode: {name!r}")
+    jobs = [(fmt, ops, roundings, seed, shard, i, min(chunk, count - start), directed)
+            for i, start in enumerate(range(0, count, chunk))]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        yield from map(generate_chunk, jobs)
+        return
+    # At most two windows of chunks are in memory at once
+    with Pool(workers) as pool:
+        for start in range(0, len(jobs), 2 * workers):
+            yield from pool.imap(generate_chunk, jobs[start:start + 2 * workers])
+
+# --- Writers ---
+def flag_strings(flags):
+    return np.array([f"{i:02x}" for i in range(32)])[flags.astype(np.intp)]
+
+def format_hex(records, fmt):
+    cols = [
+        np.array(OPS)[records["op"]],
+        np.array(ROUNDINGS)[records["rounding"]],
+        hex_strings(records["a"], fmt.total_bits, ""),
+        hex_strings(records["b"], fmt.total_bits, ""),
+        hex_strings(records["result"], fmt.total_bits, ""),
+        flag_strings(records["flags"]),
+    ]
+    line = cols[0]
+    for col in cols[1:]:
+        line = np.char.add(np.char.add(line, " "), col)
+    return "\n".join(line.tolist()) + "\n"
+
+def write_vectors(path, fmt, count, ops=None, roundings=None, seed=0, shard=0, chunk=1 << 16, workers=None, binary=False,
+                  directed=False):
+    fmt = ff.get_format(fmt)
+    chunks = iter_chunks(fmt, count, ops, roundings, seed, shard, chunk, workers, directed)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        if binary:
+            header = np.array([(MAGIC, VERSION, fmt.total_bits, fmt.exp_bits, fmt.man_bits, fmt.name.encode(),
+                                seed, shard, chunk, count)], dtype=HEADER)
+            f.write(header.tobytes())
+            for records in chunks:
+                f.write(records.tobytes())
+        else:
+            f.write((f"// {fmt.name} E{fmt.exp_bits}M{fmt.man_bits} bias {fmt.bias} seed {seed} shard {shard} "
+                     f"chunk {chunk} count {count}\n"
+                     f"// op rounding a b result flags ({', '.join(f'{v:02x}={k}' for v, k in ff.FLAG_NAMES.items())})\n").encode())
+            for records in chunks:
+                f.write(format_hex(records, fmt).encode())
+    os.replace(tmp, path)
+
+# --- Readers ---
+def read_binary(path):
+    header = np.fromfile(path, dtype=HEADER, count=1)[0]
+    if header["magic"] != MAGIC or header["version"] != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} test-vector file.")
+    fmt = ff.get_format(header["format"].decode())
+    records = np.memmap(path, dtype=record_dtype(fmt), mode="r", offset=HEADER.itemsize, shape=(int(header["count"]),))
+    return header, records
@@ -0,0 +1,51 @@
+# Complete 256 x 256 binary-operation tables for 8-bit formats (E4M3, E5M2, custom ExMy)
+import functools
+import os
+
+import numpy as np
+import float_formats as ff
+from float_cache import CACHE_DIR
+
+TABLE_VERSION = 1
+
+# --- Table Generation ---
+def build_table(op, fmt="e4m3", rounding="rne"):
+    fmt = ff.get_format(fmt)
+    if fmt.total_bits > 8:
+        raise ValueError("Operation tables cover formats of 8 bits or fewer.")
+    if op not in ff.BINARY_OPS:
+        raise ValueError(f"Unknown operation: {op!r}")
+    n = 1 << fmt.total_bits
+    a, b = np.meshgrid(np.arange(n, dtype=np.uint8), np.arange(n, dtype=np.uint8), indexing="ij")
+    # Row = first operand, column = second operand
+    return ff.apply_op(op, a.ravel(), b.ravel(), fmt, rounding).reshape(n, n)
+
+def table_path(op, fmt, rounding):
+    return os.path.join(CACHE_DIR, f"{op}_{fmt.name}_{rounding}_v{TABLE_VERSION}_k{ff.KERNEL_REVISION}.npy")
+
+@functools.lru_cache(maxsize=None)
+def get_table(op, fmt="e4m3", rounding="rne"):
+    fmt = ff.get_format(fmt)
+    path = table_path(op, fmt, rounding)
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+    table = build_table(op, fmt, rounding)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp, path)
+    return table
+
+def build_all(fmt="e4m3"):
+    for rounding in ff.ROUNDING_MODES:
+        for op in ff.BINARY_OPS:
+            get_table(op, fmt, rounding)
+
+# --- Evaluation ---
+def apply_op(op, a_bits, b_bits, fmt="e4m3", rounding="rne"):
+    table = get_table(op, fmt, rounding)
+    return table[np.asarray(a_bits).astype(np.intp), np.asarray(b_bits).astype(np.intp)]
+
+def apply_values(op, a, b, fmt="e4m3", rounding="rne"):
+    return ff.decode(apply_op(op, ff.encode(a, fmt, rounding), ff.encode(b, fmt, rounding), fmt, rounding), fmt)
@@ -0,0 +1,65 @@
+# Result cache on a scratch database: 64-bit keys, batched recency, eviction
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import float_cache as fc  # noqa: E402
+import float_formats as ff  # noqa: E402
+
+F64 = ff.FORMATS["float64"]
+KEYS = [0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1, 0x7FF8000000000000, 0xFFF0000000000000]
+
+@pytest.fixture
+def cache(tmp_path):
+    return fc.ResultCache(str(tmp_path / "cache.sqlite"), max_entries=100)
+
+def used(cache):
+    db = sqlite3.connect(cache.path)
+    try:
+        return {fc.from_sql(a): u for a, u in db.execute("SELECT a, used FROM results")}
+    finally:
+        db.close()
+
+def test_sql_keys_round_trip():
+    for k in KEYS:
+        assert -(1 << 63) <= fc.to_sql(k) < 1 << 63
+        assert fc.from_sql(fc.to_sql(k)) == k
+
+def test_put_get_unsigned_64(cache):
+    cache.put_many(F64, "add", "rne", [(k, (1 << 64) - 1 - k, k ^ 1) for k in KEYS])
+    for k in KEYS:
+        assert cache.get(F64, "add", "rne", k, (1 << 64) - 1 - k) == k ^ 1
+    assert cache.get(F64, "add", "rtz", KEYS[3], (1 << 64) - 1 - KEYS[3]) is None
+    found = cache.get_many(F64, "add", "rne", [(k, (1 << 64) - 1 - k) for k in KEYS] + [(5, 5)])
+    assert found == {(k, (1 << 64) - 1 - k): k ^ 1 for k in KEYS}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2 * len(KEYS), 2)
+
+def test_touches_are_batched(cache):
+    cache.put_many(F64, "mul", "rne", [(i, i, i) for i in range(10)])
+    before = used(cache)
+    time.sleep(0.01)
+    assert cache.get(F64, "mul", "rne", 3, 3) == 3
+    cache.get_many(F64, "mul", "rne", [(7, 7)])
+    # Hits only update memory until the next flush
+    assert used(cache) == before
+    cache.flush()
+    after = used(cache)
+    assert sorted(a for a in after if after[a] != before[a]) == [3, 7]
+
+def test_eviction_keeps_recent_hits(cache):
+    cache.put_many(F64, "sub", "rne", [(i, 0, i) for i in range(60)])
+    time.sleep(0.01)
+    for i in range(10):
+        cache.get(F64, "sub", "rne", i, 0)
+    time.sleep(0.01)
+    cache.put_many(F64, "sub", "rne", [(i, 0, i) for i in range(100, 150)])
+    # 110 rows over a bound of 100: trimmed to 90, oldest use first, the pending hits counted
+    assert cache.evict() == 20
+    left = set(used(cache))
+    assert set(range(10)) <= left and not left & set(range(10, 30))
+    assert cache.stats()["evictions"] == 20
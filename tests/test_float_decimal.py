@@ -0,0 +1,88 @@
+# Correctly rounded decimal parsing against an exact Fraction reference
+import random
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import float_arrow  # noqa: E402
+import float_batch  # noqa: E402
+import float_formats as ff  # noqa: E402
+from float_decimal import parse_decimal  # noqa: E402
+
+def exact_decimal(q):
+    # Exact decimal string of a binary fraction: n / 2^k == n * 5^k * 10^-k
+    k = q.denominator.bit_length() - 1
+    return f"{q.numerator * 5 ** k}e-{k}"
+
+def reference(token, fmt, rounding):
+    t = token.strip()
+    return ff.encode_fraction(Fraction(t), fmt, rounding, negative=t.startswith("-"))
+
+def boundary_tokens(fmt, rng, n):
+    # Midpoints between neighbours, nudged either way in the 30th digit, and the
+    # same points cut to 15 and 3 significant digits (the two_prod fast path)
+    k = ff.compile_format(fmt)
+    limit = fmt.max_mag
+    below = Fraction(float(k.decode(np.array([limit - 1], dtype=fmt.uint_name))[0]))
+    high = Fraction(float(k.decode(np.array([limit], dtype=fmt.uint_name))[0]))
+    pairs = [(high, 2 * high - below)]  # the overflow boundary
+    for b in rng.sample(range(limit), min(n, limit)):
+        lo, hi = k.decode(np.array([b, b + 1], dtype=fmt.uint_name))
+        if np.isfinite(hi):
+            pairs.append((Fraction(float(lo)), Fraction(float(hi))))
+    out = []
+    for lo, hi in pairs:
+        mid = (lo + hi) / 2
+        digits, _, k10 = exact_decimal(mid).partition("e-")
+        out += [exact_decimal(mid), f"{digits}{'0' * 30}1e-{int(k10) + 30}", f"{int(digits) * 10 ** 30 - 1}e-{int(k10) + 30}"]
+        if mid < Fraction(np.finfo(np.float64).max):
+            out += [f"{float(mid):.14e}", f"{float(mid):.2e}"]
+    return out + ["-" + t for t in out]
+
+@pytest.mark.parametrize("fmt", ["float16", "bfloat16", "e4m3", "e5m2", "float32", "float64"])
+@pytest.mark.parametrize("rounding", list(ff.ROUNDING_MODES))
+def test_boundaries(fmt, rounding):
+    fmt = ff.get_format(fmt)
+    tokens = boundary_tokens(fmt, random.Random(f"{fmt.name}-{rounding}"), 150)
+    bits, valid = parse_decimal(tokens, fmt, rounding)
+    assert valid.all()
+    for t, b in zip(tokens, bits):
+        assert int(b) == reference(t, fmt, rounding), f"{fmt.name} {t} {rounding}"
+
+@pytest.mark.parametrize("rounding", list(ff.ROUNDING_MODES))
+def test_specials_and_validity(rounding):
+    fmt = ff.FORMATS["float32"]
+    k = ff.compile_format(fmt)
+    tokens = ["nan", "-inf", "Infinity", "+inf", " 1.5 ", "-0", "0e999", "1e-400", "-1e-400", "1e400",
+              "1_000", "", "abc", "1e", "0x10", "1.2.3", "--1", ".5", "5.", "."]
+    bits, valid = parse_decimal(tokens, fmt, rounding)
+    assert valid.tolist() == [True] * 10 + [False] * 7 + [True, True, False]
+    assert np.isnan(k.decode(bits[:1]))[0]
+    assert list(k.decode(bits[1:4])) == [-np.inf, np.inf, np.inf]
+    for t, b in zip(tokens[4:10] + [".5", "5."], list(bits[4:10]) + list(bits[17:19])):
+        assert int(b) == reference(t, fmt, rounding), f"{t} {rounding}"
+
+MIXED = ["1.1", None, "65504", "-2.5", "abc", "0x3c00", float("nan"), "0.1000000000000000055511151231257827021181583404541015625",
+         "3.14159265358979323846264338327950288", "0xfffff"]
+
+def check_mixed(bits, valid, fmt):
+    want_valid = [True, False, True, True, False, True, False, True, True, False]
+    assert valid.tolist() == want_valid
+    for t, b, ok in zip(MIXED, bits, want_valid):
+        if ok:
+            want = int(t, 16) if t.startswith("0x") else reference(t, fmt, "rne")
+            assert int(b) == want, t
+
+def test_parse_column_nulls():
+    fmt = ff.FORMATS["float16"]
+    check_mixed(*float_batch.parse_column(MIXED, fmt), fmt)
+
+def test_array_bits_nulls():
+    pa = pytest.importorskip("pyarrow")
+    fmt = ff.FORMATS["float16"]
+    tokens = [None if isinstance(t, float) else t for t in MIXED]
+    check_mixed(*float_arrow.array_bits(pa.array(tokens), fmt), fmt)
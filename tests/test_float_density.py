@@ -0,0 +1,21 @@
+# ULP spacing against the gap to the next representable value, zero included
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import float_density as fd  # noqa: E402
+import float_formats as ff  # noqa: E402
+
+@pytest.mark.parametrize("fmt", ["float16", "bfloat16", "e4m3", "e5m2", "E5M2FTZ"])
+def test_ulp_at_matches_next_value(fmt):
+    fmt = ff.get_format(fmt)
+    values = ff.decode(np.arange(fmt.max_mag + 1, dtype=fmt.uint_name), fmt)
+    # Distinct values in order; without subnormals the tiny patterns all read as zero
+    values = np.unique(values)
+    gaps = np.diff(values)
+    assert list(fd.ulp_at(values[:-1], fmt)) == list(gaps)
+    assert list(fd.ulp_at(-values[:-1], fmt)) == list(gaps)
+    assert np.isnan(fd.ulp_at(2 * values[-1], fmt))
@@ -0,0 +1,153 @@
+# Correctly rounded arithmetic against an exact Fraction reference
+import math
+import random
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import float_formats as ff  # noqa: E402
+
+F64 = ff.FORMATS["float64"]
+DBL_MAX = np.finfo(np.float64).max
+TINY = 5e-324
+
+def bits64(values):
+    return np.array(values, dtype=np.float64).view(np.uint64)
+
+def exact(op, a, b):
+    if op == "add":
+        return Fraction(a) + Fraction(b)
+    if op == "sub":
+        return Fraction(a) - Fraction(b)
+    if op == "mul":
+        return Fraction(a) * Fraction(b)
+    return Fraction(a) / Fraction(b)
+
+def exact_sqrt_bits(a, fmt, rounding):
+    # Candidates around the float64 root, compared by squaring
+    k = ff.compile_format(fmt)
+    y = math.sqrt(a)
+    below, above = None, None
+    for c in (np.nextafter(np.nextafter(y, 0), 0), np.nextafter(y, 0), y, np.nextafter(y, np.inf),
+              np.nextafter(np.nextafter(y, np.inf), np.inf)):
+        sq = Fraction(float(c)) ** 2
+        if sq <= a and (below is None or c > below):
+            below = float(c)
+        if sq >= a and (above is None or c < above):
+            above = float(c)
+    if below == above or rounding in ("rtz", "rdn"):
+        return int(k.encode(np.array([below]))[0])
+    if rounding == "rup":
+        return int(k.encode(np.array([above]))[0])
+    mid = (Fraction(below) + Fraction(above)) / 2
+    pick = below if mid ** 2 > a or (mid ** 2 == a and rounding == "rne" and (bits64([below])[0] & 1) == 0) else above
+    return int(k.encode(np.array([pick]))[0])
+
+def random_float64(rng, n):
+    # Uniform over exponents, with the edges of the range over-represented
+    out = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.1:
+            x = DBL_MAX * rng.uniform(0.5, 1.0)
+        elif kind < 0.2:
+            x = TINY * rng.randrange(1, 1 << 20)
+        else:
+            x = math.ldexp(rng.uniform(1.0, 2.0), rng.randrange(-1074, 1024))
+        out.append(-x if rng.random() < 0.5 else x)
+    return out
+
+def check_binary(op, a, b, rounding):
+    got = ff.apply_op(op, bits64(a), bits64(b), F64, rounding)
+    for x, y, g in zip(a, b, got):
+        want = ff.encode_fraction(exact(op, x, y), F64, rounding)
+        assert int(g) == want, f"{op} {x!r} {y!r} {rounding}: {int(g):#x} != {want:#x}"
+
+@pytest.mark.parametrize("rounding", list(ff.ROUNDING_MODES))
+@pytest.mark.parametrize("op", ff.BINARY_OPS)
+def test_float64_random(op, rounding):
+    rng = random.Random(f"{op}-{rounding}")
+    a, b = random_float64(rng, 1500), random_float64(rng, 1500)
+    if op == "div":
+        b = [y or 1.0 for y in b]
+    check_binary(op, a, b, rounding)
+
+@pytest.mark.parametrize("rounding", list(ff.ROUNDING_MODES))
+def test_float64_edges(rounding):
+    cases = [
+        # Overflow of a finite exact result
+        ("mul", 1e300, -1e10), ("mul", 1.7e308, 0.99999999999999), ("add", DBL_MAX, 1e292),
+        ("sub", -DBL_MAX, DBL_MAX), ("div", DBL_MAX, 0.5), ("div", DBL_MAX, 3.0),
+        # Subnormal and underflowing results
+        ("mul", 1e-200, 1.2345e-120), ("mul", -1e-160, 3e-160), ("mul", TINY, 0.5), ("mul", TINY, 0.75),
+        ("div", 1e-300, 3e20), ("div", TINY, 3.0), ("div", 3 * TINY, 2.0),
+        # Exact ties with the float64 neighbour
+        ("add", 1.0, 2.0 ** -53), ("add", -1.0, 2.0 ** -54), ("sub", 2.0 ** 53, 1.0), ("mul", 1 + 2.0 ** -52, 1 + 2.0 ** -52),
+        # Operands large enough to overflow the Dekker split
+        ("mul", 1.5e308, 1.0000000000000002), ("div", 1.5e308, 1.0000000000000002),
+    ]
+    for op, x, y in cases:
+        check_binary(op, [x], [y], rounding)
+
+@pytest.mark.parametrize("rounding", list(ff.ROUNDING_MODES))
+def test_float64_sqrt(rounding):
+    rng = random.Random(rounding)
+    a = [abs(x) for x in random_float64(rng, 1000)] + [DBL_MAX, TINY, 2 * TINY, 2.0, 0.5]
+    got = ff.apply_op("sqrt", bits64(a), None, F64, rounding)
+    for x, g in zip(a, got):
+        assert int(g) == exact_sqrt_bits(Fraction(x), F64, rounding), f"sqrt {x!r} {rounding}"
+
+def test_overflow_flags():
+    bits, flags = ff.apply_op("mul", bits64([1e300]), bits64([-1e10]), F64, "rtz", with_flags=True)
+    assert ff.bits_to_float(int(bits[0]), F64) == -DBL_MAX
+    assert flags[0] & ff.FLAG_OVERFLOW and flags[0] & ff.FLAG_INEXACT
+    # Exact infinities keep their own results
+    bits = ff.apply_op("div", bits64([1.0, np.inf]), bits64([0.0, 2.0]), F64, "rtz")
+    assert list(ff.decode(bits, F64)) == [np.inf, np.inf]
+
+@pytest.mark.parametrize("fmt", ["float16", "bfloat16", "e4m3", "e5m2", "E11M10"])
+@pytest.mark.parametrize("rounding", list(ff.ROUNDING_MODES))
+def test_narrow_formats(fmt, rounding):
+    fmt = ff.get_format(fmt)
+    rng = np.random.default_rng(7)
+    a_bits = rng.integers(0, 1 << fmt.total_bits, 3000).astype(fmt.uint_name)
+    b_bits = rng.integers(0, 1 << fmt.total_bits, 3000).astype(fmt.uint_name)
+    a, b = ff.decode(a_bits, fmt), ff.decode(b_bits, fmt)
+    keep = np.isfinite(a) & np.isfinite(b) & (b != 0)
+    for op in ff.BINARY_OPS:
+        got = ff.apply_op(op, a_bits[keep], b_bits[keep], fmt, rounding)
+        for x, y, g in zip(a[keep], b[keep], got):
+            q = exact(op, x, y)
+            # A Fraction has no signed zero, so exact zeros are compared by magnitude
+            sign = 0 if q else 1 << (fmt.total_bits - 1)
+            assert int(g) & ~sign == ff.encode_fraction(q, fmt, rounding), f"{fmt.name} {op} {x!r} {y!r}"
+
+@pytest.mark.parametrize("fmt", ["float16", "float32", "float64", "e4m3", "e5m2"])
+def test_canonical_nan(fmt):
+    fmt = ff.get_format(fmt)
+    k = ff.compile_format(fmt)
+    nan = ff.encode([np.nan], fmt)[0] & ~np.array(1 << (fmt.total_bits - 1), dtype=fmt.uint_name)
+    neg, inf = k.encode(np.array([-2.0, np.inf] if fmt.inf else [-2.0, 1.0]))
+    for rounding in ff.ROUNDING_MODES:
+        assert ff.apply_op("sqrt", [neg], None, fmt, rounding)[0] == nan
+        if fmt.inf:
+            assert ff.apply_op("sub", [inf], [inf], fmt, rounding)[0] == nan
+            assert ff.apply_op("mul", [inf], [0], fmt, rounding)[0] == nan
+        assert ff.scalar_op("sqrt", int(neg), None, fmt, rounding) == nan
+
+@pytest.mark.parametrize("fmt", ["float16", "float32", "float64", "bfloat16", "e5m2", "e4m3"])
+@pytest.mark.parametrize("rounding", list(ff.ROUNDING_MODES))
+def test_scalar_division_by_zero(fmt, rounding):
+    # IEEE semantics: x / ±0 is a signed infinity (NaN without one), 0 / 0 is NaN
+    fmt = ff.get_format(fmt)
+    k = ff.compile_format(fmt)
+    one, neg, zero, neg_zero = (int(v) for v in k.encode(np.array([1.0, -2.0, 0.0, -0.0])))
+    inf = np.inf if fmt.inf else np.nan
+    for a, b, want in [(one, zero, inf), (one, neg_zero, -inf), (neg, zero, -inf), (neg, neg_zero, inf),
+                       (zero, zero, np.nan)]:
+        got = ff.bits_to_float(ff.scalar_op("div", a, b, fmt, rounding), fmt)
+        assert got == want or (np.isnan(got) and np.isnan(want)), f"{fmt.name} {a:#x} / {b:#x} {rounding}: {got}"
@@ -0,0 +1,68 @@
+# Interval endpoints against exact Fraction bounds: enclosing and as tight as the format allows
+import random
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import float_formats as ff  # noqa: E402
+import float_interval as fi  # noqa: E402
+from test_float_formats import DBL_MAX, exact, exact_sqrt_bits, random_float64  # noqa: E402
+
+def exact_bounds(op, a_lo, a_hi, b_lo, b_hi):
+    # Finite, nonzero-divisor intervals only: the extremes sit at endpoint combinations
+    if op == "add":
+        return exact(op, a_lo, b_lo), exact(op, a_hi, b_hi)
+    if op == "sub":
+        return exact(op, a_lo, b_hi), exact(op, a_hi, b_lo)
+    values = [exact(op, a, b) for a in (a_lo, a_hi) for b in (b_lo, b_hi)]
+    return min(values), max(values)
+
+def check(op, fmt, a, b):
+    fmt = ff.get_format(fmt)
+    k = ff.compile_format(fmt)
+    enc = lambda v: k.encode(np.array(v, dtype=np.float64))
+    lo, hi = fi.interval_op(op, enc([x[0] for x in a]), enc([x[1] for x in a]),
+                            enc([y[0] for y in b]), enc([y[1] for y in b]), fmt)
+    for x, y, l, h in zip(a, b, lo, hi):
+        q_lo, q_hi = exact_bounds(op, *x, *y)
+        # Tightest enclosure: each bound rounded outward exactly once; either signed zero will do
+        want = k.decode(np.array([ff.encode_fraction(q_lo, fmt, "rdn"), ff.encode_fraction(q_hi, fmt, "rup")],
+                                 dtype=fmt.uint_name))
+        got = k.decode(np.array([l, h]))
+        assert list(got) == list(want), f"{op} {x} {y}: {list(got)} != {list(want)}"
+
+def random_intervals(rng, n, fmt):
+    k = ff.compile_format(ff.get_format(fmt))
+    values = k.decode(k.encode(np.array(random_float64(rng, 2 * n))))
+    values = np.where(np.isfinite(values), values, 1.0)
+    return [tuple(sorted(pair)) for pair in values.reshape(-1, 2).tolist()]
+
+@pytest.mark.parametrize("fmt", ["float64", "float32", "float16", "bfloat16", "e5m2"])
+@pytest.mark.parametrize("op", ff.BINARY_OPS)
+def test_random_enclosure(op, fmt):
+    rng = random.Random(f"{op}-{fmt}")
+    a, b = random_intervals(rng, 1000, fmt), random_intervals(rng, 1000, fmt)
+    if op == "div":
+        b = [y if y[0] > 0 or y[1] < 0 else (1.0, 2.0) for y in b]
+    check(op, fmt, a, b)
+
+def test_float64_edges():
+    check("mul", "float64", [(1e300, 1e300), (1e-200, 1e-200), (1.7e308, 1.7e308)],
+          [(1e10, 1e10), (1.2345e-120, 1.2345e-120), (0.99999999999999, 0.99999999999999)])
+    check("div", "float64", [(DBL_MAX, DBL_MAX), (-DBL_MAX, 1.0)], [(3.0, 3.0), (0.5, 0.75)])
+    check("add", "float64", [(DBL_MAX, DBL_MAX)], [(1e292, 1e292)])
+
+def test_float64_sqrt():
+    fmt = ff.FORMATS["float64"]
+    rng = random.Random("sqrt")
+    a = [(abs(x), abs(x)) for x in random_float64(rng, 500)] + [(0.0, DBL_MAX), (5e-324, 1e-320)]
+    a = [tuple(sorted(x)) for x in a]
+    bits = np.array(a, dtype=np.float64).view(np.uint64)
+    lo, hi = fi.interval_op("sqrt", bits[:, 0], bits[:, 1], fmt=fmt)
+    for (x_lo, x_hi), l, h in zip(a, lo, hi):
+        assert int(l) == exact_sqrt_bits(Fraction(x_lo), fmt, "rdn")
+        assert int(h) == exact_sqrt_bits(Fraction(x_hi), fmt, "rup")
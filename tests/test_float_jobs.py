@@ -0,0 +1,85 @@
+# Job runner leases, per-owner limits and dispatcher resilience on a scratch database
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import float_jobs as fj  # noqa: E402
+
+def count_plan(params):
+    return params["n"]
+
+def count_run(params, i):
+    return i
+
+def count_merge(parts):
+    return sorted(parts)
+
+@pytest.fixture
+def kinds(monkeypatch):
+    monkeypatch.setitem(fj.KINDS, "count", fj.JobKind("Count", count_plan, count_run, count_merge))
+
+@pytest.fixture
+def idle(monkeypatch):
+    # submit() starts the dispatcher; scheduling tests claim chunks by hand
+    monkeypatch.setattr(fj.JobRunner, "start", lambda self: None)
+
+def claimed(tasks):
+    return sorted(task[3] for _, task in tasks)
+
+def test_lease_expiry(tmp_path, kinds, idle):
+    db = str(tmp_path / "jobs.sqlite")
+    dead, live = fj.JobRunner(db, workers=1, owner_limit=10), fj.JobRunner(db, workers=1, owner_limit=10)
+    job = dead.submit("u", "count", {"n": 4})
+    assert claimed(dead.next_tasks(2)) == [0, 1]
+    # Live leases are never handed out twice
+    assert claimed(live.next_tasks(10)) == [2, 3]
+    assert live.next_tasks(10) == []
+    # The first runner dies: once its leases run out, its chunks go to the survivor
+    dead.connect().execute("UPDATE chunks SET expires = ? WHERE claimed = ?", (time.time() - 1, dead.name))
+    assert claimed(live.next_tasks(10)) == [0, 1]
+    for i in range(4):
+        live.on_done((job, i, i))
+    live.next_tasks(1)
+    assert live.job(job)["status"] == "done"
+    assert live.result(job) == [0, 1, 2, 3]
+
+def test_owner_limit_across_runners(tmp_path, kinds, idle):
+    db = str(tmp_path / "jobs.sqlite")
+    a, b = fj.JobRunner(db, workers=1, owner_limit=3), fj.JobRunner(db, workers=1, owner_limit=3)
+    a.submit("u", "count", {"n": 10})
+    assert len(a.next_tasks(2)) == 2
+    b.submit("v", "count", {"n": 10})
+    # u already holds two live claims through runner a, so b adds only one more
+    owners = [owner for owner, _ in b.next_tasks(10)]
+    assert owners.count("u") == 1 and owners.count("v") == 3
+
+def test_dispatch_survives_database_errors(tmp_path, kinds, monkeypatch, capsys):
+    runner = fj.JobRunner(str(tmp_path / "jobs.sqlite"), workers=1)
+    job = runner.submit("u", "count", {"n": 5})
+    next_tasks, failures = runner.next_tasks, []
+
+    def flaky(free):
+        if len(failures) < 3:
+            failures.append(free)
+            raise sqlite3.OperationalError("database is locked")
+        return next_tasks(free)
+
+    monkeypatch.setattr(runner, "next_tasks", flaky)
+    runner.start()
+    done = runner.wait(job, poll=0.05)
+    assert done["status"] == "done" and runner.result(job) == [0, 1, 2, 3, 4]
+    assert len(failures) == 3 and "database is locked" in capsys.readouterr().err
+
+def test_wait_notices_dead_dispatcher(tmp_path, kinds, idle):
+    runner = fj.JobRunner(str(tmp_path / "jobs.sqlite"), workers=1)
+    job = runner.submit("u", "count", {"n": 2})
+    runner.thread = threading.Thread(target=lambda: None)
+    runner.thread.start()
+    runner.thread.join()
+    with pytest.raises(RuntimeError, match="dispatcher stopped"):
+        runner.wait(job, poll=0.01)
@@ -0,0 +1,60 @@
+# totalOrder keys and the radix sort against a plain Python reference order
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import float_formats as ff  # noqa: E402
+import float_sort as fs  # noqa: E402
+
+FORMATS = ["float16", "bfloat16", "e4m3", "e5m2", "float32", "float64", "E2M1"]
+
+def reference_key(bits, fmt):
+    # totalOrder: negatives by decreasing magnitude, -0 just below +0, NaNs by payload at both ends
+    sign = 1 << (fmt.total_bits - 1)
+    return -(bits & ~sign) - 1 if bits & sign else bits
+
+def random_bits(fmt, n, seed=0):
+    rng = np.random.default_rng(seed)
+    bits = rng.integers(0, 1 << fmt.total_bits, n, dtype=np.uint64, endpoint=False)
+    # Duplicates, both zeros and every special pattern near the ends
+    top = (1 << fmt.total_bits) - 1
+    edges = [0, 1 << (fmt.total_bits - 1), top, top >> 1, (top >> 1) - 1, 1]
+    return np.concatenate([bits, bits[:50], np.array(edges, dtype=np.uint64)]).astype(fmt.uint_name)
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_total_order_key(fmt):
+    fmt = ff.get_format(fmt)
+    bits = random_bits(fmt, 3000)
+    keys = fs.total_order_key(bits, fmt)
+    assert keys.dtype == bits.dtype
+    ref = [reference_key(int(b), fmt) for b in bits]
+    order = np.argsort(keys, kind="stable")
+    assert [ref[i] for i in order] == sorted(ref)
+    assert (fs.from_key(keys, fmt) == bits).all()
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_argsort_bits_is_stable_total_order(fmt):
+    fmt = ff.get_format(fmt)
+    bits = random_bits(fmt, 3000, seed=1)
+    ref = [reference_key(int(b), fmt) for b in bits]
+    want = sorted(range(len(bits)), key=lambda i: ref[i])
+    assert fs.argsort_bits(bits, fmt).tolist() == want
+    assert fs.sort_bits(bits, fmt).tolist() == [int(bits[i]) for i in want]
+    values, counts = fs.unique_counts(bits, fmt)
+    assert values.tolist() == sorted(set(bits.tolist()), key=lambda b: reference_key(b, fmt))
+    assert counts.sum() == len(bits)
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32, np.uint64])
+@pytest.mark.parametrize("digit_bits", [4, 8, 16])
+def test_radix_argsort(dtype, digit_bits):
+    rng = np.random.default_rng(digit_bits)
+    keys = rng.integers(0, np.iinfo(dtype).max, 5000, dtype=dtype, endpoint=True)
+    keys[::7] = keys[0]  # many equal keys: the order among them must be kept
+    keys[1::5] &= dtype(0xF0)  # digits that vary only in some passes
+    assert (fs.radix_argsort(keys, digit_bits=digit_bits) == np.argsort(keys, kind="stable")).all()
+    # Constant keys and empty input skip every pass
+    assert fs.radix_argsort(np.full(10, 3, dtype=dtype), digit_bits=digit_bits).tolist() == list(range(10))
+    assert fs.radix_argsort(np.zeros(0, dtype=dtype), digit_bits=digit_bits).tolist() == []